@@ -3,94 +3,131 @@ Project Dashboard v2 - FastAPI Web Application
 前後端分離的 Web 介面
 """
 
+import asyncio
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Query, Body
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.project_manager import ProjectManager
-from core.database import DatabaseManager
-
-
-def load_env(filepath=".env"):
-    env_data = {
-        "SCAN_DIR": "./",
-        "HOST": "127.0.0.1",
-        "PORT": 5001,
-        "DB_PATH": "project_dashboard.db",
-    }
-
-    env_file = Path(filepath)
-    if env_file.exists():
-        with open(env_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if "=" in line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    env_data[key] = value.strip('"').strip("'")
-
-    return env_data
+from core.config import create_services, is_enabled, load_env
+from core.events import EventBus
+from core.health import IOUnavailable
+from core.procgov import governor
+from core.serialization import encode_projects, fragments
+from web.compression import CompressionMiddleware
+from web.responses import FastJSONResponse
+from web.static import CachedStaticFiles, precompress_directory
 
 
+# 預設值、.env 與路徑解析與 MCP Server、掃描常駐程式共用（見 core/config.py）
 config = load_env()
-SCAN_PATH = Path(config["SCAN_DIR"]).resolve()
-
-project_manager = ProjectManager(str(SCAN_PATH))
-db = DatabaseManager(config["DB_PATH"])
-
-app = FastAPI(title="Project Dashboard v2")
+services = create_services(config)
+project_manager = services.project_manager
+db = services.db
+db.warm_memory_cache()
+dependency_index = services.dependency_index
+local_workspace = services.local_workspace
+workspace = services.workspace
+
+# 即時事件：資料庫觸發器記錄的異動（包含其他 worker、MCP 與常駐程式的寫入）推送給 SSE 連線
+event_bus = EventBus(db, poll_interval=float(config["EVENT_POLL_INTERVAL"]))
+# SSE 連線的 keep-alive 間隔與最長存續秒數（到期後瀏覽器以 Last-Event-ID 自動重新連線，
+# 關閉或重新載入伺服器時不會被長時間掛著的連線拖住）
+EVENT_KEEPALIVE = 15
+EVENT_STREAM_MAX_AGE = 300
+
+# 需要掃描的端點最多等待的秒數（0 = 等到掃描完成）；逾時回傳部分結果，掃描在背景完成
+REQUEST_BUDGET = float(config["REQUEST_BUDGET"])
+
+
+def take_snapshot(refresh: bool = False, budget: float = None):
+    """在時間預算內取得工作區快照（逾時時未完成的專案標記為 stale）"""
+    return workspace.snapshot(
+        refresh=refresh, budget=REQUEST_BUDGET if budget is None else budget
+    )
+
+
+def partial_headers(snapshot):
+    """快照含未完成或以快取代替的專案時以標頭告知用戶端"""
+    headers = {}
+    stale = snapshot.stale_names()
+    if stale:
+        headers["X-Partial-Results"] = str(len(stale))
+    degraded = snapshot.degraded_names()
+    if degraded:
+        headers["X-Degraded-Projects"] = str(len(degraded))
+    return headers or None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 載入上次的快照檔：第一個請求直接回傳，背景重新掃描確認
+    if local_workspace.load():
+        await asyncio.to_thread(workspace.snapshot)
+    yield
+    event_bus.close()
+    # 關閉時：等待進行中的掃描、寫回累積的存取統計，並寫入最新的快照供下次啟動直接提供
+    await asyncio.to_thread(local_workspace.shutdown, float(config["SHUTDOWN_TIMEOUT"]))
+
+
+app = FastAPI(
+    title="Project Dashboard v2",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
+app.add_middleware(
+    CompressionMiddleware, minimum_size=int(config["COMPRESSION_MIN_SIZE"])
+)
+
+STATIC_PRECOMPRESSED = is_enabled(config["STATIC_PRECOMPRESSED"])
+if STATIC_PRECOMPRESSED:
+    precompress_directory("static")
+
+static_files = CachedStaticFiles(directory="static", precompressed=STATIC_PRECOMPRESSED)
 
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["static_url"] = static_files.url_for
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", static_files, name="static")
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
 
+# 會掃描檔案系統或執行 git 的端點使用同步 def，由 FastAPI 在執行緒池執行而不阻塞事件迴圈；
+# 同時到達的相同掃描由 ProjectManager 的 single-flight 合併為一次
 @app.get("/api/projects")
-async def get_projects():
+def get_projects(
+    sort: str = Query(default="name"),
+    refresh: bool = Query(default=False),
+    budget: float = Query(default=None),
+):
     try:
-        projects = project_manager.list_all_projects()
+        snapshot = take_snapshot(refresh, budget)
         favorites = set(db.get_favorites())
+        tags_map = db.get_tags_map()
 
-        enriched_projects = []
-        for project in projects:
-            info = project_manager.get_project_info(project["name"])
-
-            git_status, git_detail = info["git_status"]
-
-            enriched_projects.append(
-                {
-                    "name": info["name"],
-                    "description": info["description"],
-                    "languages": info["languages"],
-                    "git_status": git_status,
-                    "git_detail": git_detail,
-                    "is_favorite": project["name"] in favorites,
-                    "tags": db.get_project_tags(project["name"]),
-                    "has_git": info["has_git"],
-                }
-            )
-
-            db.cache_project(info)
-
-        return JSONResponse(content=enriched_projects)
+        records = snapshot.recently_active() if sort == "recent" else snapshot
+        return FastJSONResponse(
+            content=encode_projects(records, favorites, tags_map, snapshot.created_at),
+            headers=partial_headers(snapshot),
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/project/{name}")
-async def get_project_detail(name: str):
+def get_project_detail(name: str):
     try:
         info = project_manager.get_project_info(name)
 
@@ -105,8 +142,23 @@ async def get_project_detail(name: str):
             "cache_age": db.get_cache_age(name),
         }
 
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
 
+    except IOUnavailable as e:
+        # 檔案系統逾時或暫停存取中：改用快取的資料
+        cached = db.get_cached_project(name)
+        if cached is None:
+            raise HTTPException(status_code=503, detail=str(e))
+        return FastJSONResponse(
+            content={
+                **cached,
+                "is_favorite": db.is_favorite(name),
+                "tags": db.get_project_tags(name),
+                "cache_age": db.get_cache_age(name),
+                "degraded": True,
+                "retry_at": e.retry_at,
+            }
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -127,7 +179,7 @@ async def toggle_favorite(data: dict = Body(...)):
         if is_favorite and notes:
             db.update_favorite_notes(name, notes)
 
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "success",
                 "is_favorite": is_favorite,
@@ -145,17 +197,19 @@ async def toggle_favorite(data: dict = Body(...)):
 async def get_favorites():
     try:
         favorites = db.get_favorites_detailed()
-        return JSONResponse(content=favorites)
+        return FastJSONResponse(content=favorites)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/structure/{name}")
-async def get_structure(name: str, depth: int = Query(default=2)):
+def get_structure(name: str, depth: int = Query(default=2)):
     try:
         tree = project_manager.get_directory_tree(name, depth)
-        return JSONResponse(content=tree)
+        return FastJSONResponse(content=tree)
 
+    except IOUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
@@ -168,7 +222,7 @@ async def open_in_code(name: str, editor: str = Query(default="code")):
         success, message = project_manager.open_in_editor(name, editor)
 
         if success:
-            return JSONResponse(content={"status": "success", "message": message})
+            return FastJSONResponse(content={"status": "success", "message": message})
         else:
             raise HTTPException(status_code=500, detail=message)
 
@@ -182,7 +236,7 @@ async def open_in_code(name: str, editor: str = Query(default="code")):
 async def get_tags(name: str):
     try:
         tags = db.get_project_tags(name)
-        return JSONResponse(content={"tags": tags})
+        return FastJSONResponse(content={"tags": tags})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -195,7 +249,7 @@ async def add_tag(name: str, data: dict = Body(...)):
             raise HTTPException(status_code=400, detail="缺少標籤名稱")
 
         success = db.add_tag(name, tag)
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "success": success,
                 "message": f"已新增標籤 '{tag}'" if success else "標籤已存在",
@@ -216,7 +270,7 @@ async def delete_tag(name: str, data: dict = Body(...)):
             raise HTTPException(status_code=400, detail="缺少標籤名稱")
 
         success = db.remove_tag(name, tag)
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "success": success,
                 "message": f"已移除標籤 '{tag}'" if success else "移除失敗",
@@ -233,96 +287,239 @@ async def delete_tag(name: str, data: dict = Body(...)):
 async def get_all_tags():
     try:
         tags = db.get_all_tags()
-        return JSONResponse(content=tags)
+        return FastJSONResponse(content=tags)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/search/language/{language}")
-async def search_by_language(language: str):
+def search_by_language(language: str):
     try:
-        results = project_manager.search_by_language(language)
+        snapshot = take_snapshot()
+        results = project_manager.search_by_language(language, snapshot)
         favorites = set(db.get_favorites())
+        tags_map = db.get_tags_map()
 
         for project in results:
             project["is_favorite"] = project["name"] in favorites
-            project["tags"] = db.get_project_tags(project["name"])
+            project["tags"] = tags_map.get(project["name"], [])
 
-        return JSONResponse(content=results)
+        return FastJSONResponse(content=results, headers=partial_headers(snapshot))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/search/dependency/{package}")
+def search_by_dependency(
+    package: str,
+    version: str = Query(default=None),
+    ecosystem: str = Query(default=None),
+):
+    try:
+        # 快照更新（本行程或其他行程完成掃描）後才重新比對清單指紋
+        dependency_index.sync(take_snapshot())
+
+        matches = dependency_index.find_dependents(package, ecosystem, version)
+        return FastJSONResponse(
+            content={
+                "package": package,
+                "version": version,
+                "count": len(matches),
+                "projects": matches,
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _split_tags(value):
+    return [tag for tag in value.split(",") if tag.strip()] if value else []
+
+
+@app.get("/api/search/tag")
 @app.get("/api/search/tag/{tag}")
-async def search_by_tag(tag: str):
+async def search_by_tag(
+    tag: str = None,
+    match_any: str = Query(default=None, alias="any"),
+    exclude: str = Query(default=None, alias="not"),
+    language: str = Query(default=None),
+    favorites: bool = Query(default=False),
+):
+    """路徑中的標籤（逗號分隔）為 AND；any 為 OR；not 為排除"""
     try:
-        projects = db.find_by_tag(tag)
-        return JSONResponse(content={"projects": projects})
+        matches = db.search_by_tags(
+            all_tags=_split_tags(tag),
+            any_tags=_split_tags(match_any),
+            exclude_tags=_split_tags(exclude),
+            language=language,
+            favorites_only=favorites,
+        )
+        tags_map = db.get_tags_map()
+        for match in matches:
+            match["tags"] = tags_map.get(match["name"], [])
+
+        return FastJSONResponse(
+            content={
+                "projects": [match["name"] for match in matches],
+                "matches": matches,
+            }
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/git/modified")
-async def get_modified_projects():
+def get_modified_projects():
     try:
-        modified = project_manager.get_modified_projects()
-        return JSONResponse(content=modified)
+        snapshot = take_snapshot()
+        modified = project_manager.get_modified_projects(snapshot)
+        return FastJSONResponse(content=modified, headers=partial_headers(snapshot))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/git/status")
-async def batch_git_status():
+def batch_git_status():
+    try:
+        snapshot = take_snapshot()
+        status_groups = project_manager.batch_git_status(snapshot)
+        return FastJSONResponse(content=status_groups, headers=partial_headers(snapshot))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/git/recent")
+async def get_recently_active(limit: int = Query(default=20)):
     try:
-        status_groups = project_manager.batch_git_status()
-        return JSONResponse(content=status_groups)
+        projects = db.get_recently_active(limit)
+        return FastJSONResponse(content=projects)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/history/dirty")
+async def get_long_dirty(days: float = Query(default=7)):
+    try:
+        projects = db.find_projects_in_state("Modified", days)
+        return FastJSONResponse(content={"days": days, "projects": projects})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/history/{name}")
+async def get_project_history(name: str, days: int = Query(default=30)):
+    try:
+        since = int(time.time()) - days * 86400
+        history = db.get_project_history(name, since)
+        return FastJSONResponse(content={"name": name, "history": history})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/events")
+async def stream_events(request: Request, last_id: int = Query(default=None)):
+    """
+    Server-Sent Events：專案內容、收藏、標籤異動與掃描完成的即時通知
+
+    重新連線時依 Last-Event-ID 標頭（或 last_id 參數）補送漏接的事件；
+    無法補送時送出 reset，用戶端改為重新取得完整列表。
+    """
+    header_id = request.headers.get("last-event-id", "")
+    if header_id.isdigit():
+        last_id = int(header_id)
+    subscription = event_bus.subscribe(last_id)
+
+    async def stream():
+        expires_at = time.monotonic() + EVENT_STREAM_MAX_AGE
+        try:
+            yield "retry: 1000\n\n"
+            while time.monotonic() < expires_at:
+                events = await subscription.get(EVENT_KEEPALIVE)
+                if await request.is_disconnected():
+                    break
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield "".join(
+                    f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+                    for event in events
+                )
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/diagnostics/events")
+async def get_event_stats():
+    """即時事件的訂閱數與分送統計"""
+    return FastJSONResponse(content=event_bus.stats())
+
+
+@app.get("/api/diagnostics/processes")
+async def get_process_stats():
+    """子程序閘門的併發、排隊深度與啟動延遲"""
+    return FastJSONResponse(content=governor.stats())
+
+
+@app.get("/api/diagnostics/health")
+async def get_io_health():
+    """各專案與掛載點的 I/O 延遲與斷路器狀態"""
+    return FastJSONResponse(content=project_manager.health.stats())
+
+
 @app.get("/api/diagnostics/no-readme")
-async def find_no_readme():
+def find_no_readme():
     try:
         folders = project_manager.find_projects_without_readme()
-        return JSONResponse(content={"folders": folders})
+        return FastJSONResponse(content={"folders": folders})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/statistics")
-async def get_statistics():
+def get_statistics():
     try:
-        all_projects = project_manager.list_all_projects()
-
-        language_counts = {}
-        for project in all_projects:
-            info = project_manager.get_project_info(project["name"])
-            for lang in info["languages"].keys():
-                language_counts[lang] = language_counts.get(lang, 0) + 1
-
+        # 快照新鮮時直接取自記憶體；專案數、語言與 Git 狀態都取自同一份快照的索引，
+        # 三者一致（快取列與彙總表可能包含不在快照中的專案）。
+        # 缺少 README 的資料夾數取自最近一次掃描的記錄
+        snapshot = take_snapshot()
+        database_stats = db.get_statistics()
+        last_scan = db.get_last_scan() or {}
+        git_counts = {
+            status: len(names) for status, names in snapshot.git_status_groups().items()
+        }
         top_languages = sorted(
-            language_counts.items(), key=lambda x: x[1], reverse=True
+            snapshot.language_counts().items(), key=lambda item: (-item[1], item[0])
         )[:10]
 
-        git_summary = project_manager.batch_git_status()
-
-        return JSONResponse(
+        return FastJSONResponse(
             content={
-                "total_projects": len(all_projects),
-                "favorites_count": len(db.get_favorites()),
+                "total_projects": len(snapshot),
+                "favorites_count": database_stats["favorites_count"],
                 "top_languages": [
-                    {"language": lang, "count": count} for lang, count in top_languages
+                    {"language": language, "count": count}
+                    for language, count in top_languages
                 ],
                 "git_summary": {
-                    "clean": len(git_summary["Clean"]),
-                    "modified": len(git_summary["Modified"]),
-                    "not_git": len(git_summary["Not a Git repo"]),
-                    "errors": len(git_summary["Error"]),
+                    "clean": git_counts.get("Clean", 0),
+                    "modified": git_counts.get("Modified", 0),
+                    "not_git": git_counts.get("Not a Git repo", 0),
+                    "errors": git_counts.get("Error", 0),
                 },
-                "folders_without_readme": len(
-                    project_manager.find_projects_without_readme()
-                ),
-                "database_stats": db.get_statistics(),
+                "folders_without_readme": last_scan.get("folders_without_readme") or 0,
+                "database_stats": database_stats,
+                "memory_cache": db.memory_cache.stats(),
+                "project_fragments": fragments.stats(),
+                "workspace": workspace.status(),
+                "single_flight": project_manager.flight.stats(),
+                "git_backend": project_manager.git_backend_stats(),
             }
         )
     except Exception as e:
@@ -336,7 +533,7 @@ async def clear_cache(data: dict = Body(...)):
 
         deleted = db.clear_old_cache(max_age_days)
 
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "success",
                 "deleted_count": deleted,
@@ -348,9 +545,46 @@ async def clear_cache(data: dict = Body(...)):
 
 
 if __name__ == "__main__":
+    import argparse
+
     import uvicorn
 
-    print(f"掃描路徑: {SCAN_PATH}")
+    parser = argparse.ArgumentParser(description="Project Dashboard v2 Web 介面")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="正式模式：多個 worker、停用檔案監看重新載入",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker 數（預設為 .env 的 WORKERS，0 代表 CPU 核心數）"
+    )
+    parser.add_argument("--host", default=config["HOST"])
+    parser.add_argument("--port", type=int, default=int(config["PORT"]))
+    args = parser.parse_args()
+
+    print(f"掃描路徑: {project_manager.scan_path}")
     print(f"資料庫: {config['DB_PATH']}")
 
-    uvicorn.run("app:app", host=config["HOST"], port=int(config["PORT"]), reload=True)
+    if args.production:
+        # 各 worker 是獨立行程，透過 SQLite 快取（WAL）共用狀態：掃描租約讓同一時間
+        # 只有一個 worker 掃描，其餘改用寫入快取的結果；有 scan_daemon.py 時則都交給常駐程式
+        workers = args.workers if args.workers is not None else int(config["WORKERS"])
+        workers = workers or os.cpu_count() or 1
+        print(f"正式模式: {workers} 個 worker")
+        uvicorn.run(
+            "app:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            reload=False,
+            access_log=False,
+            timeout_graceful_shutdown=int(float(config["SHUTDOWN_TIMEOUT"])),
+        )
+    else:
+        uvicorn.run(
+            "app:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            timeout_graceful_shutdown=int(float(config["SHUTDOWN_TIMEOUT"])),
+        )
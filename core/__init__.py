@@ -1,7 +1,28 @@
 """
 Project Dashboard v2 - Core Module
 """
-from .project_manager import ProjectManager
-from .database import DatabaseManager
+import importlib
 
-__all__ = ['ProjectManager', 'DatabaseManager']
+__all__ = ['ProjectManager', 'DatabaseManager', 'DependencyIndex', 'ProjectRecord', 'WorkspaceSnapshot']
+
+# 名稱 → 子模組；第一次存取時才匯入，匯入 core.health 等輕量子模組時不會連帶載入整個套件
+_EXPORTS = {
+    'ProjectManager': 'project_manager',
+    'DatabaseManager': 'database',
+    'DependencyIndex': 'dependencies',
+    'ProjectRecord': 'snapshot',
+    'WorkspaceSnapshot': 'snapshot',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,117 @@
+"""
+Project Dashboard v2 - In-Process Cache
+行程內 LRU 記憶體快取（大小上限、逐項 TTL、命中統計）
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    執行緒安全的 LRU 快取
+
+    每個項目記錄到期時間（monotonic 秒），讀取時發現過期即移除並計為未命中。
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: 最多保留的項目數，0 代表停用
+            ttl: 預設存活秒數，None 代表不過期
+            clock: 時間來源（預設 time.monotonic）
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[Optional[float], Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """
+        取得項目並標記為最近使用
+
+        Args:
+            key: 鍵
+            default: 不存在或已過期時的回傳值
+            count: 是否計入命中統計
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING):
+        """
+        寫入項目，超過上限時淘汰最久未使用者
+
+        Args:
+            ttl: 此項目的存活秒數，省略時使用預設值
+        """
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_many(self, items: Iterable[Tuple[Hashable, Any]]):
+        for key, value in items:
+            self.set(key, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """移除單一項目或清空快取"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """命中統計"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
@@ -0,0 +1,172 @@
+"""
+Project Dashboard v2 - Configuration
+Web 介面、MCP Server 與掃描常駐程式共用的設定載入與服務建立
+
+三個程式必須得到相同的掃描路徑、資料庫、快照檔與 socket（常駐程式與用戶端以掃描路徑
+互相確認），因此預設值只定義在這裡，相對路徑一律以程式所在目錄（BASE_DIR）為基準，
+與啟動時的目前目錄無關。核心模組在建立服務時才匯入，MCP Server 匯入本模組不會連帶
+載入資料庫或掃描相關模組。
+"""
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+# 程式所在目錄（app.py、mcp_server.py、scan_daemon.py 所在處）
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULTS: Dict[str, Any] = {
+    'SCAN_DIR': '..',  # 預設掃描程式所在目錄的上層目錄
+    'HOST': '127.0.0.1',
+    'PORT': 5001,
+    'DB_PATH': 'project_dashboard.db',
+    'DB_JOURNAL_MODE': 'wal',
+    'WORKERS': 0,
+    'SHUTDOWN_TIMEOUT': 10,
+    'COMPRESSION_MIN_SIZE': 1024,
+    'STATIC_PRECOMPRESSED': '0',
+    'GIT_BACKEND': 'subprocess',
+    'CACHE_MAX_ROWS': 5000,
+    'CACHE_MAX_BYTES': 8 * 1024 * 1024,
+    'CACHE_EVICTION': 'lru',
+    'MEMORY_CACHE_SIZE': 1024,
+    'MEMORY_CACHE_TTL': 300,
+    'SNAPSHOT_MAX_AGE': 30,
+    'SNAPSHOT_FILE': 'project_dashboard.snapshot',
+    'SCAN_LEASE_TTL': 300,
+    'IO_TIMEOUT': 10,
+    'SCAN_ONE_FILESYSTEM': '0',
+    'SUBPROCESS_MAX': 8,
+    'SUBPROCESS_NICE': 10,
+    'SUBPROCESS_IONICE': '1',
+    'REQUEST_BUDGET': 10,
+    'DAEMON_SOCKET': 'project_dashboard.sock',
+    'EVENT_POLL_INTERVAL': 1
+}
+
+# 解析為絕對路徑的設定（空字串代表停用，維持不變）
+PATH_KEYS = ('SCAN_DIR', 'DB_PATH', 'SNAPSHOT_FILE', 'DAEMON_SOCKET')
+
+
+def find_env_file() -> Optional[Path]:
+    """目前目錄的 .env，沒有時使用程式所在目錄的 .env"""
+    for candidate in (Path('.env'), BASE_DIR / '.env'):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def resolve_path(value: str) -> str:
+    """相對路徑以 BASE_DIR 為基準解析為絕對路徑；空字串維持不變"""
+    if not value:
+        return value
+    path = Path(value).expanduser()
+    if not path.is_absolute():
+        path = BASE_DIR / path
+    return str(path.resolve())
+
+
+def load_env(filepath: Optional[str] = None) -> Dict[str, Any]:
+    """
+    載入設定：預設值加上 .env 的內容，路徑設定解析為絕對路徑
+
+    Args:
+        filepath: .env 路徑，省略時依 find_env_file() 尋找
+    """
+    env_data = dict(DEFAULTS)
+
+    env_file = Path(filepath) if filepath else find_env_file()
+    if env_file is not None and env_file.exists():
+        with open(env_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if '=' in line and not line.startswith('#'):
+                    key, value = line.split('=', 1)
+                    env_data[key] = value.strip('"').strip("'")
+
+    for key in PATH_KEYS:
+        env_data[key] = resolve_path(str(env_data[key]))
+    return env_data
+
+
+def is_enabled(value: Any) -> bool:
+    """設定值是否為開啟（1、true、yes）"""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def create_services(config: Dict[str, Any], use_daemon: bool = True,
+                    timings: Optional[Dict[str, float]] = None) -> SimpleNamespace:
+    """
+    依設定建立專案管理器、資料庫、依賴索引與工作區
+
+    Args:
+        config: load_env() 的結果
+        use_daemon: 設定了 DAEMON_SOCKET 時，工作區優先向掃描常駐程式取得快照
+                    （常駐程式本身傳入 False）
+        timings: 提供時記錄各階段耗時（秒）
+
+    Returns:
+        SimpleNamespace(project_manager, db, dependency_index, local_workspace, workspace)；
+        workspace 在使用常駐程式時為 RemoteWorkspace，否則即為 local_workspace
+    """
+    timings = timings if timings is not None else {}
+
+    started = time.perf_counter()
+    from .database import DatabaseManager
+    from .dependencies import DependencyIndex
+    from .ipc import RemoteWorkspace
+    from .procgov import governor
+    from .project_manager import ProjectManager
+    from .workspace import Workspace
+    timings['import core'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    project_manager = ProjectManager(
+        config['SCAN_DIR'],
+        git_backend=config['GIT_BACKEND'],
+        io_timeout=float(config['IO_TIMEOUT']),
+        one_filesystem=is_enabled(config['SCAN_ONE_FILESYSTEM'])
+    )
+    governor.configure(
+        max_concurrency=int(config['SUBPROCESS_MAX']),
+        background_nice=int(config['SUBPROCESS_NICE']),
+        background_ionice=is_enabled(config['SUBPROCESS_IONICE'])
+    )
+    timings['project manager'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    db = DatabaseManager(
+        config['DB_PATH'],
+        cache_max_rows=int(config['CACHE_MAX_ROWS']),
+        cache_max_bytes=int(config['CACHE_MAX_BYTES']),
+        eviction_policy=config['CACHE_EVICTION'],
+        memory_cache_size=int(config['MEMORY_CACHE_SIZE']),
+        memory_cache_ttl=float(config['MEMORY_CACHE_TTL']),
+        journal_mode=config['DB_JOURNAL_MODE'] or None
+    )
+    dependency_index = DependencyIndex(db)
+    timings['database'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    # 共用同一資料庫的行程透過世代計數器與掃描租約重用彼此的掃描結果
+    local_workspace = Workspace(
+        project_manager,
+        db,
+        dependency_index,
+        max_age=float(config['SNAPSHOT_MAX_AGE']),
+        snapshot_path=config['SNAPSHOT_FILE'] or None,
+        lease_ttl=float(config['SCAN_LEASE_TTL'])
+    )
+    workspace = local_workspace
+    if use_daemon and config['DAEMON_SOCKET']:
+        # scan_daemon.py 執行中時改由常駐程式掃描，否則退回本機 Workspace
+        workspace = RemoteWorkspace(config['DAEMON_SOCKET'], local_workspace)
+    timings['workspace'] = time.perf_counter() - started
+
+    return SimpleNamespace(
+        project_manager=project_manager,
+        db=db,
+        dependency_index=dependency_index,
+        local_workspace=local_workspace,
+        workspace=workspace
+    )
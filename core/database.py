@@ -5,24 +5,317 @@ Project Dashboard v2 - Database Manager
 
 import sqlite3
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable
 from contextlib import contextmanager
 
+from .cache import LRUCache
+from .migrations import Migration, migrate
+from .history import (
+    DOWNSAMPLE_AFTER_DAYS,
+    GIT_STATE_CODES,
+    HEARTBEAT_SECONDS,
+    RETENTION_DAYS,
+    decode_git_state,
+    decode_language_mix,
+    encode_language_mix,
+    history_key,
+)
+
+
+# 彙總表維護觸發器（見 DatabaseManager._ensure_aggregates）
+_AGGREGATE_TRIGGERS = (
+    # 標籤專案數與不重複標籤數
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tags_insert AFTER INSERT ON project_tags
+    BEGIN
+        INSERT INTO tag_counts (tag, project_count) VALUES (NEW.tag, 1)
+            ON CONFLICT(tag) DO UPDATE SET project_count = project_count + 1;
+        UPDATE stat_counters SET value = value + 1
+            WHERE name = 'tags'
+              AND (SELECT project_count FROM tag_counts WHERE tag = NEW.tag) = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tags_delete AFTER DELETE ON project_tags
+    BEGIN
+        UPDATE tag_counts SET project_count = project_count - 1 WHERE tag = OLD.tag;
+        UPDATE stat_counters SET value = value - 1
+            WHERE name = 'tags'
+              AND (SELECT project_count FROM tag_counts WHERE tag = OLD.tag) <= 0;
+        DELETE FROM tag_counts WHERE tag = OLD.tag AND project_count <= 0;
+    END
+    """,
+    # 收藏數
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_favorites_insert AFTER INSERT ON favorites
+    BEGIN
+        UPDATE stat_counters SET value = value + 1 WHERE name = 'favorites';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_favorites_delete AFTER DELETE ON favorites
+    BEGIN
+        UPDATE stat_counters SET value = value - 1 WHERE name = 'favorites';
+    END
+    """,
+    # 快取專案數、語言分佈與 Git 狀態分佈
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cache_insert AFTER INSERT ON project_cache
+    BEGIN
+        UPDATE stat_counters SET value = value + 1 WHERE name = 'cached_projects';
+        INSERT INTO language_counts (language, project_count)
+            SELECT key, 1 FROM json_each(NEW.languages) WHERE true
+            ON CONFLICT(language) DO UPDATE SET project_count = project_count + 1;
+        INSERT INTO git_state_counts (git_status, project_count)
+            VALUES (COALESCE(NEW.git_status, 'Unknown'), 1)
+            ON CONFLICT(git_status) DO UPDATE SET project_count = project_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cache_delete AFTER DELETE ON project_cache
+    BEGIN
+        UPDATE stat_counters SET value = value - 1 WHERE name = 'cached_projects';
+        UPDATE language_counts SET project_count = project_count - 1
+            WHERE language IN (SELECT key FROM json_each(OLD.languages));
+        DELETE FROM language_counts WHERE project_count <= 0;
+        UPDATE git_state_counts SET project_count = project_count - 1
+            WHERE git_status = COALESCE(OLD.git_status, 'Unknown');
+        DELETE FROM git_state_counts WHERE project_count <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cache_languages AFTER UPDATE OF languages ON project_cache
+    WHEN OLD.languages IS NOT NEW.languages
+    BEGIN
+        UPDATE language_counts SET project_count = project_count - 1
+            WHERE language IN (SELECT key FROM json_each(OLD.languages));
+        DELETE FROM language_counts WHERE project_count <= 0;
+        INSERT INTO language_counts (language, project_count)
+            SELECT key, 1 FROM json_each(NEW.languages) WHERE true
+            ON CONFLICT(language) DO UPDATE SET project_count = project_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_cache_git_status AFTER UPDATE OF git_status ON project_cache
+    WHEN OLD.git_status IS NOT NEW.git_status
+    BEGIN
+        UPDATE git_state_counts SET project_count = project_count - 1
+            WHERE git_status = COALESCE(OLD.git_status, 'Unknown');
+        DELETE FROM git_state_counts WHERE project_count <= 0;
+        INSERT INTO git_state_counts (git_status, project_count)
+            VALUES (COALESCE(NEW.git_status, 'Unknown'), 1)
+            ON CONFLICT(git_status) DO UPDATE SET project_count = project_count + 1;
+    END
+    """,
+)
+
+
+# 世代計數器：資料表內容變更時遞增，讓共用同一資料庫的其他行程察覺
+# （只監看掃描結果欄位；存取統計的更新不計入）
+GENERATION_SCOPES = ("project_cache", "favorites", "project_tags")
+
+_GENERATION_TRIGGERS = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_generation_{table}_{event.split()[0].lower()}
+    AFTER {event} ON {table}
+    BEGIN
+        UPDATE cache_generation SET generation = generation + 1 WHERE scope = '{table}';
+    END
+    """
+    for table, events in (
+        (
+            "project_cache",
+            (
+                "INSERT",
+                "DELETE",
+                "UPDATE OF description, languages, git_status, git_detail, has_git,"
+                " branch, upstream, ahead, behind, last_commit_at, last_commit_author,"
+                " last_scan",
+            ),
+        ),
+        ("favorites", ("INSERT", "DELETE", "UPDATE")),
+        ("project_tags", ("INSERT", "DELETE", "UPDATE")),
+    )
+    for event in events
+)
+
+# 即時事件觸發器（見 core/events.py）：專案內容實際改變、收藏或標籤異動、完成掃描時
+# 寫入 events 表，任何行程（Web worker、MCP、掃描常駐程式）的寫入都會被推送
+_EVENT_PROJECT_COLUMNS = (
+    "description", "languages", "git_status", "git_detail", "has_git", "branch",
+    "upstream", "ahead", "behind", "last_commit_at", "last_commit_author",
+)
+_EVENT_PROJECT_JSON = """
+    json_object(
+        'name', NEW.name,
+        'description', NEW.description,
+        'languages', json(COALESCE(NEW.languages, '{}')),
+        'git_status', NEW.git_status,
+        'git_detail', NEW.git_detail,
+        'has_git', json(CASE WHEN NEW.has_git THEN 'true' ELSE 'false' END),
+        'branch', NEW.branch,
+        'upstream', NEW.upstream,
+        'ahead', NEW.ahead,
+        'behind', NEW.behind,
+        'last_commit_at', NEW.last_commit_at,
+        'last_commit_author', NEW.last_commit_author
+    )
+"""
+_EVENT_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_events_project_insert AFTER INSERT ON project_cache
+    BEGIN
+        INSERT INTO events (type, project, data) VALUES ('project', NEW.name, {_EVENT_PROJECT_JSON});
+    END
+    """,
+    # 每次掃描都會以 UPSERT 改寫所有列（last_scan），只有內容不同時才產生事件
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_events_project_update
+    AFTER UPDATE OF {", ".join(_EVENT_PROJECT_COLUMNS)} ON project_cache
+    WHEN {" OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in _EVENT_PROJECT_COLUMNS)}
+    BEGIN
+        INSERT INTO events (type, project, data) VALUES ('project', NEW.name, {_EVENT_PROJECT_JSON});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_events_favorite_insert AFTER INSERT ON favorites
+    BEGIN
+        INSERT INTO events (type, project, data)
+        VALUES ('favorite', NEW.name, json_object('name', NEW.name, 'is_favorite', json('true')));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_events_favorite_delete AFTER DELETE ON favorites
+    BEGIN
+        INSERT INTO events (type, project, data)
+        VALUES ('favorite', OLD.name, json_object('name', OLD.name, 'is_favorite', json('false')));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_events_tag_insert AFTER INSERT ON project_tags
+    BEGIN
+        INSERT INTO events (type, project, data)
+        VALUES ('tag_added', NEW.project_name,
+                json_object('name', NEW.project_name, 'tag', NEW.tag));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_events_tag_delete AFTER DELETE ON project_tags
+    BEGIN
+        INSERT INTO events (type, project, data)
+        VALUES ('tag_removed', OLD.project_name,
+                json_object('name', OLD.project_name, 'tag', OLD.tag));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_events_scan AFTER INSERT ON scan_history
+    BEGIN
+        INSERT INTO events (type, project, data)
+        VALUES ('scan', NULL, json_object('projects_found', NEW.projects_found,
+                                          'duration_ms', NEW.scan_duration_ms));
+    END
+    """,
+)
+
+# 遷移 5：以 known_projects 記錄每個專案最後推送的內容。快取列被淘汰後以相同內容重新寫入時
+# 不再推送，只有新專案（或內容已改變）的 INSERT 才產生事件；更新事件同時刷新記錄
+_KNOWN_PROJECT_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_events_project_insert AFTER INSERT ON project_cache
+    WHEN NOT EXISTS (
+        SELECT 1 FROM known_projects WHERE name = NEW.name AND data = {_EVENT_PROJECT_JSON}
+    )
+    BEGIN
+        INSERT INTO events (type, project, data) VALUES ('project', NEW.name, {_EVENT_PROJECT_JSON});
+        INSERT INTO known_projects (name, data) VALUES (NEW.name, {_EVENT_PROJECT_JSON})
+        ON CONFLICT(name) DO UPDATE SET data = excluded.data;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_events_project_update
+    AFTER UPDATE OF {", ".join(_EVENT_PROJECT_COLUMNS)} ON project_cache
+    WHEN {" OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in _EVENT_PROJECT_COLUMNS)}
+    BEGIN
+        INSERT INTO events (type, project, data) VALUES ('project', NEW.name, {_EVENT_PROJECT_JSON});
+        INSERT INTO known_projects (name, data) VALUES (NEW.name, {_EVENT_PROJECT_JSON})
+        ON CONFLICT(name) DO UPDATE SET data = excluded.data;
+    END
+    """,
+)
+
 
 class DatabaseManager:
     """資料庫管理器"""
 
-    def __init__(self, db_path: str = "project_dashboard.db"):
+    # 自動維護的執行間隔（秒）
+    MAINTENANCE_INTERVALS = {
+        "optimize": 3600,
+        "analyze": 24 * 3600,
+        "vacuum": 7 * 24 * 3600,
+    }
+    EVICTION_POLICIES = ("lru", "lfu")
+    JOURNAL_MODES = ("delete", "truncate", "persist", "wal")
+    # events 表保留的秒數（斷線重連的用戶端可補回這段期間的事件）
+    EVENT_RETENTION = 3600
+    # 記憶體快取層檢查世代計數器的最短間隔（秒）
+    COHERENCE_INTERVAL = 1.0
+    # get_cached_project 與 warm_memory_cache 讀取的欄位
+    _CACHED_PROJECT_COLUMNS = """
+        name, description, languages, git_status, git_detail,
+        has_git, branch, upstream, ahead, behind,
+        last_commit_at, last_commit_author, last_scan
+    """
+
+    def __init__(
+        self,
+        db_path: str = "project_dashboard.db",
+        cache_max_rows: int = 5000,
+        cache_max_bytes: int = 8 * 1024 * 1024,
+        eviction_policy: str = "lru",
+        memory_cache_size: int = 1024,
+        memory_cache_ttl: Optional[float] = 300,
+        journal_mode: Optional[str] = None,
+    ):
         """
         初始化資料庫連接
 
         Args:
             db_path: 資料庫檔案路徑
+            cache_max_rows: project_cache 最多保留的列數
+            cache_max_bytes: project_cache 資料量上限（估計的欄位位元組數）
+            eviction_policy: 超過上限時的淘汰策略（'lru' 或 'lfu'）
+            memory_cache_size: 記憶體快取層的項目上限（0 代表停用）
+            memory_cache_ttl: 記憶體快取項目的存活秒數
+            journal_mode: 日誌模式（'wal' 讓多個行程讀取時不阻塞寫入），None 代表維持資料庫現狀
         """
+        if eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"不支援的淘汰策略: {eviction_policy}")
+        if journal_mode and journal_mode.lower() not in self.JOURNAL_MODES:
+            raise ValueError(f"不支援的日誌模式: {journal_mode}")
+
         self.db_path = Path(db_path)
+        self.cache_max_rows = cache_max_rows
+        self.cache_max_bytes = cache_max_bytes
+        self.eviction_policy = eviction_policy
+
+        # 記憶體快取層（project_cache 的熱資料），寫入時失效
+        self.memory_cache = LRUCache(max_entries=memory_cache_size, ttl=memory_cache_ttl)
+        # 記憶體命中時的存取統計先累積在此，淘汰前再寫回 SQLite
+        self._pending_access: Dict[str, tuple] = {}
+        self._access_lock = threading.Lock()
+        # 記憶體快取層內容對應的 project_cache 世代
+        self._memory_generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        # 語言組成字串 → language_mixes.id
+        self._mix_ids: Dict[str, int] = {}
+        self._history_pruned_at = 0
         self.init_database()
+        if journal_mode:
+            self.set_journal_mode(journal_mode)
 
     @contextmanager
     def get_connection(self):
@@ -39,65 +332,383 @@ class DatabaseManager:
             conn.close()
 
     def init_database(self):
-        """初始化資料庫表結構"""
+        """
+        初始化資料庫表結構
+
+        依 PRAGMA user_version 套用尚未執行的遷移（見模組尾端的 MIGRATIONS）；
+        結構已是最新時只讀取一次 PRAGMA 即返回。
+        """
         with self.get_connection() as conn:
-            cursor = conn.cursor()
+            migrate(conn, MIGRATIONS)
 
-            # 收藏表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS favorites (
-                    name TEXT PRIMARY KEY,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    order_index INTEGER DEFAULT 0,
-                    notes TEXT
-                )
-            """)
+    def set_journal_mode(self, journal_mode: str) -> str:
+        """
+        設定日誌模式（WAL 會保存在資料庫檔中，之後所有連線都沿用）
 
-            # 專案快取表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_cache (
-                    name TEXT PRIMARY KEY,
-                    description TEXT,
-                    languages JSON,
-                    git_status TEXT,
-                    git_detail TEXT,
-                    has_git BOOLEAN,
-                    last_scan TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        Returns:
+            實際生效的日誌模式
+        """
+        with self.get_connection() as conn:
+            return conn.execute(f"PRAGMA journal_mode = {journal_mode.lower()}").fetchone()[0]
 
-            # 專案標籤表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_tags (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_name TEXT NOT NULL,
-                    tag TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(project_name, tag)
-                )
-            """)
+    @staticmethod
+    def _create_baseline_schema(cursor):
+        """
+        遷移 1：加入版本管理前累積的結構
 
-            # 掃描歷史表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scan_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    projects_found INTEGER,
-                    scan_duration_ms INTEGER
-                )
-            """)
+        版本管理之前的資料庫 user_version 為 0，但可能已有部分資料表，
+        因此這裡的 DDL 全部維持冪等（IF NOT EXISTS、缺少時才補欄位）。
+        """
+        # 收藏表
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS favorites (
+                name TEXT PRIMARY KEY,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                order_index INTEGER DEFAULT 0,
+                notes TEXT
+            )
+        """)
+
+        # 專案快取表
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_cache (
+                name TEXT PRIMARY KEY,
+                description TEXT,
+                languages JSON,
+                git_status TEXT,
+                git_detail TEXT,
+                has_git BOOLEAN,
+                last_scan TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 專案標籤表
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_name TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(project_name, tag)
+            )
+        """)
+
+        # 掃描歷史表
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scan_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                projects_found INTEGER,
+                scan_duration_ms INTEGER
+            )
+        """)
+
+        # 依賴清單指紋表（增量解析用）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dependency_manifests (
+                project_name TEXT NOT NULL,
+                manifest TEXT NOT NULL,
+                mtime_ns INTEGER,
+                size INTEGER,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (project_name, manifest)
+            )
+        """)
+
+        # 正規化依賴表
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dependencies (
+                project_name TEXT NOT NULL,
+                manifest TEXT NOT NULL,
+                ecosystem TEXT NOT NULL,
+                package TEXT NOT NULL,
+                version TEXT,
+                spec TEXT
+            )
+        """)
 
-            # 建立索引
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_favorites_order ON favorites(order_index)"
+        # 語言組成字典表（歷史列只存 id）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS language_mixes (
+                id INTEGER PRIMARY KEY,
+                mix TEXT NOT NULL UNIQUE
+            )
+        """)
+
+        # 專案狀態時間序列（只附加；時間為 epoch 秒）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_history (
+                project_name TEXT NOT NULL,
+                observed_at INTEGER NOT NULL,
+                git_state INTEGER NOT NULL,
+                modified_count INTEGER NOT NULL DEFAULT 0,
+                language_mix_id INTEGER,
+                state_since INTEGER NOT NULL,
+                PRIMARY KEY (project_name, observed_at)
+            ) WITHOUT ROWID
+        """)
+
+        # 既有資料庫補上 Git 中繼資料欄位
+        DatabaseManager._ensure_columns(
+            cursor,
+            "project_cache",
+            {
+                "branch": "TEXT",
+                "upstream": "TEXT",
+                "ahead": "INTEGER",
+                "behind": "INTEGER",
+                "last_commit_at": "INTEGER",
+                "last_commit_author": "TEXT",
+                "access_count": "INTEGER DEFAULT 0",
+                "last_access": "INTEGER",
+            },
+        )
+
+        # 自動維護的最後執行時間（epoch 秒）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_log (
+                task TEXT PRIMARY KEY,
+                last_run INTEGER NOT NULL
+            )
+        """)
+
+        # 建立索引
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_favorites_order ON favorites(order_index)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_scan ON project_cache(last_scan)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_state ON project_history(git_state, state_since)"
+        )
+        DatabaseManager._ensure_tag_indexes(cursor)
+        DatabaseManager._ensure_aggregates(cursor)
+        DatabaseManager._ensure_generations(cursor)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_commit ON project_cache(last_commit_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON project_cache(last_access)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_deps_package ON dependencies(package, ecosystem)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_deps_project ON dependencies(project_name, manifest)"
+        )
+
+    @staticmethod
+    def _create_events(cursor):
+        """遷移 3：即時事件表與產生事件的觸發器"""
+        # AUTOINCREMENT：清除舊事件後 id 也不會重複使用，用戶端的 Last-Event-ID 才可靠
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                type TEXT NOT NULL,
+                project TEXT,
+                data TEXT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at)")
+        for trigger in _EVENT_TRIGGERS:
+            cursor.execute(trigger)
+
+    @staticmethod
+    def _track_known_projects(cursor):
+        """遷移 5：已推送過的專案內容，淘汰後重新寫入相同內容的快取列不再產生事件"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS known_projects (
+                name TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            )
+        """)
+        cursor.execute(
+            f"""
+            INSERT OR IGNORE INTO known_projects (name, data)
+            SELECT NEW.name, {_EVENT_PROJECT_JSON} FROM project_cache AS NEW
+        """
+        )
+        cursor.execute("DROP TRIGGER IF EXISTS trg_events_project_insert")
+        cursor.execute("DROP TRIGGER IF EXISTS trg_events_project_update")
+        for trigger in _KNOWN_PROJECT_TRIGGERS:
+            cursor.execute(trigger)
+
+    @staticmethod
+    def _ensure_columns(cursor, table: str, columns: Dict[str, str]):
+        """為既有資料表補上缺少的欄位"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in cursor.fetchall()}
+        for column, column_type in columns.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    @staticmethod
+    def _ensure_aggregates(cursor):
+        """
+        建立彙總表與維護觸發器
+
+        標籤、語言、Git 狀態的專案數與各項計數由觸發器隨寫入增量更新，
+        統計查詢只需讀取這些小表。快取寫入使用 UPSERT（而非 INSERT OR REPLACE），
+        因為 REPLACE 刪除舊列時不會觸發 DELETE 觸發器。
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tag_counts (
+                tag TEXT PRIMARY KEY,
+                project_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS language_counts (
+                language TEXT PRIMARY KEY,
+                project_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS git_state_counts (
+                git_status TEXT PRIMARY KEY,
+                project_count INTEGER NOT NULL DEFAULT 0
             )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stat_counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        cursor.execute("SELECT COUNT(*) AS count FROM stat_counters")
+        needs_backfill = cursor.fetchone()["count"] == 0
+
+        for trigger in _AGGREGATE_TRIGGERS:
+            cursor.execute(trigger)
+
+        if needs_backfill:
+            DatabaseManager._rebuild_aggregates(cursor)
+
+    @staticmethod
+    def _ensure_generations(cursor):
+        """建立世代計數器表與遞增觸發器"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS cache_generation (
+                scope TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO cache_generation (scope, generation) VALUES (?, 0)",
+            [(scope,) for scope in GENERATION_SCOPES],
+        )
+        for trigger in _GENERATION_TRIGGERS:
+            cursor.execute(trigger)
+
+    def get_generation(self, scope: str = "project_cache") -> int:
+        """
+        資料表的世代計數（任何行程寫入後遞增）
+
+        Args:
+            scope: 'project_cache'、'favorites' 或 'project_tags'
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_cache_last_scan ON project_cache(last_scan)"
+                "SELECT generation FROM cache_generation WHERE scope = ?", (scope,)
             )
+            row = cursor.fetchone()
+            return row["generation"] if row else 0
+
+    def get_generations(self) -> Dict[str, int]:
+        """所有資料表的世代計數"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT scope, generation FROM cache_generation")
+            return {row["scope"]: row["generation"] for row in cursor.fetchall()}
+
+    def _sync_memory_cache(self):
+        """
+        project_cache 世代改變時（包含其他行程的寫入）清空記憶體快取層
+
+        為避免每次讀取都查詢 SQLite，最多每 COHERENCE_INTERVAL 秒檢查一次。
+        """
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.COHERENCE_INTERVAL:
+            return
+        self._generation_checked_at = now
+
+        generation = self.get_generation()
+        if generation != self._memory_generation:
+            self.memory_cache.invalidate()
+            self._memory_generation = generation
+
+    @staticmethod
+    def _rebuild_aggregates(cursor):
+        """由基礎資料表重新計算所有彙總表"""
+        for table in ("tag_counts", "language_counts", "git_state_counts", "stat_counters"):
+            cursor.execute(f"DELETE FROM {table}")
+
+        cursor.execute("""
+            INSERT INTO tag_counts (tag, project_count)
+            SELECT tag, COUNT(*) FROM project_tags GROUP BY tag
+        """)
+        cursor.execute("""
+            INSERT INTO language_counts (language, project_count)
+            SELECT lang.key, COUNT(*)
+            FROM project_cache pc, json_each(pc.languages) lang
+            GROUP BY lang.key
+        """)
+        cursor.execute("""
+            INSERT INTO git_state_counts (git_status, project_count)
+            SELECT COALESCE(git_status, 'Unknown'), COUNT(*)
+            FROM project_cache GROUP BY COALESCE(git_status, 'Unknown')
+        """)
+        cursor.execute("""
+            INSERT INTO stat_counters (name, value) VALUES
+                ('favorites', (SELECT COUNT(*) FROM favorites)),
+                ('cached_projects', (SELECT COUNT(*) FROM project_cache)),
+                ('tags', (SELECT COUNT(*) FROM tag_counts))
+        """)
+
+    def rebuild_aggregates(self):
+        """重建彙總表（修復用；正常情況下由觸發器維護）"""
+        with self.get_connection() as conn:
+            self._rebuild_aggregates(conn.cursor())
+
+    @staticmethod
+    def _ensure_tag_indexes(cursor):
+        """
+        標籤索引策略
+
+        - (project_name, tag) 唯一索引：支撐 add_tag 的重複檢查，也涵蓋依專案查詢標籤
+        - (tag, project_name) 覆蓋索引：依標籤找專案時不需回表
+        """
+        cursor.execute("PRAGMA index_list(project_tags)")
+        unique_indexes = [row["name"] for row in cursor.fetchall() if row["unique"]]
+        has_unique = False
+        for index_name in unique_indexes:
+            cursor.execute(f"PRAGMA index_info({index_name})")
+            if [row["name"] for row in cursor.fetchall()] == ["project_name", "tag"]:
+                has_unique = True
+                break
+
+        if not has_unique:
+            # 舊資料庫可能缺少唯一約束，先移除重複列再建立唯一索引
+            cursor.execute("""
+                DELETE FROM project_tags
+                WHERE id NOT IN (
+                    SELECT MIN(id) FROM project_tags GROUP BY project_name, tag
+                )
+            """)
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tags_project ON project_tags(project_name)"
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_unique ON project_tags(project_name, tag)"
             )
 
+        # 唯一索引已以 project_name 開頭，單欄索引成為多餘的寫入成本
+        cursor.execute("DROP INDEX IF EXISTS idx_tags_project")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tags_tag ON project_tags(tag, project_name)"
+        )
+
     # ===== 收藏管理 =====
 
     def get_favorites(self) -> List[str]:
@@ -240,14 +851,31 @@ class DatabaseManager:
         Args:
             project_data: 專案資料字典，必須包含 'name' 鍵
         """
+        git = project_data.get("git") or {}
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO project_cache 
-                (name, description, languages, git_status, git_detail, has_git, last_scan)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                INSERT INTO project_cache 
+                (name, description, languages, git_status, git_detail, has_git,
+                 branch, upstream, ahead, behind, last_commit_at, last_commit_author,
+                 last_scan)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET
+                    description = excluded.description,
+                    languages = excluded.languages,
+                    git_status = excluded.git_status,
+                    git_detail = excluded.git_detail,
+                    has_git = excluded.has_git,
+                    branch = excluded.branch,
+                    upstream = excluded.upstream,
+                    ahead = excluded.ahead,
+                    behind = excluded.behind,
+                    last_commit_at = excluded.last_commit_at,
+                    last_commit_author = excluded.last_commit_author,
+                    last_scan = excluded.last_scan
             """,
                 (
                     project_data.get("name"),
@@ -256,25 +884,110 @@ class DatabaseManager:
                     project_data.get("git_status", ["Unknown", ""])[0],
                     project_data.get("git_status", ["", ""])[1],
                     project_data.get("has_git", False),
+                    git.get("branch"),
+                    git.get("upstream"),
+                    git.get("ahead"),
+                    git.get("behind"),
+                    git.get("last_commit_at"),
+                    git.get("last_commit_author"),
                 ),
             )
 
+        self.memory_cache.invalidate(project_data.get("name"))
+
+    def cache_records(self, records: Iterable):
+        """
+        批次快取多筆專案記錄（單一連線與交易）
+
+        Args:
+            records: ProjectRecord 序列（例如 WorkspaceSnapshot）
+        """
+        rows = [
+            (
+                record.name,
+                record.description,
+                json.dumps(record.language_map),
+                record.git_status or "Unknown",
+                record.git_detail or "",
+                record.has_git,
+                record.branch,
+                record.upstream,
+                record.ahead,
+                record.behind,
+                record.last_commit_at,
+                record.last_commit_author,
+            )
+            for record in records
+        ]
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO project_cache 
+                (name, description, languages, git_status, git_detail, has_git,
+                 branch, upstream, ahead, behind, last_commit_at, last_commit_author,
+                 last_scan)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET
+                    description = excluded.description,
+                    languages = excluded.languages,
+                    git_status = excluded.git_status,
+                    git_detail = excluded.git_detail,
+                    has_git = excluded.has_git,
+                    branch = excluded.branch,
+                    upstream = excluded.upstream,
+                    ahead = excluded.ahead,
+                    behind = excluded.behind,
+                    last_commit_at = excluded.last_commit_at,
+                    last_commit_author = excluded.last_commit_author,
+                    last_scan = excluded.last_scan
+            """,
+                rows,
+            )
+
+        self.memory_cache.invalidate_many(row[0] for row in rows)
+
+    @staticmethod
+    def _cached_project_from_row(row) -> Dict[str, Any]:
+        return {
+            "name": row["name"],
+            "description": row["description"],
+            "languages": json.loads(row["languages"]) if row["languages"] else {},
+            "git_status": (row["git_status"], row["git_detail"]),
+            "git": {
+                "branch": row["branch"],
+                "upstream": row["upstream"],
+                "ahead": row["ahead"],
+                "behind": row["behind"],
+                "last_commit_at": row["last_commit_at"],
+                "last_commit_author": row["last_commit_author"],
+            },
+            "has_git": bool(row["has_git"]),
+            "last_scan": row["last_scan"],
+        }
+
     def get_cached_project(self, project_name: str) -> Dict[str, Any]:
         """
-        從快取獲取專案資訊
+        從快取獲取專案資訊（先查記憶體層，未命中才讀取 SQLite）
 
         Args:
             project_name: 專案名稱
 
         Returns:
-            專案資料字典或 None
+            專案資料字典或 None（回傳淺層複本，巢狀的 languages 與 git 請勿修改）
         """
+        self._sync_memory_cache()
+        cached = self.memory_cache.get(project_name)
+        if cached is not None:
+            self.record_access(project_name)
+            return dict(cached)
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                SELECT name, description, languages, git_status, git_detail, 
-                       has_git, last_scan
+                f"""
+                SELECT {self._CACHED_PROJECT_COLUMNS}
                 FROM project_cache 
                 WHERE name = ?
             """,
@@ -282,18 +995,309 @@ class DatabaseManager:
             )
 
             row = cursor.fetchone()
-            if row:
-                return {
-                    "name": row["name"],
-                    "description": row["description"],
-                    "languages": json.loads(row["languages"])
-                    if row["languages"]
-                    else {},
-                    "git_status": (row["git_status"], row["git_detail"]),
-                    "has_git": bool(row["has_git"]),
-                    "last_scan": row["last_scan"],
-                }
-            return None
+            if row is None:
+                return None
+
+            self._touch(cursor, [project_name])
+            cached = self._cached_project_from_row(row)
+
+        self.memory_cache.set(project_name, cached)
+        return dict(cached)
+
+    def warm_memory_cache(self, project_names: Optional[Iterable[str]] = None) -> int:
+        """
+        以單一查詢將專案載入記憶體快取層
+
+        Args:
+            project_names: 要載入的專案，省略時載入所有收藏專案
+
+        Returns:
+            載入的項目數
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT generation FROM cache_generation WHERE scope = 'project_cache'"
+            )
+            generation = cursor.fetchone()["generation"]
+            if project_names is None:
+                cursor.execute(f"""
+                    SELECT {self._CACHED_PROJECT_COLUMNS}
+                    FROM project_cache
+                    WHERE name IN (SELECT name FROM favorites)
+                """)
+            else:
+                names = list(project_names)
+                cursor.execute(
+                    f"""
+                    SELECT {self._CACHED_PROJECT_COLUMNS}
+                    FROM project_cache
+                    WHERE name IN ({self._placeholders(names)})
+                """,
+                    names,
+                )
+            items = [
+                (row["name"], self._cached_project_from_row(row))
+                for row in cursor.fetchall()
+            ]
+
+        if generation != self._memory_generation:
+            self.memory_cache.invalidate()
+            self._memory_generation = generation
+        self._generation_checked_at = time.monotonic()
+
+        self.memory_cache.set_many(items)
+        return len(items)
+
+    def get_cached_rows(self) -> List[Dict[str, Any]]:
+        """
+        一次讀取所有快取列（供其他行程重用掃描結果建立快照）
+
+        Returns:
+            [{'name', 'description', 'languages', 'git_status', ...}]，languages 已解碼
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {self._CACHED_PROJECT_COLUMNS} FROM project_cache")
+            rows = []
+            for row in cursor.fetchall():
+                item = dict(row)
+                item["languages"] = json.loads(row["languages"]) if row["languages"] else {}
+                item["has_git"] = bool(row["has_git"])
+                rows.append(item)
+            return rows
+
+    @staticmethod
+    def _touch(cursor, project_names: Iterable[str]):
+        """更新快取列的存取統計（供 LRU/LFU 淘汰使用）"""
+        now = int(datetime.now().timestamp())
+        cursor.executemany(
+            """
+            UPDATE project_cache
+            SET access_count = COALESCE(access_count, 0) + 1, last_access = ?
+            WHERE name = ?
+        """,
+            [(now, name) for name in project_names],
+        )
+
+    def record_access(self, project_name: str):
+        """記錄一次專案存取（先累積在記憶體，淘汰前寫回）"""
+        now = int(datetime.now().timestamp())
+        with self._access_lock:
+            count, _ = self._pending_access.get(project_name, (0, 0))
+            self._pending_access[project_name] = (count + 1, now)
+
+    def _flush_access(self, cursor):
+        """將累積的存取統計寫回 project_cache"""
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+        cursor.executemany(
+            """
+            UPDATE project_cache
+            SET access_count = COALESCE(access_count, 0) + ?,
+                last_access = MAX(COALESCE(last_access, 0), ?)
+            WHERE name = ?
+        """,
+            [(count, last, name) for name, (count, last) in pending.items()],
+        )
+
+    def flush(self) -> int:
+        """
+        寫回記憶體中累積的存取統計（關閉前呼叫）
+
+        Returns:
+            寫回的專案數
+        """
+        with self._access_lock:
+            pending = len(self._pending_access)
+        if pending:
+            with self.get_connection() as conn:
+                self._flush_access(conn.cursor())
+        return pending
+
+    def prune_missing_projects(self, existing_names: Iterable[str]) -> int:
+        """
+        移除磁碟上已不存在之專案的快取列
+
+        Args:
+            existing_names: 目前存在的專案名稱（例如完整快照的 names()）
+
+        Returns:
+            刪除的列數
+        """
+        existing = set(existing_names)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM project_cache")
+            missing = [row["name"] for row in cursor.fetchall() if row["name"] not in existing]
+            cursor.executemany(
+                "DELETE FROM project_cache WHERE name = ?", [(name,) for name in missing]
+            )
+            # 淘汰快取列不代表專案消失，因此移除事件在這裡寫入而非由 DELETE 觸發器產生
+            cursor.executemany(
+                """
+                INSERT INTO events (type, project, data)
+                VALUES ('removed', ?, json_object('name', ?))
+            """,
+                [(name, name) for name in missing],
+            )
+            # 已不存在的專案（包含快取列先前已被淘汰者）之後再出現時視為新專案推送
+            cursor.execute(
+                "DELETE FROM known_projects WHERE name NOT IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(existing)),),
+            )
+
+        self.memory_cache.invalidate_many(missing)
+        return len(missing)
+
+    def enforce_cache_limits(self, protected: Iterable[str] = ()) -> int:
+        """
+        依列數與資料量上限淘汰快取列（收藏專案不淘汰）
+
+        淘汰順序：
+            - lru: 最久未存取者優先（從未存取者以最後掃描時間計）
+            - lfu: 存取次數最少者優先，同次數時最久未存取者優先
+
+        protected 中的專案（例如最新快照中的專案）優先佔用上限且永不淘汰，
+        只有不在其中的列會被淘汰；工作區本身超過上限時不影響快取的完整性。
+
+        Args:
+            protected: 不淘汰的專案名稱
+
+        Returns:
+            刪除的列數
+        """
+        recency = "COALESCE(last_access, CAST(strftime('%s', last_scan) AS INTEGER), 0)"
+        if self.eviction_policy == "lfu":
+            keep_order = f"COALESCE(access_count, 0) DESC, {recency} DESC"
+        else:
+            keep_order = f"{recency} DESC, COALESCE(access_count, 0) DESC"
+
+        row_size = (
+            "COALESCE(length(name), 0) + COALESCE(length(description), 0)"
+            " + COALESCE(length(languages), 0) + COALESCE(length(git_detail), 0)"
+            " + COALESCE(length(branch), 0) + COALESCE(length(upstream), 0)"
+            " + COALESCE(length(last_commit_author), 0) + 64"
+        )
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._flush_access(cursor)
+            # 依保留優先序累計列數與資料量，超出任一上限的列即淘汰
+            cursor.execute(
+                f"""
+                DELETE FROM project_cache
+                WHERE name IN (
+                    SELECT name FROM (
+                        SELECT name, protected,
+                               ROW_NUMBER() OVER (ORDER BY protected DESC, {keep_order}) AS rank,
+                               SUM({row_size}) OVER (
+                                   ORDER BY protected DESC, {keep_order}
+                                   ROWS UNBOUNDED PRECEDING
+                               ) AS running_bytes
+                        FROM (
+                            SELECT *, name IN (SELECT value FROM json_each(?)) AS protected
+                            FROM project_cache
+                        )
+                        WHERE name NOT IN (SELECT name FROM favorites)
+                    )
+                    WHERE NOT protected AND (rank > ? OR running_bytes > ?)
+                )
+            """,
+                (json.dumps(list(protected)), self.cache_max_rows, self.cache_max_bytes),
+            )
+            evicted = cursor.rowcount
+
+        if evicted:
+            self.memory_cache.invalidate()
+        return evicted
+
+    def maybe_run_maintenance(
+        self, now: Optional[int] = None, protected: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        依間隔執行自動維護；未到期的工作直接略過，可在每次掃描後呼叫
+
+        - 每次：淘汰超過上限的快取列（protected 中的專案不淘汰）、清除超過保留時間的事件
+        - optimize（每小時）：PRAGMA optimize
+        - analyze（每天）：ANALYZE 更新查詢規劃統計
+        - vacuum（每週，或可用空間超過四分之一時）：VACUUM 回收空間
+
+        Returns:
+            {'evicted': 淘汰列數, 'events_pruned': 清除的事件數, 'ran': [已執行的工作]}
+        """
+        now = int(now if now is not None else datetime.now().timestamp())
+        report = {
+            "evicted": self.enforce_cache_limits(protected),
+            "events_pruned": self.prune_events(),
+            "ran": [],
+        }
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT task, last_run FROM maintenance_log")
+            last_runs = {row["task"]: row["last_run"] for row in cursor.fetchall()}
+
+            cursor.execute("PRAGMA page_count")
+            page_count = cursor.fetchone()[0]
+            cursor.execute("PRAGMA freelist_count")
+            freelist_count = cursor.fetchone()[0]
+            fragmented = page_count > 0 and freelist_count > page_count // 4
+
+            due = [
+                task
+                for task, interval in self.MAINTENANCE_INTERVALS.items()
+                if now - last_runs.get(task, 0) >= interval
+                or (task == "vacuum" and fragmented)
+            ]
+            for task in due:
+                if task == "optimize":
+                    cursor.execute("PRAGMA optimize")
+                elif task == "analyze":
+                    cursor.execute("ANALYZE")
+            cursor.executemany(
+                """
+                INSERT INTO maintenance_log (task, last_run) VALUES (?, ?)
+                ON CONFLICT(task) DO UPDATE SET last_run = excluded.last_run
+            """,
+                [(task, now) for task in due],
+            )
+            report["ran"] = due
+
+        # VACUUM 不能在交易中執行
+        if "vacuum" in due:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+
+        return report
+
+    def get_recently_active(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        依快取中的最後提交時間列出最近活躍的專案（不需重新執行 git）
+
+        Args:
+            limit: 最多回傳幾筆
+
+        Returns:
+            包含分支、領先/落後與最後提交資訊的字典列表
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT name, git_status, git_detail, branch, upstream, ahead, behind,
+                       last_commit_at, last_commit_author
+                FROM project_cache
+                WHERE last_commit_at IS NOT NULL
+                ORDER BY last_commit_at DESC
+                LIMIT ?
+            """,
+                (limit,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
 
     def get_cache_age(self, project_name: str) -> Optional[float]:
         """
@@ -319,7 +1323,11 @@ class DatabaseManager:
             """,
                 (max_age_days,),
             )
-            return cursor.rowcount
+            deleted = cursor.rowcount
+
+        if deleted:
+            self.memory_cache.invalidate()
+        return deleted
 
     # ===== 標籤管理 =====
 
@@ -366,6 +1374,24 @@ class DatabaseManager:
             )
             return [row["tag"] for row in cursor.fetchall()]
 
+    def get_tags_map(self) -> Dict[str, List[str]]:
+        """
+        一次取得所有專案的標籤
+
+        Returns:
+            {專案名稱: [標籤, ...]}，順序與 get_project_tags 相同
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT project_name, tag FROM project_tags
+                ORDER BY created_at DESC
+            """)
+            tags: Dict[str, List[str]] = {}
+            for row in cursor.fetchall():
+                tags.setdefault(row["project_name"], []).append(row["tag"])
+            return tags
+
     def find_by_tag(self, tag: str) -> List[str]:
         """搜尋具有特定標籤的專案"""
         with self.get_connection() as conn:
@@ -380,33 +1406,612 @@ class DatabaseManager:
             )
             return [row["project_name"] for row in cursor.fetchall()]
 
+    def search_by_tags(
+        self,
+        all_tags: Optional[Iterable[str]] = None,
+        any_tags: Optional[Iterable[str]] = None,
+        exclude_tags: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        favorites_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        多標籤布林查詢（單一 SQL 查詢）
+
+        Args:
+            all_tags: 必須同時具有的標籤（AND）
+            any_tags: 至少具有其一的標籤（OR）
+            exclude_tags: 不可具有的標籤（NOT）
+            language: 專案快取中須包含的語言（不分大小寫）
+            favorites_only: 只回傳收藏的專案
+
+        Returns:
+            [{'name': ..., 'is_favorite': ...}]，依名稱排序
+        """
+        all_tags = self._normalize_tags(all_tags)
+        any_tags = self._normalize_tags(any_tags)
+        exclude_tags = self._normalize_tags(exclude_tags)
+
+        params: List[Any] = []
+
+        # 以最具選擇性的條件作為候選集合，讓查詢從 idx_tags_tag 開始
+        if all_tags:
+            base = f"""
+                SELECT project_name AS name FROM project_tags
+                WHERE tag IN ({self._placeholders(all_tags)})
+                GROUP BY project_name
+                HAVING COUNT(*) = ?
+            """
+            params += all_tags + [len(all_tags)]
+        elif any_tags:
+            base = f"""
+                SELECT DISTINCT project_name AS name FROM project_tags
+                WHERE tag IN ({self._placeholders(any_tags)})
+            """
+            params += any_tags
+        elif favorites_only:
+            base = "SELECT name FROM favorites"
+        else:
+            base = """
+                SELECT name FROM project_cache
+                UNION SELECT project_name FROM project_tags
+                UNION SELECT name FROM favorites
+            """
+
+        conditions = []
+        if all_tags and any_tags:
+            conditions.append(
+                f"c.name IN (SELECT project_name FROM project_tags WHERE tag IN ({self._placeholders(any_tags)}))"
+            )
+            params += any_tags
+        if exclude_tags:
+            conditions.append(
+                f"c.name NOT IN (SELECT project_name FROM project_tags WHERE tag IN ({self._placeholders(exclude_tags)}))"
+            )
+            params += exclude_tags
+        if favorites_only and (all_tags or any_tags):
+            conditions.append("c.name IN (SELECT name FROM favorites)")
+        if language:
+            conditions.append("""
+                EXISTS (
+                    SELECT 1 FROM project_cache pc, json_each(pc.languages) lang
+                    WHERE pc.name = c.name AND lower(lang.key) = lower(?)
+                )
+            """)
+            params.append(language.strip())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT c.name AS name,
+                   EXISTS (SELECT 1 FROM favorites f WHERE f.name = c.name) AS is_favorite
+            FROM ({base}) c
+            {where}
+            ORDER BY c.name COLLATE NOCASE
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [
+                {"name": row["name"], "is_favorite": bool(row["is_favorite"])}
+                for row in cursor.fetchall()
+            ]
+
+    @staticmethod
+    def _normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+        """與 add_tag 相同的正規化（去空白、小寫、去重）"""
+        if not tags:
+            return []
+        return list(dict.fromkeys(t.strip().lower() for t in tags if t and t.strip()))
+
+    @staticmethod
+    def _placeholders(values: List[Any]) -> str:
+        return ", ".join("?" for _ in values)
+
     def get_all_tags(self) -> List[Dict[str, Any]]:
         """獲取所有標籤及其使用次數"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT tag, COUNT(*) as count
-                FROM project_tags
-                GROUP BY tag
-                ORDER BY count DESC, tag ASC
+                SELECT tag, project_count as count
+                FROM tag_counts
+                ORDER BY project_count DESC, tag ASC
             """)
             return [
                 {"tag": row["tag"], "count": row["count"]} for row in cursor.fetchall()
             ]
 
+    # ===== 依賴索引 =====
+
+    def get_manifest_fingerprints(self, project_name: str) -> Dict[str, tuple]:
+        """
+        獲取專案已索引清單的指紋
+
+        Returns:
+            {清單檔名: (mtime_ns, size)}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT manifest, mtime_ns, size FROM dependency_manifests
+                WHERE project_name = ?
+            """,
+                (project_name,),
+            )
+            return {
+                row["manifest"]: (row["mtime_ns"], row["size"])
+                for row in cursor.fetchall()
+            }
+
+    def replace_manifest_dependencies(
+        self, project_name: str, manifest: str, fingerprint: tuple, rows: Iterable
+    ):
+        """
+        以新的解析結果取代單一清單的依賴列（單一交易）
+
+        Args:
+            project_name: 專案名稱
+            manifest: 清單檔名
+            fingerprint: (mtime_ns, size)
+            rows: DependencyRow 序列
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM dependencies WHERE project_name = ? AND manifest = ?",
+                (project_name, manifest),
+            )
+            cursor.executemany(
+                """
+                INSERT INTO dependencies
+                (project_name, manifest, ecosystem, package, version, spec)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (project_name, manifest, row.ecosystem, row.package, row.version, row.spec)
+                    for row in rows
+                ],
+            )
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO dependency_manifests
+                (project_name, manifest, mtime_ns, size, indexed_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+                (project_name, manifest, fingerprint[0], fingerprint[1]),
+            )
+
+    def remove_manifests(self, project_name: str, manifests: Optional[List[str]] = None):
+        """移除專案的清單索引（manifests 為 None 時移除全部）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if manifests is None:
+                cursor.execute(
+                    "DELETE FROM dependencies WHERE project_name = ?", (project_name,)
+                )
+                cursor.execute(
+                    "DELETE FROM dependency_manifests WHERE project_name = ?",
+                    (project_name,),
+                )
+                return
+            for manifest in manifests:
+                cursor.execute(
+                    "DELETE FROM dependencies WHERE project_name = ? AND manifest = ?",
+                    (project_name, manifest),
+                )
+                cursor.execute(
+                    "DELETE FROM dependency_manifests WHERE project_name = ? AND manifest = ?",
+                    (project_name, manifest),
+                )
+
+    def get_indexed_dependency_projects(self) -> List[str]:
+        """已建立依賴索引的專案名稱"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT project_name FROM dependency_manifests")
+            return [row["project_name"] for row in cursor.fetchall()]
+
+    def get_project_dependencies(self, project_name: str) -> List[Dict[str, Any]]:
+        """獲取專案的所有依賴列"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT ecosystem, package, version, spec, manifest
+                FROM dependencies
+                WHERE project_name = ?
+                ORDER BY ecosystem, package
+            """,
+                (project_name,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def find_dependency_rows(
+        self, packages: Iterable[str], ecosystem: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        反向依賴查詢：列出使用指定套件的所有依賴列（走 idx_deps_package）
+
+        Args:
+            packages: 已正規化的套件名稱（各生態系的正規化結果可能不同）
+            ecosystem: 限定生態系
+        """
+        packages = list(dict.fromkeys(packages))
+        if not packages:
+            return []
+
+        query = f"""
+            SELECT project_name, manifest, ecosystem, package, version, spec
+            FROM dependencies
+            WHERE package IN ({self._placeholders(packages)})
+        """
+        params: List[Any] = packages
+        if ecosystem:
+            query += " AND ecosystem = ?"
+            params = packages + [ecosystem]
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query + " ORDER BY project_name", params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    # ===== 專案歷史 =====
+
+    def _language_mix_id(self, cursor, languages: Dict[str, int]) -> Optional[int]:
+        """取得（必要時建立）語言組成的字典 id"""
+        if not languages:
+            return None
+        mix = encode_language_mix(languages)
+        mix_id = self._mix_ids.get(mix)
+        if mix_id is None:
+            cursor.execute(
+                "INSERT INTO language_mixes (mix) VALUES (?) ON CONFLICT(mix) DO NOTHING",
+                (mix,),
+            )
+            cursor.execute("SELECT id FROM language_mixes WHERE mix = ?", (mix,))
+            mix_id = cursor.fetchone()["id"]
+            self._mix_ids[mix] = mix_id
+        return mix_id
+
+    def record_history(self, records: Iterable, now: Optional[int] = None) -> int:
+        """
+        將專案狀態附加到時間序列
+
+        狀態（Git 狀態、變更檔案數、語言組成）與最後一筆相同且未超過心跳間隔時不寫入。
+        同時每天最多執行一次 prune_history()。
+
+        Args:
+            records: 含 Git 狀態的 ProjectRecord 序列（例如 WorkspaceSnapshot）
+            now: 觀測時間（epoch 秒），預設為目前時間
+
+        Returns:
+            新增的列數
+        """
+        now = int(now if now is not None else datetime.now().timestamp())
+        rows = []
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for record in records:
+                if record.git_status is None:
+                    continue
+                git_state, changed, languages = history_key(record)
+                mix_id = self._language_mix_id(cursor, languages)
+
+                cursor.execute(
+                    """
+                    SELECT observed_at, git_state, modified_count, language_mix_id, state_since
+                    FROM project_history
+                    WHERE project_name = ?
+                    ORDER BY observed_at DESC
+                    LIMIT 1
+                """,
+                    (record.name,),
+                )
+                last = cursor.fetchone()
+
+                state_since = now
+                if last is not None:
+                    if last["observed_at"] >= now:
+                        continue
+                    if last["git_state"] == git_state:
+                        state_since = last["state_since"]
+                        unchanged = (
+                            last["modified_count"] == changed
+                            and last["language_mix_id"] == mix_id
+                        )
+                        if unchanged and now - last["observed_at"] < HEARTBEAT_SECONDS:
+                            continue
+
+                rows.append((record.name, now, git_state, changed, mix_id, state_since))
+
+            cursor.executemany(
+                """
+                INSERT INTO project_history
+                (project_name, observed_at, git_state, modified_count, language_mix_id, state_since)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+
+        if now - self._history_pruned_at >= 24 * 3600:
+            self.prune_history(now=now)
+
+        return len(rows)
+
+    def prune_history(
+        self,
+        retention_days: int = RETENTION_DAYS,
+        downsample_after_days: int = DOWNSAMPLE_AFTER_DAYS,
+        now: Optional[int] = None,
+    ) -> int:
+        """
+        套用保留與降採樣策略
+
+        - 超過 retention_days 的列刪除
+        - 超過 downsample_after_days 的列，每個專案每天（UTC）只保留最後一筆；
+          state_since 保存在每一列中，降採樣不影響持續時間的計算
+
+        Returns:
+            刪除的列數
+        """
+        now = int(now if now is not None else datetime.now().timestamp())
+        self._history_pruned_at = now
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM project_history WHERE observed_at < ?",
+                (now - retention_days * 86400,),
+            )
+            deleted = cursor.rowcount
+
+            cursor.execute(
+                """
+                DELETE FROM project_history
+                WHERE observed_at < ?
+                  AND EXISTS (
+                      SELECT 1 FROM project_history later
+                      WHERE later.project_name = project_history.project_name
+                        AND later.observed_at > project_history.observed_at
+                        AND later.observed_at < (project_history.observed_at / 86400 + 1) * 86400
+                  )
+            """,
+                (now - downsample_after_days * 86400,),
+            )
+            deleted += cursor.rowcount
+
+            if deleted:
+                cursor.execute("""
+                    DELETE FROM language_mixes
+                    WHERE id NOT IN (
+                        SELECT language_mix_id FROM project_history
+                        WHERE language_mix_id IS NOT NULL
+                    )
+                """)
+                if cursor.rowcount:
+                    self._mix_ids.clear()
+
+            return deleted
+
+    def get_project_history(
+        self, project_name: str, since: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        單一專案的狀態時間序列（依時間遞增）
+
+        Args:
+            project_name: 專案名稱
+            since: 起始時間（epoch 秒）
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT h.observed_at, h.git_state, h.modified_count, h.state_since,
+                       m.mix
+                FROM project_history h
+                LEFT JOIN language_mixes m ON m.id = h.language_mix_id
+                WHERE h.project_name = ? AND h.observed_at >= ?
+                ORDER BY h.observed_at
+            """,
+                (project_name, since or 0),
+            )
+            return [
+                {
+                    "observed_at": row["observed_at"],
+                    "git_status": decode_git_state(row["git_state"]),
+                    "modified_count": row["modified_count"],
+                    "state_since": row["state_since"],
+                    "languages": decode_language_mix(row["mix"]),
+                }
+                for row in cursor.fetchall()
+            ]
+
+    def find_projects_in_state(
+        self, git_status: str, min_days: float, now: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        目前處於指定 Git 狀態且已持續超過 min_days 天的專案
+
+        由 idx_history_state 找出候選列，再以主鍵確認該列是專案的最新一筆。
+
+        Returns:
+            [{'name', 'since', 'days', 'modified_count', 'observed_at'}]，持續最久者在前
+        """
+        now = int(now if now is not None else datetime.now().timestamp())
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT h.project_name, h.state_since, h.modified_count, h.observed_at
+                FROM project_history h
+                WHERE h.git_state = ? AND h.state_since <= ?
+                  AND h.observed_at = (
+                      SELECT MAX(observed_at) FROM project_history
+                      WHERE project_name = h.project_name
+                  )
+                ORDER BY h.state_since
+            """,
+                (GIT_STATE_CODES.get(git_status, 0), now - int(min_days * 86400)),
+            )
+            return [
+                {
+                    "name": row["project_name"],
+                    "since": row["state_since"],
+                    "days": round((now - row["state_since"]) / 86400, 1),
+                    "modified_count": row["modified_count"],
+                    "observed_at": row["observed_at"],
+                }
+                for row in cursor.fetchall()
+            ]
+
     # ===== 統計與分析 =====
 
-    def record_scan(self, projects_found: int, duration_ms: int):
-        """記錄掃描歷史"""
+    def record_scan(
+        self,
+        projects_found: int,
+        duration_ms: int,
+        folders_without_readme: Optional[int] = None,
+    ):
+        """
+        記錄掃描歷史
+
+        Args:
+            projects_found: 專案數
+            duration_ms: 掃描耗時（毫秒）
+            folders_without_readme: 同一次列舉中缺少 README.md 的資料夾數
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO scan_history
+                    (projects_found, scan_duration_ms, folders_without_readme)
+                VALUES (?, ?, ?)
+            """,
+                (projects_found, duration_ms, folders_without_readme),
+            )
+
+    def get_last_scan(self) -> Optional[Dict[str, int]]:
+        """
+        最近一次完整掃描
+
+        Returns:
+            {'scanned_at': epoch 秒, 'projects_found': 專案數,
+             'folders_without_readme': 缺少 README.md 的資料夾數（遷移 4 之前的掃描為 None）}，
+            尚未掃描時為 None
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT CAST(strftime('%s', scan_time) AS INTEGER) AS scanned_at,
+                       projects_found, folders_without_readme
+                FROM scan_history
+                ORDER BY id DESC
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    # ===== 即時事件 =====
+
+    def get_events_since(
+        self, after_id: int, limit: int = 500, up_to: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        讀取 after_id 之後的事件（依 id 遞增）
+
+        Args:
+            after_id: 已讀取的最後一個事件 id
+            limit: 最多筆數
+            up_to: 只讀到此 id（含）為止
+
+        Returns:
+            [{'id', 'type', 'project', 'data'（JSON 字串）}, ...]
+        """
+        query = "SELECT id, type, project, data FROM events WHERE id > ?"
+        params: List[Any] = [after_id]
+        if up_to is not None:
+            query += " AND id <= ?"
+            params.append(up_to)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        with self.get_connection() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    def get_event_bounds(self) -> tuple:
+        """
+        (最早保留的事件 id, 最後一個事件 id)
+
+        最後一個 id 取自 sqlite_sequence，事件全部清除後仍然遞增、不會重複使用。
+        沒有任何事件時為 (None, 0)。
+        """
+        with self.get_connection() as conn:
+            first = conn.execute("SELECT MIN(id) FROM events").fetchone()[0]
+            row = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'events'"
+            ).fetchone()
+        return first, row[0] if row else 0
+
+    def prune_events(self, max_age: Optional[int] = None) -> int:
+        """刪除超過保留時間的事件，回傳刪除筆數"""
+        max_age = self.EVENT_RETENTION if max_age is None else max_age
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM events WHERE created_at < CAST(strftime('%s', 'now') AS INTEGER) - ?",
+                (max_age,),
+            )
+            return cursor.rowcount
+
+    # ===== 跨行程租約 =====
+
+    def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """
+        取得或續約具名租約（同一時間只有一個持有者，過期的租約可被接手）
+
+        Args:
+            name: 租約名稱（例如 'scan'）
+            holder: 持有者識別（例如 pid@hostname）
+            ttl: 有效秒數
+
+        Returns:
+            是否取得
+        """
+        now = time.time()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO scan_history (projects_found, scan_duration_ms)
-                VALUES (?, ?)
+                INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE
+                    SET holder = excluded.holder, expires_at = excluded.expires_at
+                    WHERE leases.holder = excluded.holder OR leases.expires_at < ?
             """,
-                (projects_found, duration_ms),
+                (name, holder, now + ttl, now),
             )
+            return cursor.rowcount == 1
+
+    def release_lease(self, name: str, holder: str):
+        """釋放自己持有的租約"""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+
+    def get_lease(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        有效中的租約
+
+        Returns:
+            {'holder': 持有者, 'expires_in': 剩餘秒數}，沒有持有者或已過期時為 None
+        """
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT holder, expires_at FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None or row["expires_at"] < time.time():
+            return None
+        return {"holder": row["holder"], "expires_in": round(row["expires_at"] - time.time(), 1)}
 
     def get_scan_history(self, limit: int = 10) -> List[Dict]:
         """獲取掃描歷史"""
@@ -424,32 +2029,55 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
 
     def get_statistics(self) -> Dict:
-        """獲取統計資訊"""
+        """獲取統計資訊（讀取觸發器維護的計數，單一查詢）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    (SELECT value FROM stat_counters WHERE name = 'favorites') AS favorites_count,
+                    (SELECT value FROM stat_counters WHERE name = 'cached_projects') AS cached_projects,
+                    (SELECT value FROM stat_counters WHERE name = 'tags') AS total_tags,
+                    (SELECT scan_time FROM scan_history ORDER BY id DESC LIMIT 1) AS last_scan
+            """)
+            row = cursor.fetchone()
 
-            # 收藏數量
-            cursor.execute("SELECT COUNT(*) as count FROM favorites")
-            favorites_count = cursor.fetchone()["count"]
+            return {
+                "favorites_count": row["favorites_count"] or 0,
+                "cached_projects": row["cached_projects"] or 0,
+                "total_tags": row["total_tags"] or 0,
+                "last_scan": row["last_scan"],
+            }
 
-            # 快取數量
-            cursor.execute("SELECT COUNT(*) as count FROM project_cache")
-            cached_count = cursor.fetchone()["count"]
+    def get_language_counts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """各語言出現在多少個快取專案中（依專案數遞減）"""
+        query = """
+            SELECT language, project_count FROM language_counts
+            ORDER BY project_count DESC, language ASC
+        """
+        params: List[Any] = []
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
 
-            # 標籤數量
-            cursor.execute("SELECT COUNT(DISTINCT tag) as count FROM project_tags")
-            tags_count = cursor.fetchone()["count"]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [
+                {"language": row["language"], "count": row["project_count"]}
+                for row in cursor.fetchall()
+            ]
 
-            # 最近掃描時間
-            cursor.execute("SELECT MAX(scan_time) as last_scan FROM scan_history")
-            last_scan = cursor.fetchone()["last_scan"]
+    def get_git_state_counts(self) -> Dict[str, int]:
+        """
+        各 Git 狀態的快取專案數
 
-            return {
-                "favorites_count": favorites_count,
-                "cached_projects": cached_count,
-                "total_tags": tags_count,
-                "last_scan": last_scan,
-            }
+        Returns:
+            {'Clean': 3, 'Modified': 1, ...}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT git_status, project_count FROM git_state_counts")
+            return {row["git_status"]: row["project_count"] for row in cursor.fetchall()}
 
     def export_data(self) -> Dict:
         """匯出所有資料（用於備份）"""
@@ -497,5 +2125,33 @@ class DatabaseManager:
                     INSERT OR IGNORE INTO project_tags (project_name, tag, created_at)
                     VALUES (?, ?, ?)
                 """,
-                    (tag["project_name"], tag["tag"], tag["created_at"]),
+                    (tag["project_name"], tag["tag"].strip().lower(), tag["created_at"]),
                 )
+
+
+# 結構遷移（見 core/migrations.py）：只能在尾端新增，已發布的遷移不可修改；
+# 新的索引、資料表或欄位以新版本加入，既有安裝啟動時自動套用
+MIGRATIONS = (
+    Migration(1, "baseline schema", DatabaseManager._create_baseline_schema),
+    Migration(
+        2,
+        "cross-process leases",
+        lambda cursor: cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """),
+    ),
+    Migration(3, "live update events", DatabaseManager._create_events),
+    Migration(
+        4,
+        "no-README folder count per scan",
+        lambda cursor: DatabaseManager._ensure_columns(
+            cursor, "scan_history", {"folders_without_readme": "INTEGER"}
+        ),
+    ),
+    Migration(5, "project events only for new content", DatabaseManager._track_known_projects),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
@@ -0,0 +1,57 @@
+"""
+Project Dashboard v2 - Deadline
+請求的時間預算：預算用盡時呼叫端回傳已完成的部分結果，其餘工作留在背景繼續
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class Deadline:
+    """
+    以 monotonic 時間表示的截止時間
+
+    budget 為 None 或不大於 0 時代表不限時，remaining() 回傳 None，
+    可直接傳給 Event.wait()、Future.result() 等接受 None 為無限等待的介面。
+    """
+
+    __slots__ = ('budget', '_clock', '_expires_at')
+
+    def __init__(self, budget: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            budget: 時間預算秒數，None 或 0 代表不限時
+            clock: 時間來源（預設 time.monotonic）
+        """
+        self.budget = budget if budget and budget > 0 else None
+        self._clock = clock
+        self._expires_at = clock() + self.budget if self.budget is not None else None
+
+    @property
+    def unlimited(self) -> bool:
+        return self._expires_at is None
+
+    def remaining(self) -> Optional[float]:
+        """剩餘秒數（不會小於 0），不限時回傳 None"""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def clamp(self, timeout: Optional[float]) -> Optional[float]:
+        """將單一操作的逾時限制在剩餘預算內"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def wait(self, event: threading.Event) -> bool:
+        """在預算內等待事件，回傳事件是否已設定"""
+        return event.wait(self.remaining())
@@ -0,0 +1,678 @@
+"""
+Project Dashboard v2 - Dependency Manifests
+解析各生態系的依賴清單與鎖定檔，正規化為 (生態系, 套件, 版本, 版本需求) 列，
+並以檔案指紋增量更新 SQLite 中的依賴索引
+"""
+import json
+import os
+import re
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class DependencyRow:
+    """正規化後的單筆依賴"""
+
+    ecosystem: str
+    package: str
+    # 確切版本（鎖定檔或 == 釘選），無法確定時為 None
+    version: Optional[str]
+    # 清單中宣告的版本需求（如 '>=2.0'、'^1.2'），鎖定檔為 None
+    spec: Optional[str]
+    manifest: str
+
+
+# ===== 名稱與版本正規化 =====
+
+_PEP508_PATTERN = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*)$')
+_EXACT_SEMVER = re.compile(r'^v?\d+(\.\d+)*([.+-][0-9A-Za-z.+-]+)?$')
+
+
+def normalize_package(ecosystem: str, name: str) -> str:
+    """依生態系規則正規化套件名稱"""
+    name = name.strip()
+    if ecosystem == 'pypi':
+        return re.sub(r'[-_.]+', '-', name).lower()
+    if ecosystem in ('npm', 'composer'):
+        return name.lower()
+    if ecosystem == 'cargo':
+        return name.lower().replace('_', '-')
+    return name
+
+
+def _exact_version(spec: Optional[str]) -> Optional[str]:
+    """從版本需求取出確切版本（'==1.2.3'、'=1.2.3'、'1.2.3'）"""
+    if not spec:
+        return None
+    spec = spec.strip()
+    if spec.startswith('==') and ',' not in spec and '*' not in spec:
+        return spec[2:].strip()
+    if spec.startswith('=') and not spec.startswith('=='):
+        spec = spec[1:].strip()
+    if _EXACT_SEMVER.match(spec):
+        return spec.lstrip('v')
+    return None
+
+
+def _pep508_row(requirement: str, manifest: str) -> Optional[DependencyRow]:
+    """解析 PEP 508 依賴字串"""
+    requirement = requirement.split(';', 1)[0].strip()
+    if not requirement or requirement.startswith(('-', 'git+', 'http:', 'https:', 'file:', '.')):
+        return None
+    if ' @ ' in requirement:
+        requirement = requirement.split(' @ ', 1)[0]
+
+    match = _PEP508_PATTERN.match(requirement)
+    if not match:
+        return None
+    spec = match.group(3).strip().strip('()').replace(' ', '') or None
+    return DependencyRow(
+        'pypi', normalize_package('pypi', match.group(1)), _exact_version(spec), spec, manifest
+    )
+
+
+def _spec_row(ecosystem: str, name: str, value, manifest: str) -> DependencyRow:
+    """由 '名稱 = 版本需求' 或 {version = ...} 形式建立依賴列"""
+    if isinstance(value, dict):
+        value = value.get('version')
+    spec = str(value).strip() if value not in (None, '', '*') else None
+    return DependencyRow(
+        ecosystem, normalize_package(ecosystem, name), _exact_version(spec), spec, manifest
+    )
+
+
+# ===== 各清單解析器 =====
+
+def parse_requirements(path: Path) -> List[DependencyRow]:
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith('#'):
+                continue
+            row = _pep508_row(line, path.name)
+            if row:
+                rows.append(row)
+    return rows
+
+
+def parse_pyproject(path: Path) -> List[DependencyRow]:
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+
+    rows = []
+    project = data.get('project', {})
+    requirements = list(project.get('dependencies', []))
+    for group in project.get('optional-dependencies', {}).values():
+        requirements.extend(group)
+    for group in data.get('dependency-groups', {}).values():
+        requirements.extend(item for item in group if isinstance(item, str))
+
+    for requirement in requirements:
+        row = _pep508_row(requirement, path.name)
+        if row:
+            rows.append(row)
+
+    poetry = data.get('tool', {}).get('poetry', {})
+    poetry_tables = [poetry.get('dependencies', {}), poetry.get('dev-dependencies', {})]
+    poetry_tables += [group.get('dependencies', {}) for group in poetry.get('group', {}).values()]
+    for table in poetry_tables:
+        for name, value in table.items():
+            if name.lower() != 'python':
+                rows.append(_spec_row('pypi', name, value, path.name))
+
+    return rows
+
+
+def parse_pipfile(path: Path) -> List[DependencyRow]:
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+    return [
+        _spec_row('pypi', name, value, path.name)
+        for section in ('packages', 'dev-packages')
+        for name, value in data.get(section, {}).items()
+    ]
+
+
+def parse_pipfile_lock(path: Path) -> List[DependencyRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    rows = []
+    for section in ('default', 'develop'):
+        for name, info in data.get(section, {}).items():
+            version = (info.get('version') or '').lstrip('=') or None
+            rows.append(DependencyRow('pypi', normalize_package('pypi', name), version, None, path.name))
+    return rows
+
+
+def _parse_toml_lock(ecosystem: str) -> Callable[[Path], List[DependencyRow]]:
+    """uv.lock、poetry.lock、Cargo.lock 共用的 [[package]] 解析器"""
+
+    def parser(path: Path) -> List[DependencyRow]:
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+        rows = []
+        for package in data.get('package', []):
+            source = package.get('source')
+            # 略過專案本身（uv 的 editable/virtual 或 Cargo 無 source 的本地 crate）
+            if isinstance(source, dict) and ('editable' in source or 'virtual' in source):
+                continue
+            if ecosystem == 'cargo' and source is None:
+                continue
+            rows.append(DependencyRow(
+                ecosystem,
+                normalize_package(ecosystem, package['name']),
+                package.get('version'),
+                None,
+                path.name
+            ))
+        return rows
+
+    return parser
+
+
+def parse_package_json(path: Path) -> List[DependencyRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [
+        _spec_row('npm', name, spec, path.name)
+        for section in ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies')
+        for name, spec in (data.get(section) or {}).items()
+    ]
+
+
+def parse_package_lock(path: Path) -> List[DependencyRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    rows = []
+    packages = data.get('packages')
+    if packages:
+        # lockfileVersion 2/3：鍵為 node_modules 路徑
+        for key, info in packages.items():
+            if not key or 'node_modules/' not in key or info.get('link'):
+                continue
+            name = info.get('name') or key.rsplit('node_modules/', 1)[1]
+            rows.append(DependencyRow('npm', normalize_package('npm', name), info.get('version'), None, path.name))
+        return rows
+
+    # lockfileVersion 1：巢狀 dependencies
+    stack = list((data.get('dependencies') or {}).items())
+    while stack:
+        name, info = stack.pop()
+        rows.append(DependencyRow('npm', normalize_package('npm', name), info.get('version'), None, path.name))
+        stack.extend((info.get('dependencies') or {}).items())
+    return rows
+
+
+def parse_cargo_toml(path: Path) -> List[DependencyRow]:
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+
+    tables = [data]
+    tables += list(data.get('target', {}).values())
+    tables.append(data.get('workspace', {}))
+
+    rows = []
+    for table in tables:
+        for section in ('dependencies', 'dev-dependencies', 'build-dependencies'):
+            for name, value in table.get(section, {}).items():
+                if isinstance(value, dict) and 'package' in value:
+                    name = value['package']
+                rows.append(_spec_row('cargo', name, value, path.name))
+    return rows
+
+
+def parse_go_mod(path: Path) -> List[DependencyRow]:
+    rows = []
+    in_block = False
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('//', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('require ('):
+                in_block = True
+                continue
+            if in_block and line == ')':
+                in_block = False
+                continue
+            if line.startswith('require '):
+                line = line[len('require '):].strip()
+            elif not in_block:
+                continue
+            parts = line.split()
+            if len(parts) >= 2:
+                rows.append(DependencyRow('go', parts[0], parts[1].lstrip('v'), parts[1], path.name))
+    return rows
+
+
+def parse_composer_json(path: Path) -> List[DependencyRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [
+        _spec_row('composer', name, spec, path.name)
+        for section in ('require', 'require-dev')
+        for name, spec in (data.get(section) or {}).items()
+        if name != 'php' and not name.startswith('ext-')
+    ]
+
+
+# 清單檔名 → 解析器（requirements*.txt 另外比對）
+MANIFEST_PARSERS: Dict[str, Callable[[Path], List[DependencyRow]]] = {
+    'pyproject.toml': parse_pyproject,
+    'uv.lock': _parse_toml_lock('pypi'),
+    'poetry.lock': _parse_toml_lock('pypi'),
+    'Pipfile': parse_pipfile,
+    'Pipfile.lock': parse_pipfile_lock,
+    'package.json': parse_package_json,
+    'package-lock.json': parse_package_lock,
+    'Cargo.toml': parse_cargo_toml,
+    'Cargo.lock': _parse_toml_lock('cargo'),
+    'go.mod': parse_go_mod,
+    'composer.json': parse_composer_json,
+}
+
+# 鎖定檔（包含遞移依賴，不列入專案摘要）
+LOCK_FILES = {'uv.lock', 'poetry.lock', 'Pipfile.lock', 'package-lock.json', 'Cargo.lock'}
+
+
+def _parser_for(filename: str) -> Optional[Callable[[Path], List[DependencyRow]]]:
+    if filename in MANIFEST_PARSERS:
+        return MANIFEST_PARSERS[filename]
+    if filename.startswith('requirements') and filename.endswith('.txt'):
+        return parse_requirements
+    return None
+
+
+def find_manifests(project_path: Path) -> Dict[str, Tuple[int, int]]:
+    """
+    列出專案根目錄中的依賴清單（單次 scandir）
+
+    Returns:
+        {檔名: (mtime_ns, size)}
+    """
+    manifests = {}
+    try:
+        with os.scandir(project_path) as it:
+            for entry in it:
+                if _parser_for(entry.name) and entry.is_file():
+                    st = entry.stat()
+                    manifests[entry.name] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass
+    return manifests
+
+
+def parse_manifest(path: Path) -> List[DependencyRow]:
+    """解析單一清單檔，格式錯誤時回傳空列表"""
+    parser = _parser_for(path.name)
+    if parser is None:
+        return []
+    try:
+        return parser(path)
+    except Exception:
+        return []
+
+
+# ===== 版本比較 =====
+
+_VERSION_PATTERN = re.compile(r'v?(\d+(?:\.\d+)*)')
+_CONSTRAINT_PATTERN = re.compile(r'^(<=|>=|==|!=|<|>|=)?\s*(v?\d+(?:\.\d+)*)$')
+# 版本需求中代表「下限」的運算子（^、~、~=、>=、== 與無運算子）
+_LOWER_BOUND_PATTERN = re.compile(r'^(\^|~=|~|>=|==|=)?\s*v?(\d+(?:\.\d+)*)')
+
+_COMPARATORS = {
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+
+def parse_version(text: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """
+    取出版本字串開頭的數字部分（'1.2.3rc1' → (1, 2, 3)）
+
+    尾端的 0 會被移除，使 '1.2' 與 '1.2.0' 相等；預發布標記不參與比較。
+    """
+    if not text:
+        return None
+    match = _VERSION_PATTERN.match(text.strip())
+    if not match:
+        return None
+    parts = [int(part) for part in match.group(1).split('.')]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def parse_constraint(text: str) -> List[Tuple[str, Tuple[int, ...]]]:
+    """
+    解析版本過濾條件（以逗號分隔，例如 '<2.0'、'>=1.4,<2'）
+
+    Raises:
+        ValueError: 條件格式無效
+    """
+    constraints = []
+    for clause in text.split(','):
+        clause = clause.strip()
+        if not clause:
+            continue
+        match = _CONSTRAINT_PATTERN.match(clause)
+        if not match:
+            raise ValueError(f"無效的版本條件: {clause}")
+        op = match.group(1) or '=='
+        constraints.append(('==' if op == '=' else op, parse_version(match.group(2))))
+    if not constraints:
+        raise ValueError(f"無效的版本條件: {text}")
+    return constraints
+
+
+def version_satisfies(version: Tuple[int, ...], constraints: List[Tuple[str, Tuple[int, ...]]]) -> bool:
+    """版本是否同時符合所有條件"""
+    return all(_COMPARATORS[op](version, bound) for op, bound in constraints)
+
+
+# 版本範圍：(下限, 含下限, 上限, 含上限)，None 代表無界
+VersionRange = Tuple[Optional[Tuple[int, ...]], bool, Optional[Tuple[int, ...]], bool]
+
+_SPEC_CLAUSE_PATTERN = re.compile(
+    r'^(\^|~=|~|>=|<=|==|!=|=|>|<)?v?(\d+(?:\.\d+)*)((?:\.[xX*])*)(?:[-+.]?[0-9A-Za-z.+-]*)$'
+)
+_UNBOUNDED: VersionRange = (None, False, None, False)
+
+
+def _normalize(parts: List[int]) -> Tuple[int, ...]:
+    """移除尾端的 0（與 parse_version 一致）"""
+    parts = list(parts)
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _bump(parts: List[int], index: int) -> Tuple[int, ...]:
+    """保留前 index + 1 段並將最後一段加一（'1.2.3' 於 1 → '1.3'）"""
+    return _normalize(parts[:index] + [parts[index] + 1])
+
+
+def _clause_range(ecosystem: str, clause: str) -> Optional[VersionRange]:
+    """單一版本需求子句允許的範圍，無法解析時回傳 None"""
+    if clause in ('*', 'x', 'X'):
+        return _UNBOUNDED
+    match = _SPEC_CLAUSE_PATTERN.match(clause)
+    if not match:
+        return None
+    op, digits, wildcard = match.groups()
+    parts = [int(part) for part in digits.split('.')]
+    version = _normalize(parts)
+
+    if op is None and ecosystem == 'cargo' and not wildcard:
+        op = '^'
+    if op == '^':
+        nonzero = next((i for i, part in enumerate(parts) if part), len(parts) - 1)
+        return (version, True, _bump(parts, nonzero), False)
+    if op == '~' and ecosystem != 'composer':
+        return (version, True, _bump(parts, min(1, len(parts) - 1)), False)
+    if op in ('~', '~='):
+        return (version, True, _bump(parts, max(len(parts) - 2, 0)), False)
+    if op == '>=':
+        return (version, True, None, False)
+    if op == '>':
+        return (version, False, None, False)
+    if op == '<=':
+        return (None, False, version, True)
+    if op == '<':
+        return (None, False, version, False)
+    if op == '!=':
+        return _UNBOUNDED
+    # ==、= 或無運算子：確切版本；萬用字元（'1.2.*'）與 npm 的部分版本（'1.2'）為前綴範圍
+    if wildcard or (op is None and ecosystem == 'npm' and len(parts) < 3):
+        return (version, True, _bump(parts, len(parts) - 1), False)
+    return (version, True, version, True)
+
+
+def _intersect(a: VersionRange, b: VersionRange) -> VersionRange:
+    """兩個範圍的交集"""
+    low, low_inclusive, high, high_inclusive = a
+    if b[0] is not None and (low is None or b[0] > low or (b[0] == low and not b[1])):
+        low, low_inclusive = b[0], b[1]
+    if b[2] is not None and (high is None or b[2] < high or (b[2] == high and not b[3])):
+        high, high_inclusive = b[2], b[3]
+    return (low, low_inclusive, high, high_inclusive)
+
+
+def _contains(bounds: VersionRange, version: Tuple[int, ...]) -> bool:
+    """版本是否落在範圍內"""
+    low, low_inclusive, high, high_inclusive = bounds
+    if low is not None and (version < low or (version == low and not low_inclusive)):
+        return False
+    if high is not None and (version > high or (version == high and not high_inclusive)):
+        return False
+    return True
+
+
+def _is_empty(bounds: VersionRange) -> bool:
+    low, low_inclusive, high, high_inclusive = bounds
+    if low is None or high is None or low < high:
+        return False
+    return low > high or not (low_inclusive and high_inclusive)
+
+
+def spec_ranges(ecosystem: str, spec: Optional[str]) -> Optional[List[VersionRange]]:
+    """
+    版本需求允許的範圍（以 '||' 分隔的每個選項一個範圍）
+
+    支援 PEP 440（'>=2.0,<3'、'~=1.4'、'==1.2.*'）、npm / Composer（'^1.2'、'~1.2'、
+    '1.2.x'、'>=1.2 <2'、'1.2 - 1.4'）與 Cargo（'1.2' 即 '^1.2'）的寫法；
+    預發布標記不參與比較。無法解析時回傳 None。
+    """
+    if not spec:
+        return None
+    ranges = []
+    for alternative in spec.split('||'):
+        alternative = re.sub(r'(\S+)\s+-\s+(\S+)', r'>=\1,<=\2', alternative.strip())
+        alternative = re.sub(r'(<=|>=|==|!=|~=|[<>=^~])\s+', r'\1', alternative)
+        bounds = _UNBOUNDED
+        for clause in re.split(r'[,\s]+', alternative):
+            if not clause:
+                continue
+            clause_range = _clause_range(ecosystem, clause)
+            if clause_range is None:
+                return None
+            bounds = _intersect(bounds, clause_range)
+        ranges.append(bounds)
+    return ranges
+
+
+def spec_satisfies(ecosystem: str, spec: Optional[str],
+                   constraints: List[Tuple[str, Tuple[int, ...]]]) -> bool:
+    """
+    版本需求允許的每個版本是否都符合所有條件
+
+    只與條件部分重疊的需求不算符合：'>=2.0' 仍可能安裝 2.31，因此不符合 '<2.30'；
+    '~=2.28'（即 '>=2.28,<3'）同樣不符合，'>=2.0,<2.30' 與 '==2.28.*' 則符合。
+    """
+    ranges = spec_ranges(ecosystem, spec)
+    if not ranges:
+        return False
+    wanted = _UNBOUNDED
+    excluded = []
+    for op, bound in constraints:
+        if op == '!=':
+            excluded.append(bound)
+        else:
+            wanted = _intersect(wanted, _clause_range(ecosystem, op + '.'.join(map(str, bound))))
+    return all(
+        not _is_empty(bounds) and _intersect(bounds, wanted) == bounds
+        and not any(_contains(bounds, version) for version in excluded)
+        for bounds in ranges
+    )
+
+
+def lower_bound(spec: Optional[str]) -> Optional[str]:
+    """
+    由版本需求推估可能安裝的最低版本（'^18.2.0' → '18.2.0'、'>=2.31,<3' → '2.31'）
+
+    只有上限（'<3'）或無法解析時回傳 None。
+    """
+    if not spec:
+        return None
+    for clause in re.split(r'[,\s|]+', spec):
+        match = _LOWER_BOUND_PATTERN.match(clause)
+        if match:
+            return match.group(2)
+    return None
+
+
+# ===== 依賴索引 =====
+
+class DependencyIndex:
+    """
+    依賴索引
+
+    以 (mtime_ns, size) 判斷清單是否變更，只重新解析有變動的檔案，
+    並將正規化結果寫入 DatabaseManager 的 dependencies 表。
+    """
+
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager 實例
+        """
+        self.db = db
+        # 最近一次同步的快照建立時間
+        self._synced_at: Optional[float] = None
+
+    def refresh_project(self, project_name: str, project_path: Path) -> int:
+        """
+        增量更新單一專案的依賴
+
+        Returns:
+            重新解析的清單數
+        """
+        current = find_manifests(project_path)
+        stored = self.db.get_manifest_fingerprints(project_name)
+
+        removed = [manifest for manifest in stored if manifest not in current]
+        if removed:
+            self.db.remove_manifests(project_name, removed)
+
+        reparsed = 0
+        for manifest, fingerprint in current.items():
+            if stored.get(manifest) == fingerprint:
+                continue
+            rows = parse_manifest(project_path / manifest)
+            self.db.replace_manifest_dependencies(project_name, manifest, fingerprint, rows)
+            reparsed += 1
+
+        return reparsed
+
+    def refresh(self, projects: Iterable[Tuple[str, Path]],
+                keep: Iterable[str] = ()) -> int:
+        """
+        增量更新多個專案，並移除已不存在專案的索引
+
+        Args:
+            projects: (專案名稱, 專案路徑) 序列
+            keep: 這次不更新但保留既有索引的專案（例如檔案系統暫停存取中）
+
+        Returns:
+            重新解析的清單總數
+        """
+        seen = set(keep)
+        reparsed = 0
+        for name, path in projects:
+            seen.add(name)
+            reparsed += self.refresh_project(name, Path(path))
+
+        stale = set(self.db.get_indexed_dependency_projects()) - seen
+        for name in stale:
+            self.db.remove_manifests(name)
+
+        return reparsed
+
+    def sync(self, snapshot) -> int:
+        """
+        依工作區快照更新索引；同一份或較舊的快照只處理一次
+
+        stale（部分掃描）與 degraded（檔案系統暫停存取）的專案保留既有索引。
+
+        Args:
+            snapshot: WorkspaceSnapshot
+
+        Returns:
+            重新解析的清單總數
+        """
+        if self._synced_at is not None and snapshot.created_at <= self._synced_at:
+            return 0
+        reparsed = self.refresh(
+            ((record.name, Path(record.path)) for record in snapshot
+             if not record.stale and not record.degraded),
+            keep=[record.name for record in snapshot if record.stale or record.degraded]
+        )
+        self._synced_at = snapshot.created_at
+        return reparsed
+
+    def find_dependents(self, package: str, ecosystem: Optional[str] = None,
+                        version: Optional[str] = None) -> List[Dict]:
+        """
+        反向依賴查詢：哪些專案使用指定套件
+
+        每個 (專案, 生態系, 套件) 合併為一筆；鎖定檔中的確切版本優先於清單的版本需求。
+        沒有確切版本時，版本需求允許的所有版本都符合條件才列入（'>=2.0,<2.30' 符合 '<2.30'，
+        '>=2.0' 則不符合），此時 version 欄位為版本需求的下限，僅供顯示。
+
+        Args:
+            package: 套件名稱（依各生態系規則正規化）
+            ecosystem: 限定生態系（pypi、npm、cargo、go、composer）
+            version: 版本過濾條件，例如 '<2.0' 或 '>=1.4,<2'
+
+        Returns:
+            [{'project', 'ecosystem', 'package', 'version', 'spec', 'resolved', 'manifests'}]
+
+        Raises:
+            ValueError: 版本條件格式無效
+        """
+        constraints = parse_constraint(version) if version else None
+        ecosystems = [ecosystem] if ecosystem else ['pypi', 'npm', 'cargo', 'go', 'composer']
+        names = [normalize_package(eco, package) for eco in ecosystems]
+
+        merged: Dict[Tuple[str, str, str], Dict] = {}
+        for row in self.db.find_dependency_rows(names, ecosystem):
+            key = (row['project_name'], row['ecosystem'], row['package'])
+            entry = merged.setdefault(key, {
+                'project': row['project_name'],
+                'ecosystem': row['ecosystem'],
+                'package': row['package'],
+                'version': None,
+                'spec': None,
+                'resolved': False,
+                'manifests': []
+            })
+            entry['manifests'].append(row['manifest'])
+            if row['spec'] and not entry['spec']:
+                entry['spec'] = row['spec']
+            if row['version'] and (not entry['resolved'] or row['manifest'] in LOCK_FILES):
+                entry['version'] = row['version']
+                entry['resolved'] = True
+
+        results = []
+        for entry in merged.values():
+            if not entry['resolved']:
+                entry['version'] = lower_bound(entry['spec'])
+            if constraints is not None:
+                if entry['resolved']:
+                    parsed = parse_version(entry['version'])
+                    if parsed is None or not version_satisfies(parsed, constraints):
+                        continue
+                elif not spec_satisfies(entry['ecosystem'], entry['spec'], constraints):
+                    continue
+            results.append(entry)
+
+        return results
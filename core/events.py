@@ -0,0 +1,160 @@
+"""
+Project Dashboard v2 - Live Events
+即時事件匯流排：資料庫觸發器將專案異動寫入 events 表（任何行程的寫入都會記錄），
+每個 Web 行程以單一背景執行緒輪詢新事件並分送給所有訂閱的 SSE 連線
+"""
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from .database import DatabaseManager
+
+# 單一訂閱者最多累積的未讀批次；超過時改送 reset，由用戶端重新取得完整列表
+MAX_PENDING_BATCHES = 64
+
+
+def reset_event(event_id: int) -> Dict[str, Any]:
+    """要求用戶端重新取得完整列表（漏接的事件已被清除或累積過多）"""
+    return {'id': event_id, 'type': 'reset', 'project': None, 'data': '{}'}
+
+
+class Subscription:
+    """
+    單一 SSE 連線的訂閱
+
+    事件由輪詢執行緒透過 call_soon_threadsafe 放入連線所在事件迴圈的佇列，
+    等待事件不佔用執行緒池。
+    """
+
+    __slots__ = ('_bus', '_loop', '_queue', 'closed')
+
+    def __init__(self, bus: 'EventBus', loop: asyncio.AbstractEventLoop):
+        self._bus = bus
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    def deliver(self, events: List[Dict[str, Any]]):
+        """由任意執行緒送入一批事件"""
+        if self._queue.qsize() >= MAX_PENDING_BATCHES:
+            events = [reset_event(events[-1]['id'])]
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, events)
+        except RuntimeError:
+            # 事件迴圈已關閉
+            self.close()
+
+    async def get(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """等待下一批事件，逾時回傳空列表（呼叫端可藉此送出 keep-alive）"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    行程內的事件分送
+
+    沒有訂閱者時不輪詢資料庫；第一個訂閱者出現時才啟動輪詢執行緒，
+    最後一個訂閱者離開後執行緒自行結束。
+    """
+
+    def __init__(self, db: DatabaseManager, poll_interval: float = 1.0, backlog: int = 1000):
+        """
+        Args:
+            db: 資料庫管理器
+            poll_interval: 輪詢 events 表的間隔秒數
+            backlog: 重新連線時最多補送的事件數（超過時改送 reset）
+        """
+        self.db = db
+        self.poll_interval = poll_interval
+        self.backlog = backlog
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._last_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.delivered = 0
+
+    def subscribe(self, last_id: Optional[int] = None) -> Subscription:
+        """
+        訂閱之後的事件（需在事件迴圈中呼叫）
+
+        Args:
+            last_id: 用戶端最後收到的事件 id（SSE 的 Last-Event-ID），提供時先補送之後的事件
+        """
+        subscription = Subscription(self, asyncio.get_running_loop())
+        with self._lock:
+            if self._last_id is None:
+                self._last_id = self.db.get_event_bounds()[1]
+            if last_id is not None and last_id < self._last_id:
+                first_id, _ = self.db.get_event_bounds()
+                missed = self._last_id - last_id
+                if first_id is None or first_id > last_id + 1 or missed > self.backlog:
+                    subscription.deliver([reset_event(self._last_id)])
+                else:
+                    subscription.deliver(
+                        self.db.get_events_since(last_id, limit=missed, up_to=self._last_id)
+                    )
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='event-bus', daemon=True
+                )
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def close(self):
+        """停止輪詢（關閉時呼叫）"""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'last_id': self._last_id,
+                'delivered': self.delivered,
+                'polling': self._thread is not None
+            }
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                if not self._subscribers:
+                    # 重新訂閱時由最新的事件開始
+                    self._thread = None
+                    self._last_id = None
+                    return
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"讀取即時事件時發生錯誤: {e}")
+        with self._lock:
+            self._thread = None
+
+    def _poll(self):
+        """讀取並分送新事件（一次超過 backlog 筆時連續讀取）"""
+        while True:
+            events = self.db.get_events_since(self._last_id, limit=self.backlog)
+            if not events:
+                return
+            with self._lock:
+                self._last_id = events[-1]['id']
+                subscribers = list(self._subscribers)
+                self.delivered += len(events) * len(subscribers)
+            for subscription in subscribers:
+                subscription.deliver(events)
+            if len(events) < self.backlog:
+                return
@@ -0,0 +1,794 @@
+"""
+Project Dashboard v2 - In-process Git Status
+直接解析 .git/index 並比對工作目錄的 stat 資料，省去 fork/exec git 的開銷
+
+無法確定結果時（不支援的索引擴充、racy 項目、衝突、子模組、內容過濾器等）
+會拋出 Undecidable，由呼叫端退回 git 子程序。
+"""
+import hashlib
+import mmap
+import os
+import re
+import stat
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .git_metadata import GitMetadata
+
+
+class Undecidable(Exception):
+    """行程內無法判斷 Git 狀態，需退回 git 子程序"""
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    """索引中的單一檔案項目（stat 資料與物件雜湊）"""
+
+    path: str
+    ctime_s: int
+    ctime_ns: int
+    mtime_s: int
+    mtime_ns: int
+    dev: int
+    ino: int
+    mode: int
+    uid: int
+    gid: int
+    size: int
+    sha: bytes
+    flags: int
+    extended_flags: int = 0
+
+    @property
+    def stage(self) -> int:
+        return (self.flags >> 12) & 0x3
+
+
+# 索引項目固定長度部分：10 個 32 位元 stat 欄位 + 20 位元組 SHA-1 + 16 位元旗標
+_ENTRY_HEAD = struct.Struct('>10I20sH')
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_ASSUME_VALID = 0x8000
+_EXT_FLAG_SKIP_WORKTREE = 0x4000
+_EXT_FLAG_INTENT_TO_ADD = 0x2000
+
+_MODE_SYMLINK = 0o120000
+_MODE_GITLINK = 0o160000
+
+
+def read_index(index_path: Path) -> Tuple[List[IndexEntry], Dict[bytes, bytes], Tuple[int, int]]:
+    """
+    以 mmap 解析 .git/index（支援版本 2、3、4）
+
+    Args:
+        index_path: 索引檔路徑
+
+    Returns:
+        (項目列表, {擴充簽章: 內容}, 索引檔 mtime 的 (秒, 奈秒))
+
+    Raises:
+        Undecidable: 格式不支援或含必要擴充
+    """
+    try:
+        st = os.stat(index_path)
+    except FileNotFoundError:
+        # 尚無索引（全新倉庫）
+        raise Undecidable('missing index')
+
+    if st.st_size < 12:
+        raise Undecidable('truncated index')
+
+    index_mtime = (int(st.st_mtime_ns // 1_000_000_000), int(st.st_mtime_ns % 1_000_000_000))
+
+    with open(index_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            signature, version, count = struct.unpack_from('>4sII', data, 0)
+            if signature != b'DIRC' or version not in (2, 3, 4):
+                raise Undecidable(f'unsupported index version {version}')
+
+            entries: List[IndexEntry] = []
+            offset = 12
+            previous_path = b''
+            # 最後 20 位元組為整體檢查碼
+            end = len(data) - 20
+
+            for _ in range(count):
+                if offset + _ENTRY_HEAD.size > end:
+                    raise Undecidable('truncated index entry')
+
+                fields = _ENTRY_HEAD.unpack_from(data, offset)
+                entry_start = offset
+                offset += _ENTRY_HEAD.size
+                flags = fields[11]
+
+                extended_flags = 0
+                if flags & _FLAG_EXTENDED:
+                    if version < 3:
+                        raise Undecidable('extended flags in v2 index')
+                    extended_flags = struct.unpack_from('>H', data, offset)[0]
+                    offset += 2
+
+                if version == 4:
+                    # 路徑前綴壓縮：先移除前一路徑尾端 N 個位元組，再接上以 NUL 結尾的後綴
+                    strip, offset = _read_offset_varint(data, offset)
+                    nul = data.find(b'\0', offset)
+                    if nul < 0 or strip > len(previous_path):
+                        raise Undecidable('corrupt v4 path')
+                    path = previous_path[:len(previous_path) - strip] + data[offset:nul]
+                    offset = nul + 1
+                else:
+                    nul = data.find(b'\0', offset)
+                    if nul < 0:
+                        raise Undecidable('corrupt path')
+                    path = data[offset:nul]
+                    # 項目長度補齊為 8 的倍數（至少一個 NUL）
+                    entry_length = (nul - entry_start + 8) & ~7
+                    offset = entry_start + entry_length
+
+                previous_path = path
+                entries.append(IndexEntry(
+                    path=path.decode('utf-8', 'surrogateescape'),
+                    ctime_s=fields[0],
+                    ctime_ns=fields[1],
+                    mtime_s=fields[2],
+                    mtime_ns=fields[3],
+                    dev=fields[4],
+                    ino=fields[5],
+                    mode=fields[6],
+                    uid=fields[7],
+                    gid=fields[8],
+                    size=fields[9],
+                    sha=fields[10],
+                    flags=flags,
+                    extended_flags=extended_flags
+                ))
+
+            extensions: Dict[bytes, bytes] = {}
+            while offset + 8 <= end:
+                ext_signature, ext_size = struct.unpack_from('>4sI', data, offset)
+                offset += 8
+                # 大寫開頭為可選擴充；其餘（如 link、sdir）會改變索引語意
+                if not (b'A' <= ext_signature[:1] <= b'Z'):
+                    raise Undecidable(f'required index extension {ext_signature!r}')
+                extensions[ext_signature] = bytes(data[offset:offset + ext_size])
+                offset += ext_size
+
+    return entries, extensions, index_mtime
+
+
+def _read_offset_varint(data, offset: int) -> Tuple[int, int]:
+    """讀取 Git 的 offset varint（索引 v4 與 pack ofs-delta 使用）"""
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def _cache_tree_root(extensions: Dict[bytes, bytes]) -> Optional[bytes]:
+    """
+    取得 cache-tree（TREE 擴充）根節點的樹雜湊
+
+    Returns:
+        根樹雜湊；擴充不存在或根節點已失效時回傳 None
+    """
+    tree = extensions.get(b'TREE')
+    if not tree:
+        return None
+
+    # 根節點：空路徑 NUL、"<entry_count> <subtrees>\n"，有效時接著 20 位元組雜湊
+    nul = tree.find(b'\0')
+    newline = tree.find(b'\n', nul)
+    if nul != 0 or newline < 0:
+        return None
+    entry_count = int(tree[nul + 1:newline].split(b' ')[0])
+    if entry_count < 0:
+        return None
+    return tree[newline + 1:newline + 21]
+
+
+# ===== Git 設定 =====
+
+def read_git_config(paths: List[Path]) -> Dict[str, str]:
+    """
+    讀取 Git 設定檔（僅支援本模組需要的簡單語法）
+
+    Args:
+        paths: 依優先順序由低到高排列的設定檔
+
+    Returns:
+        {'section.key': value}（鍵名為小寫，後讀到的覆蓋先讀到的）
+
+    Raises:
+        Undecidable: 含 include 等無法靜態解析的設定
+    """
+    config: Dict[str, str] = {}
+    for path in paths:
+        try:
+            text = path.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+
+        section = ''
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line.startswith('['):
+                header = line[1:line.find(']')].strip()
+                name, _, subsection = header.partition(' ')
+                section = name.lower()
+                if section in ('include', 'includeif'):
+                    raise Undecidable('git config includes')
+                if subsection:
+                    section = section + '.' + subsection.strip().strip('"')
+                continue
+
+            key, sep, value = line.partition('=')
+            value = value.split(' #')[0].split(' ;')[0].strip().strip('"') if sep else 'true'
+            config[f"{section}.{key.strip().lower()}"] = value
+
+    return config
+
+
+def _config_bool(config: Dict[str, str], key: str, default: bool) -> bool:
+    value = config.get(key)
+    if value is None:
+        return default
+    return value.lower() in ('true', 'yes', 'on', '1')
+
+
+def _global_config_paths() -> List[Path]:
+    """系統與使用者層級的設定檔（由低到高優先）"""
+    home = Path.home()
+    xdg = Path(os.environ.get('XDG_CONFIG_HOME') or home / '.config')
+    return [Path('/etc/gitconfig'), xdg / 'git' / 'config', home / '.gitconfig']
+
+
+# ===== 忽略規則 =====
+
+def _translate_pattern(pattern: str) -> str:
+    """將 gitignore 萬用字元轉為正規表示式"""
+    result = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            result.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            result.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            result.append('.*')
+            i += 2
+        else:
+            char = pattern[i]
+            if char == '*':
+                result.append('[^/]*')
+            elif char == '?':
+                result.append('[^/]')
+            elif char == '[':
+                close = pattern.find(']', i + 2)
+                if close < 0:
+                    result.append(re.escape(char))
+                else:
+                    body = pattern[i + 1:close].replace('\\', '\\\\')
+                    if body[:1] == '!':
+                        body = '^' + body[1:]
+                    result.append('[' + body + ']')
+                    i = close
+            elif char == '\\' and i + 1 < n:
+                i += 1
+                result.append(re.escape(pattern[i]))
+            else:
+                result.append(re.escape(char))
+            i += 1
+    return ''.join(result)
+
+
+@dataclass(slots=True)
+class IgnorePattern:
+    base: str
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def parse_ignore_lines(lines: List[str], base: str = '') -> List[IgnorePattern]:
+    """
+    解析 gitignore 內容
+
+    Args:
+        lines: 檔案各行
+        base: 規則所在目錄（相對於工作目錄，根目錄為空字串）
+    """
+    patterns = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        if not line or line.startswith('#'):
+            continue
+        # 移除未跳脫的尾端空白
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        line = stripped
+        if not line:
+            continue
+
+        negate = False
+        if line.startswith('!'):
+            negate = True
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+
+        anchored = '/' in line
+        line = line.lstrip('/')
+        body = _translate_pattern(line)
+        if not anchored:
+            body = '(?:.*/)?' + body
+
+        patterns.append(IgnorePattern(base, re.compile(f'^{body}$', re.DOTALL), negate, dir_only))
+    return patterns
+
+
+def _read_ignore_file(path: Path, base: str = '') -> List[IgnorePattern]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            return parse_ignore_lines(f.readlines(), base)
+    except OSError:
+        return []
+
+
+def _is_ignored(patterns: List[IgnorePattern], rel_path: str, is_dir: bool) -> bool:
+    """套用規則（後出現者優先），回傳是否忽略"""
+    for pattern in reversed(patterns):
+        if pattern.dir_only and not is_dir:
+            continue
+        if pattern.base:
+            if not rel_path.startswith(pattern.base + '/'):
+                continue
+            candidate = rel_path[len(pattern.base) + 1:]
+        else:
+            candidate = rel_path
+        if pattern.regex.match(candidate):
+            return not pattern.negate
+    return False
+
+
+# ===== HEAD 樹雜湊 =====
+
+def _read_head(git_dir: Path) -> str:
+    """HEAD 檔案內容（'ref: refs/heads/...' 或分離狀態的提交雜湊）"""
+    try:
+        return (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        raise Undecidable('unreadable HEAD')
+
+
+def _resolve_ref(git_dir: Path, ref: str) -> Optional[bytes]:
+    """解析 ref 指向的提交雜湊（支援 loose ref 與 packed-refs；不存在時為 None）"""
+    try:
+        return bytes.fromhex((git_dir / ref).read_text().strip())
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        raise Undecidable('unsupported ref format')
+
+    try:
+        with open(git_dir / 'packed-refs', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(('#', '^')):
+                    continue
+                sha, _, name = line.strip().partition(' ')
+                if name == ref:
+                    return bytes.fromhex(sha)
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _resolve_head(git_dir: Path) -> Optional[bytes]:
+    """解析 HEAD 指向的提交雜湊（尚無提交時為 None）"""
+    head = _read_head(git_dir)
+    if not head.startswith('ref: '):
+        return bytes.fromhex(head)
+    return _resolve_ref(git_dir, head[5:])
+
+
+def _read_object(git_dir: Path, sha: bytes) -> Tuple[str, bytes]:
+    """讀取物件（loose 或非 delta 的 packed 物件）"""
+    hex_sha = sha.hex()
+    loose = git_dir / 'objects' / hex_sha[:2] / hex_sha[2:]
+    try:
+        raw = zlib.decompress(loose.read_bytes())
+        header, _, body = raw.partition(b'\0')
+        return header.split(b' ')[0].decode(), body
+    except FileNotFoundError:
+        pass
+
+    pack_dir = git_dir / 'objects' / 'pack'
+    for idx_path in pack_dir.glob('*.idx'):
+        offset = _find_in_pack_index(idx_path, sha)
+        if offset is None:
+            continue
+        with open(idx_path.with_suffix('.pack'), 'rb') as f:
+            f.seek(offset)
+            header = f.read(32)
+            byte = header[0]
+            obj_type = (byte >> 4) & 0x7
+            pos = 1
+            while byte & 0x80:
+                byte = header[pos]
+                pos += 1
+            # 1=commit, 2=tree；delta 物件需重建，交給 git 處理
+            if obj_type not in (1, 2, 3, 4):
+                raise Undecidable('deltified object')
+            f.seek(offset + pos)
+            decompressor = zlib.decompressobj()
+            body = b''
+            while not decompressor.eof:
+                chunk = f.read(4096)
+                if not chunk:
+                    break
+                body += decompressor.decompress(chunk)
+            return {1: 'commit', 2: 'tree', 3: 'blob', 4: 'tag'}[obj_type], body
+
+    raise Undecidable('object not found')
+
+
+def _find_in_pack_index(idx_path: Path, sha: bytes) -> Optional[int]:
+    """在 pack index v2 中以二分搜尋查找物件位移"""
+    with open(idx_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:4] != b'\xfftOc' or struct.unpack_from('>I', data, 4)[0] != 2:
+                raise Undecidable('unsupported pack index')
+            fanout = 8
+            total = struct.unpack_from('>I', data, fanout + 255 * 4)[0]
+            lo = struct.unpack_from('>I', data, fanout + (sha[0] - 1) * 4)[0] if sha[0] else 0
+            hi = struct.unpack_from('>I', data, fanout + sha[0] * 4)[0]
+            names = fanout + 256 * 4
+            while lo < hi:
+                mid = (lo + hi) // 2
+                candidate = data[names + mid * 20:names + mid * 20 + 20]
+                if candidate == sha:
+                    offsets = names + total * 20 + total * 4
+                    offset = struct.unpack_from('>I', data, offsets + mid * 4)[0]
+                    if offset & 0x80000000:
+                        large = offsets + total * 4 + (offset & 0x7FFFFFFF) * 8
+                        offset = struct.unpack_from('>Q', data, large)[0]
+                    return offset
+                if candidate < sha:
+                    lo = mid + 1
+                else:
+                    hi = mid
+    return None
+
+
+def _head_tree(git_dir: Path) -> Optional[bytes]:
+    """HEAD 提交的根樹雜湊（尚無提交時為 None）"""
+    commit = _resolve_head(git_dir)
+    if commit is None:
+        return None
+    obj_type, body = _read_object(git_dir, commit)
+    if obj_type != 'commit' or not body.startswith(b'tree '):
+        raise Undecidable('unexpected HEAD object')
+    return bytes.fromhex(body[5:45].decode())
+
+
+# ===== 工作目錄比對 =====
+
+def _blob_sha(path: str, is_symlink: bool) -> bytes:
+    """計算工作目錄檔案的 blob 雜湊"""
+    if is_symlink:
+        data = os.fsencode(os.readlink(path))
+    else:
+        with open(path, 'rb') as f:
+            data = f.read()
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).digest()
+
+
+class _StatusContext:
+    """單次狀態判斷所需的設定與規則"""
+
+    def __init__(self, worktree: Path, git_dir: Path, config: Dict[str, str]):
+        self.worktree = worktree
+        self.git_dir = git_dir
+        self.filemode = _config_bool(config, 'core.filemode', os.name != 'nt')
+        self.trustctime = _config_bool(config, 'core.trustctime', True)
+        self.checkstat_minimal = config.get('core.checkstat', '').lower() == 'minimal'
+        self.untracked_mode = config.get('status.showuntrackedfiles', 'normal').lower()
+
+        # 可能改變檔案內容的過濾器會讓雜湊比對失準
+        self.content_filters = (
+            os.name == 'nt'
+            or config.get('core.autocrlf', 'false').lower() not in ('false', 'no', 'off', '0')
+            or 'core.eol' in config
+            or (worktree / '.gitattributes').exists()
+            or (git_dir / 'info' / 'attributes').exists()
+        )
+
+        base_patterns: List[IgnorePattern] = []
+        excludes_file = config.get('core.excludesfile')
+        if excludes_file:
+            base_patterns += _read_ignore_file(Path(os.path.expanduser(excludes_file)))
+        else:
+            xdg = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config')
+            base_patterns += _read_ignore_file(xdg / 'git' / 'ignore')
+        base_patterns += _read_ignore_file(git_dir / 'info' / 'exclude')
+        self.base_patterns = base_patterns
+
+    def entry_changed(self, entry: IndexEntry, index_mtime: Tuple[int, int]) -> bool:
+        """比對單一索引項目與工作目錄"""
+        mode_type = entry.mode & 0o170000
+        if mode_type == _MODE_GITLINK:
+            raise Undecidable('submodule entry')
+
+        full_path = os.path.join(self.worktree, entry.path)
+        try:
+            st = os.lstat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return True
+
+        is_symlink = mode_type == _MODE_SYMLINK
+        if is_symlink != stat.S_ISLNK(st.st_mode):
+            return True
+        if not is_symlink:
+            if not stat.S_ISREG(st.st_mode):
+                return True
+            if self.filemode and bool(st.st_mode & 0o100) != bool(entry.mode & 0o100):
+                return True
+
+        size = st.st_size & 0xFFFFFFFF
+        if size != entry.size and entry.size != 0:
+            return True
+
+        stat_matches = (
+            int(st.st_mtime) & 0xFFFFFFFF == entry.mtime_s
+            and size == entry.size
+        )
+        if stat_matches and not self.checkstat_minimal:
+            stat_matches = (
+                (not self.trustctime or int(st.st_ctime) & 0xFFFFFFFF == entry.ctime_s)
+                and st.st_ino & 0xFFFFFFFF == entry.ino
+                and st.st_uid & 0xFFFFFFFF == entry.uid
+                and st.st_gid & 0xFFFFFFFF == entry.gid
+            )
+
+        # racy：檔案與索引在同一秒（或之後）寫入，stat 相同也不代表內容相同
+        racy = entry.mtime_s >= index_mtime[0]
+        if stat_matches and not racy:
+            return False
+
+        if self.content_filters:
+            raise Undecidable('content filters may apply')
+        return _blob_sha(full_path, is_symlink) != entry.sha
+
+    def count_untracked(self, tracked: Set[str], tracked_dirs: Set[str]) -> int:
+        """依 status.showUntrackedFiles 計算未追蹤項目數（對應 git status 的 ?? 行數）"""
+        if self.untracked_mode in ('no', 'false'):
+            return 0
+        show_all = self.untracked_mode == 'all'
+        return self._walk_untracked('', list(self.base_patterns), tracked, tracked_dirs, show_all)
+
+    def _walk_untracked(self, rel_dir: str, patterns: List[IgnorePattern], tracked: Set[str],
+                        tracked_dirs: Set[str], show_all: bool) -> int:
+        full_dir = os.path.join(self.worktree, rel_dir) if rel_dir else str(self.worktree)
+        patterns = patterns + _read_ignore_file(Path(full_dir) / '.gitignore', rel_dir)
+
+        count = 0
+        with os.scandir(full_dir) as it:
+            for entry in it:
+                if entry.name == '.git':
+                    continue
+                rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+
+                if not is_dir:
+                    if rel_path not in tracked and not _is_ignored(patterns, rel_path, False):
+                        count += 1
+                    continue
+
+                if _is_ignored(patterns, rel_path, True):
+                    continue
+                if rel_path in tracked_dirs:
+                    count += self._walk_untracked(rel_path, patterns, tracked, tracked_dirs, show_all)
+                elif os.path.exists(os.path.join(entry.path, '.git')):
+                    # 巢狀倉庫視為單一未追蹤目錄
+                    count += 1
+                elif show_all:
+                    count += self._walk_untracked(rel_path, patterns, tracked, tracked_dirs, show_all)
+                elif self._has_untracked_content(rel_path, patterns):
+                    # 預設模式下未追蹤目錄只列出一行
+                    count += 1
+        return count
+
+    def _has_untracked_content(self, rel_dir: str, patterns: List[IgnorePattern]) -> bool:
+        full_dir = os.path.join(self.worktree, rel_dir)
+        patterns = patterns + _read_ignore_file(Path(full_dir) / '.gitignore', rel_dir)
+        try:
+            with os.scandir(full_dir) as it:
+                for entry in it:
+                    rel_path = f'{rel_dir}/{entry.name}'
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if _is_ignored(patterns, rel_path, is_dir):
+                        continue
+                    if not is_dir:
+                        return True
+                    if entry.name == '.git' or self._has_untracked_content(rel_path, patterns):
+                        return True
+        except PermissionError:
+            raise Undecidable('unreadable directory')
+        return False
+
+
+def _read_repo_config(git_dir: Path) -> Dict[str, str]:
+    return read_git_config(_global_config_paths() + [git_dir / 'config'])
+
+
+def read_git_status(project_path: Path) -> Tuple[str, str]:
+    """
+    在行程內判斷專案的 Git 狀態（與 `git status --porcelain` 的行數一致）
+
+    Args:
+        project_path: 專案路徑（工作目錄根，.git 為目錄）
+
+    Returns:
+        ('Clean', 'No changes') 或 ('Modified', 'N file(s) changed')
+
+    Raises:
+        Undecidable: 無法確定時
+    """
+    git_dir = project_path / '.git'
+    config = _read_repo_config(git_dir)
+
+    if config.get('extensions.objectformat', 'sha1').lower() != 'sha1':
+        raise Undecidable('non-sha1 repository')
+    if _config_bool(config, 'core.ignorecase', False):
+        raise Undecidable('case-insensitive worktree')
+    if _config_bool(config, 'core.bare', False):
+        raise Undecidable('bare repository')
+
+    entries, extensions, index_mtime = read_index(git_dir / 'index')
+
+    # 暫存區與 HEAD 的差異：以 cache-tree 根雜湊與 HEAD 樹比對
+    root_tree = _cache_tree_root(extensions)
+    head_tree = _head_tree(git_dir)
+    if root_tree is None or head_tree is None or root_tree != head_tree:
+        raise Undecidable('index differs from HEAD or cache-tree invalid')
+
+    context = _StatusContext(project_path, git_dir, config)
+
+    changed = 0
+    tracked: Set[str] = set()
+    tracked_dirs: Set[str] = set()
+    for entry in entries:
+        if entry.stage != 0:
+            raise Undecidable('unmerged entry')
+        if entry.flags & _FLAG_ASSUME_VALID:
+            raise Undecidable('assume-valid entry')
+        if entry.extended_flags & (_EXT_FLAG_SKIP_WORKTREE | _EXT_FLAG_INTENT_TO_ADD):
+            raise Undecidable('skip-worktree or intent-to-add entry')
+
+        tracked.add(entry.path)
+        parent = entry.path.rpartition('/')[0]
+        while parent and parent not in tracked_dirs:
+            tracked_dirs.add(parent)
+            parent = parent.rpartition('/')[0]
+
+        if context.entry_changed(entry, index_mtime):
+            changed += 1
+
+    changed += context.count_untracked(tracked, tracked_dirs)
+
+    if changed:
+        return ('Modified', f'{changed} file(s) changed')
+    return ('Clean', 'No changes')
+
+
+def _upstream(git_dir: Path, config: Dict[str, str], branch: str) -> Optional[str]:
+    """
+    分支設定的上游（與 `# branch.upstream` 相同的 '<remote>/<branch>' 格式）
+
+    Raises:
+        Undecidable: 上游為本地分支或 remote 使用非預設的 fetch refspec
+    """
+    remote = config.get(f'branch.{branch}.remote')
+    merge = config.get(f'branch.{branch}.merge')
+    if not remote or not merge:
+        return None
+    if remote == '.' or not merge.startswith('refs/heads/'):
+        raise Undecidable('local or non-branch upstream')
+    if config.get(f'remote.{remote}.fetch', '').lstrip('+') != f'refs/heads/*:refs/remotes/{remote}/*':
+        raise Undecidable('non-default fetch refspec')
+    return f"{remote}/{merge[len('refs/heads/'):]}"
+
+
+def _commit_identity(git_dir: Path, commit: bytes) -> Tuple[int, str]:
+    """提交的 (提交時間, 作者名稱)，對應 `git log -1 --format=%ct%x00%an`"""
+    obj_type, body = _read_object(git_dir, commit)
+    if obj_type != 'commit':
+        raise Undecidable('unexpected HEAD object')
+
+    author = committer = None
+    for line in body.split(b'\n\n', 1)[0].split(b'\n'):
+        if line.startswith(b'author '):
+            author = line[len(b'author '):]
+        elif line.startswith(b'committer '):
+            committer = line[len(b'committer '):]
+        elif line.startswith(b'encoding '):
+            # git log 會轉換為 UTF-8，這裡不處理其他編碼
+            raise Undecidable('non-UTF-8 commit encoding')
+    if author is None or committer is None:
+        raise Undecidable('unexpected commit object')
+
+    try:
+        name = author[:author.index(b'<')].strip().decode('utf-8')
+        timestamp = int(committer.rsplit(b' ', 2)[1])
+    except (ValueError, UnicodeDecodeError, IndexError):
+        raise Undecidable('unparsable commit identity')
+    return timestamp, name
+
+
+def read_git_metadata(project_path: Path) -> GitMetadata:
+    """
+    在行程內收集與 collect_git_metadata 相同的 Git 中繼資料
+
+    狀態由 read_git_status 判斷；分支、上游與最後提交直接讀取 HEAD、設定與提交物件。
+    本地分支與上游指向不同提交時，計算領先/落後需要走訪提交圖，此時交給 git 子程序。
+
+    Args:
+        project_path: 專案路徑（工作目錄根，.git 為目錄）
+
+    Returns:
+        GitMetadata
+
+    Raises:
+        Undecidable: 無法確定時
+    """
+    status, detail = read_git_status(project_path)
+
+    git_dir = project_path / '.git'
+    head = _read_head(git_dir)
+    commit = _resolve_head(git_dir)
+    if commit is None:
+        raise Undecidable('no commits')
+
+    branch = upstream = ahead = behind = None
+    if head.startswith('ref: '):
+        ref = head[5:]
+        if not ref.startswith('refs/heads/'):
+            raise Undecidable('HEAD points outside refs/heads')
+        branch = ref[len('refs/heads/'):]
+        upstream = _upstream(git_dir, _read_repo_config(git_dir), branch)
+        if upstream is not None:
+            upstream_commit = _resolve_ref(git_dir, f'refs/remotes/{upstream}')
+            if upstream_commit == commit:
+                ahead = behind = 0
+            elif upstream_commit is not None:
+                raise Undecidable('branch differs from upstream')
+            # 上游分支已不存在時 git 也只列出上游名稱，不含領先/落後
+
+    last_commit_at, last_commit_author = _commit_identity(git_dir, commit)
+    return GitMetadata(
+        status=status,
+        detail=detail,
+        branch=branch,
+        upstream=upstream,
+        ahead=ahead,
+        behind=behind,
+        last_commit_at=last_commit_at,
+        last_commit_author=last_commit_author
+    )
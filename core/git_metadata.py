@@ -0,0 +1,140 @@
+"""
+Project Dashboard v2 - Git Metadata Collector
+以最少的子程序批次收集分支、上游領先/落後、最後提交時間與作者
+"""
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from .procgov import INTERACTIVE, governor
+
+# git 指令逾時時的 detail（呼叫端據此回報檔案系統健康狀態）
+TIMEOUT_DETAIL = 'Git command timeout'
+
+
+@dataclass(frozen=True, slots=True)
+class GitMetadata:
+    """單一倉庫的 Git 中繼資料"""
+
+    status: str
+    detail: str
+    branch: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    # 最後提交時間（Unix 秒數）
+    last_commit_at: Optional[int] = None
+    last_commit_author: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """序列化為字典（不含狀態欄位）"""
+        return {
+            'branch': self.branch,
+            'upstream': self.upstream,
+            'ahead': self.ahead,
+            'behind': self.behind,
+            'last_commit_at': self.last_commit_at,
+            'last_commit_author': self.last_commit_author
+        }
+
+
+NOT_A_REPO = GitMetadata('Not a Git repo', 'This project is not a Git repository')
+
+
+def parse_porcelain_v2(output: str) -> Dict:
+    """
+    解析 `git status --porcelain=v2 --branch` 的輸出
+
+    Returns:
+        {'branch', 'upstream', 'ahead', 'behind', 'changed'}
+    """
+    result = {
+        'branch': None,
+        'upstream': None,
+        'ahead': None,
+        'behind': None,
+        'changed': 0
+    }
+
+    for line in output.splitlines():
+        if line.startswith('# branch.head '):
+            head = line[len('# branch.head '):]
+            result['branch'] = None if head == '(detached)' else head
+        elif line.startswith('# branch.upstream '):
+            result['upstream'] = line[len('# branch.upstream '):]
+        elif line.startswith('# branch.ab '):
+            ahead, behind = line[len('# branch.ab '):].split()
+            result['ahead'] = int(ahead.lstrip('+'))
+            result['behind'] = int(behind.lstrip('-'))
+        elif line and not line.startswith('#'):
+            result['changed'] += 1
+
+    return result
+
+
+def collect_git_metadata(project_path: Path, timeout: float = 5,
+                         priority: str = INTERACTIVE) -> GitMetadata:
+    """
+    收集單一倉庫的 Git 中繼資料（最多兩個子程序）
+
+    Args:
+        project_path: 專案路徑
+        timeout: 每個 git 指令的逾時秒數
+        priority: 子程序閘門的工作類別（掃描使用 BACKGROUND）
+
+    Returns:
+        GitMetadata
+    """
+    if not (project_path / '.git').is_dir():
+        return NOT_A_REPO
+
+    try:
+        status_result = governor.run(
+            ['git', 'status', '--porcelain=v2', '--branch'],
+            priority=priority,
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if status_result.returncode != 0:
+            return GitMetadata('Error', 'Failed to get Git status')
+
+        parsed = parse_porcelain_v2(status_result.stdout)
+        if parsed['changed']:
+            status, detail = 'Modified', f"{parsed['changed']} file(s) changed"
+        else:
+            status, detail = 'Clean', 'No changes'
+
+        # 尚無任何提交的倉庫 git log 會失敗，此時保留 None
+        last_commit_at = last_commit_author = None
+        log_result = governor.run(
+            ['git', 'log', '-1', '--format=%ct%x00%an'],
+            priority=priority,
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if log_result.returncode == 0 and '\0' in log_result.stdout:
+            timestamp, author = log_result.stdout.strip().split('\0', 1)
+            last_commit_at = int(timestamp)
+            last_commit_author = author
+
+        return GitMetadata(
+            status=status,
+            detail=detail,
+            branch=parsed['branch'],
+            upstream=parsed['upstream'],
+            ahead=parsed['ahead'],
+            behind=parsed['behind'],
+            last_commit_at=last_commit_at,
+            last_commit_author=last_commit_author
+        )
+
+    except subprocess.TimeoutExpired:
+        return GitMetadata('Error', TIMEOUT_DETAIL)
+    except Exception as e:
+        return GitMetadata('Error', f'Git error: {str(e)}')
+
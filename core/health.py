@@ -0,0 +1,372 @@
+"""
+Project Dashboard v2 - I/O Health
+網路檔案系統（NFS/SMB）的慢速掛載隔離：以逾時執行檔案系統操作，
+依專案與掛載點記錄延遲，連續失敗時由斷路器暫停存取並依退避時間重試
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 斷路器狀態
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 延遲指數移動平均的權重
+LATENCY_ALPHA = 0.2
+
+
+class IOUnavailable(Exception):
+    """檔案系統操作逾時，或專案／掛載點的斷路器開啟中"""
+
+    def __init__(self, message: str, key: Optional[str] = None,
+                 retry_at: Optional[float] = None):
+        super().__init__(message)
+        self.key = key
+        self.retry_at = retry_at
+
+
+class Progress:
+    """
+    長時間檔案系統操作（例如走訪整個專案）的進度
+
+    操作每完成一個系統呼叫（例如列出一個目錄）呼叫 tick()；傳給 IOHealth.call() 時
+    逾時改為計算兩次 tick 之間的停滯時間，而不是整個操作的總時間。
+    """
+
+    __slots__ = ('ticks',)
+
+    def __init__(self):
+        self.ticks = 0
+
+    def tick(self):
+        self.ticks += 1
+
+
+class CircuitBreaker:
+    """
+    單一專案或掛載點的斷路器
+
+    連續失敗 threshold 次後開啟，開啟期間直接拒絕；退避時間到後進入半開，
+    只放行一次試探呼叫，成功即關閉，失敗則以加倍的退避時間重新開啟（上限 max_backoff）。
+    """
+
+    __slots__ = ('key', 'threshold', 'base_backoff', 'max_backoff', 'state', 'failures',
+                 'opened', 'retry_at', 'latency_ms', 'calls', 'last_error', '_trial')
+
+    def __init__(self, key: str, threshold: int = 3, base_backoff: float = 30,
+                 max_backoff: float = 900):
+        self.key = key
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+        self.calls = 0
+        self.last_error: Optional[str] = None
+        self._trial = False
+
+    def blocked(self, now: float) -> bool:
+        """是否會拒絕呼叫（不改變狀態）"""
+        if self.state == OPEN:
+            return now < self.retry_at
+        return self.state == HALF_OPEN and self._trial
+
+    def allow(self, now: float) -> bool:
+        """是否放行這次呼叫（半開時只放行一次試探）"""
+        if self.blocked(now):
+            return False
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            self._trial = True
+        return True
+
+    def record_success(self, seconds: float):
+        self._observe(seconds)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = None
+        self._trial = False
+
+    def release(self):
+        """放行的呼叫未實際執行：歸還半開狀態的試探機會"""
+        self._trial = False
+
+    def record_failure(self, seconds: float, error: str, now: float):
+        self._observe(seconds)
+        self.failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            self.opened += 1
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.opened - 1))
+            self.state = OPEN
+            self.retry_at = now + backoff
+            self._trial = False
+
+    def _observe(self, seconds: float):
+        ms = seconds * 1000
+        self.calls += 1
+        self.latency_ms = ms if self.latency_ms is None else (
+            LATENCY_ALPHA * ms + (1 - LATENCY_ALPHA) * self.latency_ms
+        )
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'state': self.state,
+            'failures': self.failures,
+            'calls': self.calls,
+            'latency_ms': round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            'retry_in': round(max(0.0, self.retry_at - now), 1) if self.retry_at else None,
+            'last_error': self.last_error
+        }
+
+
+def read_mount_points() -> List[str]:
+    """
+    目前的掛載點（由長到短排序）
+
+    只讀取 /proc/self/mounts，不對掛載點本身做任何 I/O；其他平台只回傳根目錄。
+    """
+    mounts = []
+    try:
+        with open('/proc/self/mounts', 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2:
+                    # 掛載點中的空白等字元以八進位跳脫（例如 \040）
+                    mounts.append(fields[1].encode().decode('unicode_escape'))
+    except OSError:
+        pass
+    if os.sep not in mounts:
+        mounts.append(os.sep)
+    return sorted(set(mounts), key=len, reverse=True)
+
+
+class _GuardPool:
+    """
+    執行受逾時保護之操作的背景執行緒池（有上限，閒置的執行緒重複使用）
+
+    執行緒為 daemon：卡在停滯掛載點上的系統呼叫無法中斷，不能讓它阻擋行程結束
+    （concurrent.futures.ThreadPoolExecutor 在結束時會等待所有執行緒）。
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.threads = 0
+        self._queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        future: Future = Future()
+        self._queue.put((future, fn))
+        if not self._idle.acquire(blocking=False):
+            with self._lock:
+                if self.threads < self.max_workers:
+                    self.threads += 1
+                    threading.Thread(
+                        target=self._work, name=f'io-guard-{self.threads}', daemon=True
+                    ).start()
+        return future
+
+    def _work(self):
+        while True:
+            future, fn = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                self._idle.release()
+                continue
+            try:
+                result = fn()
+            except BaseException as e:
+                # 先標記為閒置再交出結果：呼叫端接著提交的操作會重用這個執行緒
+                self._idle.release()
+                future.set_exception(e)
+            else:
+                self._idle.release()
+                future.set_result(result)
+
+
+def _run(fn: Callable[[], Any]) -> Future:
+    """在呼叫端直接執行 fn，結果（或例外）放入已完成的 Future"""
+    future: Future = Future()
+    try:
+        future.set_result(fn())
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+class IOHealth:
+    """
+    依專案與掛載點追蹤檔案系統健康狀態
+
+    call() 在背景執行緒池中執行操作並最多等待 timeout 秒：卡在停滯掛載點上的
+    系統呼叫無法中斷，但呼叫端不再被拖住，該執行緒完成後回到池中。
+    """
+
+    def __init__(self, timeout: float = 10, threshold: int = 3,
+                 base_backoff: float = 30, max_backoff: float = 900,
+                 clock: Callable[[], float] = time.monotonic, max_workers: int = 32):
+        """
+        Args:
+            timeout: 單一檔案系統操作的逾時秒數，0 代表不限時（直接在呼叫端執行）
+            threshold: 連續失敗幾次後開啟斷路器
+            base_backoff: 第一次開啟的退避秒數（之後每次加倍）
+            max_backoff: 退避秒數上限
+            clock: 時間來源（預設 time.monotonic）
+            max_workers: 執行操作的背景執行緒上限
+        """
+        self.timeout = timeout
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._mounts = read_mount_points()
+        self._pool = _GuardPool(max_workers)
+        self.timeouts = 0
+        # 執行緒全被停滯的操作佔用、未能在時限內開始執行的次數（不計為失敗）
+        self.saturated = 0
+
+    def refresh_mounts(self):
+        """重新讀取掛載點（掛載變更後呼叫）"""
+        self._mounts = read_mount_points()
+
+    def mount_of(self, path: Path) -> str:
+        """路徑所在的掛載點（以字串比對掛載表，不存取路徑本身）"""
+        path = str(path)
+        for mount in self._mounts:
+            if mount == os.sep or path == mount or path.startswith(mount.rstrip(os.sep) + os.sep):
+                return mount
+        return os.sep
+
+    def is_mount_point(self, path: Path) -> bool:
+        return str(path) in self._mounts
+
+    def _breaker(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(
+                key, self.threshold, self.base_backoff, self.max_backoff
+            )
+        return breaker
+
+    def _keys(self, name: str, path: Path) -> Tuple[str, str]:
+        return f'project:{name}', f'mount:{self.mount_of(path)}'
+
+    def available(self, name: str, path: Path) -> bool:
+        """專案與其掛載點的斷路器都未開啟（不消耗半開的試探機會）"""
+        now = self._clock()
+        with self._lock:
+            for key in self._keys(name, path):
+                breaker = self._breakers.get(key)
+                if breaker is not None and breaker.state == OPEN and now < breaker.retry_at:
+                    return False
+        return True
+
+    def call(self, name: str, path: Path, fn: Callable[[], Any],
+             timeout: Optional[float] = None, progress: Optional[Progress] = None) -> Any:
+        """
+        在逾時內執行專案的檔案系統操作並記錄結果
+
+        Args:
+            name: 專案名稱
+            path: 專案路徑（用於判斷掛載點）
+            fn: 無參數的操作
+            timeout: 逾時秒數，省略時使用預設值
+            progress: fn 回報進度的物件；提供時只要持續有進度就繼續等待，
+                      逾時只計算停滯的時間（大型但正常的專案不會因走訪時間長而逾時）
+
+        Raises:
+            IOUnavailable: 斷路器開啟中、操作逾時，或執行緒全被佔用而未能開始執行
+            Exception: 操作本身拋出的例外（時限內回應，不計為失敗）
+        """
+        project_key, mount_key = self._keys(name, path)
+        now = self._clock()
+        with self._lock:
+            breakers = [self._breaker(mount_key), self._breaker(project_key)]
+            # 先確認兩者都會放行，才取用半開狀態的試探機會
+            for breaker in breakers:
+                if breaker.blocked(now):
+                    retry_at = time.time() + (breaker.retry_at - now) if breaker.retry_at else None
+                    raise IOUnavailable(f"檔案系統暫停存取: {breaker.key}", breaker.key, retry_at)
+            for breaker in breakers:
+                breaker.allow(now)
+
+        timeout = self.timeout if timeout is None else timeout
+        started = self._clock()
+        if not timeout:
+            future = _run(fn)
+        else:
+            future = self._pool.submit(fn)
+            if not self._wait(future, timeout, progress):
+                if future.cancel():
+                    # 尚未開始執行：不是這個掛載點的問題，不計為失敗
+                    with self._lock:
+                        self.saturated += 1
+                        for breaker in breakers:
+                            breaker.release()
+                    raise IOUnavailable(f"檔案系統操作無可用的執行緒: {name}", project_key)
+                elapsed = self._clock() - started
+                with self._lock:
+                    self.timeouts += 1
+                    for breaker in breakers:
+                        breaker.record_failure(elapsed, 'timeout', self._clock())
+                raise IOUnavailable(f"檔案系統操作逾時: {name}", project_key)
+
+        # 操作在時限內回應（即使拋出例外，包括操作本身的 TimeoutError）即代表檔案系統正常
+        self._record_success(breakers, started)
+        return future.result()
+
+    @staticmethod
+    def _wait(future: Future, timeout: float, progress: Optional[Progress]) -> bool:
+        """等待操作完成；提供 progress 時只要兩次檢查之間有進度就繼續等待"""
+        ticks = progress.ticks if progress is not None else None
+        while True:
+            done, _ = wait([future], timeout)
+            if done:
+                return True
+            if progress is None or progress.ticks == ticks:
+                return False
+            ticks = progress.ticks
+
+    def _record_success(self, breakers: List[CircuitBreaker], started: float):
+        elapsed = self._clock() - started
+        with self._lock:
+            for breaker in breakers:
+                breaker.record_success(elapsed)
+
+    def record_failure(self, name: str, path: Path, error: str):
+        """由呼叫端回報的失敗（例如 git 指令逾時）"""
+        now = self._clock()
+        with self._lock:
+            for key in self._keys(name, path):
+                self._breaker(key).record_failure(0.0, error, now)
+
+    def stats(self) -> Dict[str, Any]:
+        """所有斷路器的狀態（非關閉者在前）"""
+        now = self._clock()
+        with self._lock:
+            breakers = [breaker.to_dict(now) for breaker in self._breakers.values()]
+        breakers.sort(key=lambda b: (b['state'] == CLOSED, b['key']))
+        return {
+            'timeout': self.timeout,
+            'threshold': self.threshold,
+            'timeouts': self.timeouts,
+            'saturated': self.saturated,
+            'threads': self._pool.threads,
+            'open': sum(1 for b in breakers if b['state'] != CLOSED),
+            'breakers': breakers
+        }
+
@@ -0,0 +1,67 @@
+"""
+Project Dashboard v2 - Project History
+專案狀態時間序列的精簡編碼（Git 狀態代碼、變更檔案數、語言組成）
+"""
+import json
+import re
+from typing import Dict, Optional, Tuple
+
+# Git 狀態以整數代碼保存，新增狀態只能附加在尾端
+GIT_STATE_CODES = {
+    'Unknown': 0,
+    'Clean': 1,
+    'Modified': 2,
+    'Not a Git repo': 3,
+    'Error': 4
+}
+GIT_STATE_NAMES = {code: name for name, code in GIT_STATE_CODES.items()}
+
+# 同一狀態持續時，至少每隔這麼久寫入一筆心跳列
+HEARTBEAT_SECONDS = 24 * 3600
+# 超過此天數的歷史每個專案每天只保留最後一筆
+DOWNSAMPLE_AFTER_DAYS = 30
+# 超過此天數的歷史直接刪除
+RETENTION_DAYS = 365
+
+_CHANGED_PATTERN = re.compile(r'^(\d+) file')
+
+
+def encode_git_state(status: Optional[str]) -> int:
+    """Git 狀態文字 → 代碼（未知狀態視為 Unknown）"""
+    return GIT_STATE_CODES.get(status or 'Unknown', 0)
+
+
+def decode_git_state(code: int) -> str:
+    """代碼 → Git 狀態文字"""
+    return GIT_STATE_NAMES.get(code, 'Unknown')
+
+
+def modified_count(detail: Optional[str]) -> int:
+    """由 'N file(s) changed' 取出變更檔案數"""
+    if not detail:
+        return 0
+    match = _CHANGED_PATTERN.match(detail)
+    return int(match.group(1)) if match else 0
+
+
+def encode_language_mix(languages: Dict[str, int]) -> str:
+    """語言組成的標準化字串（排序後的緊湊 JSON），作為 language_mixes 字典表的鍵"""
+    return json.dumps(dict(sorted(languages.items())), separators=(',', ':'), ensure_ascii=False)
+
+
+def decode_language_mix(mix: Optional[str]) -> Dict[str, int]:
+    return json.loads(mix) if mix else {}
+
+
+def history_key(record) -> Tuple[int, int, Dict[str, int]]:
+    """
+    ProjectRecord → (Git 狀態代碼, 變更檔案數, 語言組成)
+
+    Args:
+        record: ProjectRecord
+    """
+    return (
+        encode_git_state(record.git_status),
+        modified_count(record.git_detail),
+        record.language_map
+    )
@@ -0,0 +1,267 @@
+"""
+Project Dashboard v2 - Scan Daemon IPC
+掃描常駐程式的本機 Unix socket API（每行一個 JSON 請求／回應）與精簡用戶端
+"""
+import dataclasses
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .serialization import dumps, loads
+from .snapshot import ProjectRecord, WorkspaceSnapshot
+
+# 平台不支援 Unix socket 時（例如 Windows 上的 CPython）常駐程式模式停用
+IPC_SUPPORTED = hasattr(socket, 'AF_UNIX')
+
+# 單一回應的大小上限（防止異常資料耗盡記憶體）
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+_RECORD_FIELDS = tuple(field.name for field in dataclasses.fields(ProjectRecord))
+
+
+class IPCError(Exception):
+    """常駐程式無法連線或回傳錯誤"""
+
+
+# ===== 快照編碼 =====
+
+def encode_snapshot(snapshot: WorkspaceSnapshot, scan_path: Optional[str] = None) -> Dict:
+    """
+    快照 → 可序列化的字典（記錄以欄位順序的陣列保存）
+
+    Args:
+        snapshot: 工作區快照
+        scan_path: 快照所屬的掃描根目錄（用戶端據此確認與本機設定相同）
+    """
+    return {
+        'scan_path': scan_path,
+        'created_at': snapshot.created_at,
+        'fields': _RECORD_FIELDS,
+        'records': [dataclasses.astuple(record) for record in snapshot]
+    }
+
+
+def decode_snapshot(data: Dict) -> WorkspaceSnapshot:
+    """encode_snapshot 的反向操作"""
+    records = []
+    for values in data['records']:
+        row = dict(zip(data['fields'], values))
+        row['languages'] = tuple(tuple(pair) for pair in row.get('languages') or ())
+        records.append(ProjectRecord(**{k: v for k, v in row.items() if k in _RECORD_FIELDS}))
+    return WorkspaceSnapshot(records, created_at=data['created_at'])
+
+
+# ===== 傳輸 =====
+
+def _read_line(sock: socket.socket) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        newline = chunk.find(b'\n')
+        if newline >= 0:
+            chunks.append(chunk[:newline])
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > MAX_MESSAGE_SIZE:
+            raise IPCError("訊息超過大小上限")
+    return b''.join(chunks)
+
+
+def call(socket_path: str, method: str, params: Optional[Dict] = None,
+         timeout: float = 30) -> Any:
+    """
+    呼叫常駐程式的方法
+
+    Raises:
+        IPCError: 無法連線、逾時或常駐程式回傳錯誤
+    """
+    if not IPC_SUPPORTED:
+        raise IPCError("此平台不支援 Unix socket")
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(dumps({'method': method, 'params': params or {}}) + b'\n')
+            response = loads(_read_line(sock))
+    except (OSError, ValueError) as e:
+        raise IPCError(f"無法與掃描常駐程式通訊: {e}") from e
+
+    if 'error' in response:
+        raise IPCError(response['error'])
+    return response.get('result')
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_MESSAGE_SIZE)
+        if not line:
+            return
+        try:
+            request = loads(line)
+            handler = self.server.methods.get(request.get('method'))
+            if handler is None:
+                response = {'error': f"未知的方法: {request.get('method')}"}
+            else:
+                response = {'result': handler(**request.get('params', {}))}
+        except Exception as e:
+            response = {'error': str(e)}
+        self.wfile.write(dumps(response) + b'\n')
+
+
+if IPC_SUPPORTED:
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def serve(socket_path: str, methods: Dict[str, Callable[..., Any]]):
+    """
+    在 socket_path 上提供方法，直到收到 KeyboardInterrupt 或 SIGTERM
+
+    既有的 socket 檔若仍有常駐程式回應則拒絕啟動；否則視為殘留檔案並移除。
+    socket 檔權限設為 0600，只有同一使用者可以連線。
+    """
+    if not IPC_SUPPORTED:
+        raise IPCError("此平台不支援 Unix socket")
+
+    if os.path.exists(socket_path):
+        try:
+            call(socket_path, 'ping', timeout=1)
+        except IPCError:
+            os.unlink(socket_path)
+        else:
+            raise IPCError(f"已有掃描常駐程式使用 {socket_path}")
+
+    server = _Server(socket_path, _Handler)
+    server.methods = methods
+    os.chmod(socket_path, 0o600)
+
+    # SIGTERM 時正常關閉並移除 socket 檔（shutdown 必須在其他執行緒呼叫）
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(
+            signal.SIGTERM,
+            lambda signum, frame: threading.Thread(target=server.shutdown).start()
+        )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+# ===== 精簡用戶端 =====
+
+class RemoteWorkspace:
+    """
+    常駐程式的 Workspace 代理
+
+    介面與 core.workspace.Workspace 相同；常駐程式未執行時改用本機 Workspace，
+    並在 RETRY_INTERVAL 秒內不再嘗試連線。
+
+    常駐程式與本機以相同規則解析 SCAN_DIR（見 core/config.py），但仍可能讀取不同的 .env
+    而掃描不同的根目錄：連線時先以 ping
+    確認常駐程式的掃描路徑與本機 Workspace 相同，每份快照也帶有掃描路徑並再次比對，
+    不同時拒絕使用該常駐程式並改用本機 Workspace。
+    """
+
+    RETRY_INTERVAL = 30
+
+    def __init__(self, socket_path: str, fallback, timeout: float = 120):
+        """
+        Args:
+            socket_path: 常駐程式的 socket 路徑
+            fallback: 無法連線時使用的本機 Workspace
+            timeout: 單次呼叫逾時秒數（完整掃描可能較久）
+        """
+        self.socket_path = socket_path
+        self.fallback = fallback
+        self.timeout = timeout
+        self.scan_path = str(fallback.project_manager.scan_path)
+        self._down_until = 0.0
+        self._verified = False
+        self._lock = threading.Lock()
+        self._snapshot: Optional[WorkspaceSnapshot] = None
+
+    @property
+    def connected(self) -> bool:
+        """目前是否使用常駐程式（不主動連線）"""
+        return IPC_SUPPORTED and time.monotonic() >= self._down_until \
+            and os.path.exists(self.socket_path)
+
+    def _call(self, method: str, **params) -> Any:
+        if not self.connected:
+            raise IPCError("掃描常駐程式未執行")
+        try:
+            if not self._verified:
+                self._check_scan_path(call(self.socket_path, 'ping', timeout=self.timeout))
+                self._verified = True
+            return call(self.socket_path, method, params, timeout=self.timeout)
+        except IPCError:
+            # 常駐程式可能以不同設定重新啟動，下次連線時重新確認
+            self._verified = False
+            self._down_until = time.monotonic() + self.RETRY_INTERVAL
+            raise
+
+    def _check_scan_path(self, result: Dict):
+        """
+        確認常駐程式掃描的根目錄與本機相同
+
+        Raises:
+            IPCError: 掃描路徑不同（或常駐程式未回報掃描路徑）
+        """
+        scan_path = result.get('scan_path') if isinstance(result, dict) else None
+        if scan_path != self.scan_path:
+            if self.connected:
+                print(f"掃描常駐程式的掃描路徑 ({scan_path}) 與本機設定 ({self.scan_path}) 不同，"
+                      f"改用本機掃描")
+            raise IPCError(f"掃描常駐程式的掃描路徑不同: {scan_path}")
+
+    def snapshot(self, refresh: bool = False, budget: Optional[float] = None) -> WorkspaceSnapshot:
+        current = self._snapshot
+        since = current.created_at if current is not None else None
+        try:
+            result = self._call('snapshot', refresh=refresh, since=since, budget=budget)
+            self._check_scan_path(result)
+        except IPCError:
+            self._verified = False
+            self._down_until = time.monotonic() + self.RETRY_INTERVAL
+            return self.fallback.snapshot(refresh=refresh, budget=budget)
+
+        # 常駐程式的快照未變時只回傳 unchanged，沿用既有物件
+        if result.get('unchanged') and current is not None:
+            return current
+
+        snapshot = decode_snapshot(result)
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        self.fallback.invalidate()
+        try:
+            self._call('invalidate')
+        except IPCError:
+            pass
+
+    def status(self) -> Dict:
+        try:
+            status = self._call('status')
+            status['daemon'] = self.socket_path
+            return status
+        except IPCError:
+            status = self.fallback.status()
+            status['daemon'] = None
+            return status
@@ -0,0 +1,78 @@
+"""
+Project Dashboard v2 - Schema Migrations
+以 PRAGMA user_version 記錄資料庫結構版本，依序在各自的交易中套用尚未執行的遷移
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Sequence
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    單一結構遷移
+
+    Attributes:
+        version: 套用後的結構版本（由 1 開始連續編號）
+        description: 說明
+        apply: 接收 cursor 執行變更；不可自行 commit，也不可使用 executescript（會隱含提交）
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """資料庫目前的結構版本（新資料庫為 0）"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def validate(migrations: Sequence[Migration]):
+    """確認遷移由 1 開始連續編號"""
+    for expected, migration in enumerate(migrations, start=1):
+        if migration.version != expected:
+            raise ValueError(
+                f"遷移版本不連續: 預期 {expected}，實際 {migration.version}（{migration.description}）"
+            )
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> List[int]:
+    """
+    套用尚未執行的遷移
+
+    每個遷移與 user_version 的更新在同一個 BEGIN IMMEDIATE 交易中完成：失敗時整個遷移
+    回滾，資料庫停在上一個版本。BEGIN IMMEDIATE 取得寫入鎖後重新讀取版本，多個行程
+    同時啟動時每個遷移只會套用一次。資料庫版本比程式新（較新版本寫入）時不做任何變更。
+
+    Args:
+        conn: 資料庫連線（不可有進行中的交易）
+        migrations: 依版本排序的遷移
+
+    Returns:
+        這次套用的版本
+    """
+    validate(migrations)
+    target = len(migrations)
+    if current_version(conn) >= target:
+        return []
+
+    if conn.in_transaction:
+        conn.commit()
+
+    applied = []
+    for migration in migrations:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            cursor = conn.cursor()
+            migration.apply(cursor)
+            # user_version 寫在資料庫標頭，與遷移內容一起提交或回滾
+            cursor.execute(f"PRAGMA user_version = {migration.version:d}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
@@ -0,0 +1,255 @@
+"""
+Project Dashboard v2 - Subprocess Governor
+行程內共用的子程序閘門：限制同時執行的子程序數、互動與背景工作公平排隊、
+背景子程序降低 CPU／I/O 優先權，並記錄排隊深度與啟動延遲
+"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+# 工作類別：使用者正在等待的操作（單一專案詳細資訊、開啟編輯器）與背景掃描
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+# 延遲統計保留的最近樣本數
+LATENCY_SAMPLES = 256
+
+
+class _Latency:
+    """最近樣本的延遲統計（毫秒）"""
+
+    __slots__ = ('samples', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.samples: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        self.samples.append(ms)
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count, 2) if self.count else None,
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2)
+            if ordered else None,
+            'max_ms': round(self.max, 2)
+        }
+
+
+class ProcessGovernor:
+    """
+    子程序併發上限與公平排隊
+
+    同時最多執行 max_concurrency 個子程序，其中保留一個名額給互動工作，背景掃描
+    再多也不會讓使用者的操作等不到名額。兩類工作都在等待時，互動工作優先，但每連續
+    fairness 次互動後讓一個背景工作前進，避免背景掃描餓死。同類工作依到達順序執行。
+    """
+
+    def __init__(self, max_concurrency: int = 8, background_nice: int = 10,
+                 background_ionice: bool = True, fairness: int = 4):
+        """
+        Args:
+            max_concurrency: 同時執行的子程序上限
+            background_nice: 背景子程序的 nice 值，0 代表不調整
+            background_ionice: 背景子程序是否使用 idle I/O 類別（需要 ionice）
+            fairness: 背景工作等待時，最多連續放行幾個互動工作
+        """
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, Deque[object]] = {p: deque() for p in PRIORITIES}
+        self._running = {p: 0 for p in PRIORITIES}
+        self._interactive_streak = 0
+
+        self.spawned = {p: 0 for p in PRIORITIES}
+        self.timeouts = 0
+        self.errors = 0
+        self.max_queue_depth = {p: 0 for p in PRIORITIES}
+        self._wait_latency = {p: _Latency() for p in PRIORITIES}
+        self._spawn_latency = _Latency()
+
+        self.configure(max_concurrency, background_nice, background_ionice, fairness)
+
+    def configure(self, max_concurrency: Optional[int] = None,
+                  background_nice: Optional[int] = None,
+                  background_ionice: Optional[bool] = None,
+                  fairness: Optional[int] = None):
+        """調整設定（未提供的參數維持原值），已在等待的工作依新設定排隊"""
+        with self._cond:
+            if max_concurrency is not None:
+                self.max_concurrency = max(1, int(max_concurrency))
+            if background_nice is not None:
+                self.background_nice = int(background_nice)
+            if background_ionice is not None:
+                self.background_ionice = bool(background_ionice)
+            if fairness is not None:
+                self.fairness = max(1, int(fairness))
+            self._background_prefix = self._build_background_prefix()
+            self._cond.notify_all()
+
+    def _build_background_prefix(self) -> List[str]:
+        """背景子程序的指令前綴（nice／ionice 不存在時略過）"""
+        if os.name != 'posix':
+            return []
+        prefix = []
+        if self.background_nice and shutil.which('nice'):
+            prefix += ['nice', '-n', str(self.background_nice)]
+        if self.background_ionice and shutil.which('ionice'):
+            prefix += ['ionice', '-c', '3']
+        return prefix
+
+    @property
+    def _reserved_interactive(self) -> int:
+        return 1 if self.max_concurrency > 1 else 0
+
+    def _next_priority(self) -> Optional[str]:
+        """下一個取得名額的工作類別，沒有可放行的工作時回傳 None"""
+        interactive = self._waiting[INTERACTIVE]
+        background = self._waiting[BACKGROUND] and (
+            self._running[BACKGROUND] < self.max_concurrency - self._reserved_interactive
+        )
+        if interactive and (not background or self._interactive_streak < self.fairness):
+            return INTERACTIVE
+        if background:
+            return BACKGROUND
+        return None
+
+    def _acquire(self, priority: str, timeout: Optional[float]) -> float:
+        """排隊取得名額，回傳等待秒數；逾時拋出 TimeoutError"""
+        ticket = object()
+        started = time.monotonic()
+        expires_at = started + timeout if timeout is not None else None
+
+        with self._cond:
+            queue = self._waiting[priority]
+            queue.append(ticket)
+            self.max_queue_depth[priority] = max(self.max_queue_depth[priority], len(queue))
+
+            while not (
+                sum(self._running.values()) < self.max_concurrency
+                and self._next_priority() == priority
+                and queue[0] is ticket
+            ):
+                remaining = expires_at - time.monotonic() if expires_at is not None else None
+                if remaining is not None and remaining <= 0:
+                    queue.remove(ticket)
+                    self._cond.notify_all()
+                    raise TimeoutError("等待子程序名額逾時")
+                self._cond.wait(remaining)
+
+            queue.popleft()
+            self._running[priority] += 1
+            if priority == INTERACTIVE and self._waiting[BACKGROUND]:
+                self._interactive_streak += 1
+            else:
+                self._interactive_streak = 0
+            # 同一次釋放可能讓下一個等待者也能前進
+            self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            self._wait_latency[priority].add(waited)
+        return waited
+
+    def _count(self, counter: str):
+        with self._cond:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _release(self, priority: str):
+        with self._cond:
+            self._running[priority] -= 1
+            self._cond.notify_all()
+
+    def run(self, args: Sequence[str], priority: str = INTERACTIVE,
+            timeout: Optional[float] = None, capture_output: bool = False,
+            queue_timeout: Optional[float] = None,
+            **popen_kwargs) -> subprocess.CompletedProcess:
+        """
+        與 subprocess.run 相同的介面，但先排隊取得名額
+
+        Args:
+            args: 指令
+            priority: INTERACTIVE 或 BACKGROUND（背景工作套用 nice／ionice）
+            timeout: 子程序執行逾時秒數（不含排隊時間）
+            capture_output: 擷取 stdout 與 stderr
+            queue_timeout: 排隊逾時秒數，None 代表無限等待
+            **popen_kwargs: 傳給 subprocess.Popen 的其他參數（cwd、text、shell 等）
+
+        Raises:
+            subprocess.TimeoutExpired: 排隊或執行逾時
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"不支援的工作類別: {priority}")
+        if capture_output:
+            popen_kwargs['stdout'] = subprocess.PIPE
+            popen_kwargs['stderr'] = subprocess.PIPE
+
+        command = list(args)
+        if priority == BACKGROUND and not popen_kwargs.get('shell'):
+            command = self._background_prefix + command
+
+        try:
+            self._acquire(priority, queue_timeout)
+        except TimeoutError:
+            self._count('timeouts')
+            raise subprocess.TimeoutExpired(args, queue_timeout)
+
+        try:
+            started = time.monotonic()
+            try:
+                process = subprocess.Popen(command, **popen_kwargs)
+            except OSError:
+                self._count('errors')
+                raise
+            with self._cond:
+                self._spawn_latency.add(time.monotonic() - started)
+                self.spawned[priority] += 1
+
+            with process:
+                try:
+                    stdout, stderr = process.communicate(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    self._count('timeouts')
+                    process.kill()
+                    process.communicate()
+                    raise
+                except BaseException:
+                    process.kill()
+                    raise
+            return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        finally:
+            self._release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """排隊深度、執行數與延遲統計"""
+        with self._cond:
+            queued = {p: len(q) for p, q in self._waiting.items()}
+            running = dict(self._running)
+            queue_wait = {p: latency.to_dict() for p, latency in self._wait_latency.items()}
+            spawn_latency = self._spawn_latency.to_dict()
+        return {
+            'max_concurrency': self.max_concurrency,
+            'running': running,
+            'queued': queued,
+            'max_queue_depth': dict(self.max_queue_depth),
+            'spawned': dict(self.spawned),
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'queue_wait': queue_wait,
+            'spawn_latency': spawn_latency,
+            'background_prefix': list(self._background_prefix)
+        }
+
+
+# 行程內共用的閘門；app.py 與 mcp_server.py 依設定呼叫 governor.configure()
+governor = ProcessGovernor()
@@ -2,11 +2,28 @@
 Project Dashboard v2 - Core Project Manager
 統一的專案管理核心邏輯，供 Flask 和 MCP Server 共用
 """
+import copy
+import dataclasses
 import os
 import subprocess
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .dependencies import LOCK_FILES, find_manifests, parse_manifest
+from .git_index import Undecidable, read_git_metadata, read_git_status
+from .git_metadata import (
+    NOT_A_REPO, TIMEOUT_DETAIL, GitMetadata, collect_git_metadata
+)
+from .health import IOHealth, IOUnavailable, Progress
+from .procgov import BACKGROUND, INTERACTIVE, governor
+from .readme import ReadmeCache, ReadmeMetadata
+from .singleflight import SingleFlight
+from .snapshot import ProjectRecord, WorkspaceSnapshot
+
+T = TypeVar('T')
 
 
 class ProjectManager:
@@ -49,14 +66,61 @@ class ProjectManager:
         'vendor', 'bin', 'obj', '.idea', '.vscode'
     }
     
-    def __init__(self, scan_path: str):
+    # 依賴生態系 → get_project_info 中的鍵名
+    ECOSYSTEM_KEYS = {
+        'pypi': 'python',
+        'npm': 'node',
+        'cargo': 'rust',
+        'go': 'go',
+        'composer': 'php'
+    }
+    
+    # Git 指令逾時秒數
+    GIT_TIMEOUT = 5
+    
+    # 平行收集 Git 中繼資料的執行緒數
+    GIT_WORKERS = 8
+    
+    # Git 狀態後端：'subprocess' 或 'index'（行程內解析 .git/index，無法判斷時退回子程序）
+    GIT_BACKENDS = ('subprocess', 'index')
+    
+    # 等待進行中的相同掃描的預設逾時秒數
+    FLIGHT_TIMEOUT = 120
+    
+    # 單一專案檔案系統操作（README、檔案樹走訪）的逾時秒數
+    IO_TIMEOUT = 10
+    
+    def __init__(self, scan_path: str, git_workers: Optional[int] = None,
+                 git_backend: str = 'subprocess',
+                 flight_timeout: Optional[float] = FLIGHT_TIMEOUT,
+                 io_timeout: float = IO_TIMEOUT,
+                 one_filesystem: bool = False):
         """
         初始化專案管理器
         
         Args:
             scan_path: 要掃描的根目錄路徑
+            git_workers: 平行收集 Git 資訊的執行緒數（預設 GIT_WORKERS）
+            git_backend: Git 狀態後端（'subprocess' 或 'index'）
+            flight_timeout: 等待其他執行緒進行中的相同掃描的逾時秒數
+            io_timeout: 單一專案檔案系統操作的逾時秒數（0 = 不限時）
+            one_filesystem: 不跨越檔案系統邊界（略過掛載於掃描目錄內的其他檔案系統）
         """
         self.scan_path = Path(scan_path).resolve()
+        self.git_workers = git_workers or self.GIT_WORKERS
+        if git_backend not in self.GIT_BACKENDS:
+            raise ValueError(f"不支援的 Git 後端: {git_backend}")
+        self.git_backend = git_backend
+        self._git_backend_counts = Counter()
+        self._git_backend_lock = threading.Lock()
+        self.readme_cache = ReadmeCache()
+        # 同時發生的相同掃描只執行一次，其餘呼叫者共用結果
+        self.flight = SingleFlight(timeout=flight_timeout)
+        # 依專案與掛載點追蹤 I/O 延遲，停滯的掛載點由斷路器隔離
+        self.health = IOHealth(timeout=io_timeout)
+        self.one_filesystem = one_filesystem
+        self._known_projects = set()
+        self._without_readme: List[str] = []
         if not self.scan_path.exists():
             raise ValueError(f"掃描路徑不存在: {scan_path}")
     
@@ -93,24 +157,173 @@ class ProjectManager:
         Returns:
             專案列表，每個專案包含基本資訊
         """
-        projects = []
+        projects = [
+            {
+                'name': entry.name,
+                'path': str(entry),
+                'description': self._get_project_description(entry)
+            }
+            for entry in self._iter_project_dirs()
+        ]
+        
+        return sorted(projects, key=lambda x: x['name'].lower())
+    
+    def build_snapshot(self, include_git: bool = True,
+                       include_languages: bool = True,
+                       on_record: Optional[Callable[[ProjectRecord], None]] = None) -> WorkspaceSnapshot:
+        """
+        掃描工作區並建立快照（每個專案只讀取一次 README 與檔案樹）
+        
+        每個專案的 Git 收集與語言分析在同一個工作執行緒中完成，完成一筆即回報一筆，
+        呼叫端可在掃描途中取得已完成的記錄。
+        
+        Args:
+            include_git: 是否收集 Git 狀態（不需要時可省去子程序開銷）
+            include_languages: 是否分析語言佔比（不需要時可省去檔案樹走訪）
+            on_record: 每完成一個專案時呼叫（加入其他執行緒進行中的掃描時不會呼叫）
+            
+        Returns:
+            以名稱、語言與 Git 狀態索引的工作區快照
+        """
+        return self.flight.do(
+            ('snapshot', include_git, include_languages),
+            lambda: self._build_snapshot(include_git, include_languages, on_record)
+        )
+    
+    def _build_snapshot(self, include_git: bool, include_languages: bool,
+                        on_record: Optional[Callable[[ProjectRecord], None]]) -> WorkspaceSnapshot:
+        entries = list(self._iter_project_dirs())
+        if not entries:
+            return WorkspaceSnapshot([])
+        
+        def build(entry: Path) -> ProjectRecord:
+            # 逾時只計算走訪中停滯的時間：大型但正常的專案不會被當成停滯的掛載點
+            progress = Progress()
+            try:
+                record = self.health.call(
+                    entry.name, entry,
+                    lambda: self._build_record(entry, None, include_languages, progress),
+                    progress=progress
+                )
+            except IOUnavailable:
+                # 由 Workspace 以快取的值代替
+                record = ProjectRecord(
+                    name=entry.name, path=str(entry), description='', degraded=True
+                )
+            else:
+                if include_git:
+                    git = self._collect_git_metadata(entry, BACKGROUND)
+                    if git.detail == TIMEOUT_DETAIL:
+                        self.health.record_failure(entry.name, entry, 'git timeout')
+                    record = self._with_git(record, git)
+            if on_record is not None:
+                on_record(record)
+            return record
+        
+        with ThreadPoolExecutor(max_workers=min(self.git_workers, len(entries))) as executor:
+            return WorkspaceSnapshot(list(executor.map(build, entries)))
+    
+    def _iter_project_dirs(self) -> List[Path]:
+        """
+        包含 README.md 的專案資料夾
         
+        位於其他掛載點的資料夾在逾時內檢查；掛載點停滯或斷路器開啟時，
+        沿用上次掃描的判斷（上次是專案就仍列出，由快取提供資料）。
+        同一次列舉順便記錄缺少 README.md 的資料夾（見 last_without_readme）。
+        """
         try:
-            for entry in self.scan_path.iterdir():
-                if not entry.is_dir():
-                    continue
-                
-                readme_path = entry / 'README.md'
-                if readme_path.exists():
-                    projects.append({
-                        'name': entry.name,
-                        'path': str(entry),
-                        'description': self._get_project_description(entry)
-                    })
+            entries = self.health.call('.', self.scan_path, lambda: list(self.scan_path.iterdir()))
+        except IOUnavailable as e:
+            print(f"掃描專案時發生錯誤: {e}")
+            return [self.scan_path / name for name in sorted(self._known_projects)]
         except Exception as e:
             print(f"掃描專案時發生錯誤: {e}")
+            return []
         
-        return sorted(projects, key=lambda x: x['name'].lower())
+        root_mount = self.health.mount_of(self.scan_path)
+        projects = []
+        without_readme = []
+        for entry in entries:
+            try:
+                if self.health.mount_of(entry) == root_mount:
+                    # 與掃描根目錄同一檔案系統，剛才的列舉已確認可在時限內存取
+                    kind = self._classify_dir(entry)
+                elif self.one_filesystem:
+                    continue
+                else:
+                    kind = self.health.call(
+                        entry.name, entry, lambda: self._classify_dir(entry)
+                    )
+            except IOUnavailable:
+                kind = True if entry.name in self._known_projects else None
+            except OSError:
+                continue
+            if kind:
+                projects.append(entry)
+            elif kind is False and entry.name not in self.IGNORE_DIRS:
+                # 排除常見的非專案資料夾
+                without_readme.append(entry.name)
+        
+        self._known_projects = {entry.name for entry in projects}
+        self._without_readme = sorted(without_readme)
+        return projects
+    
+    @staticmethod
+    def _classify_dir(entry: Path) -> Optional[bool]:
+        """True：專案資料夾；False：缺少 README.md 的資料夾；None：不是資料夾"""
+        if not entry.is_dir():
+            return None
+        return (entry / 'README.md').exists()
+    
+    @property
+    def last_without_readme(self) -> List[str]:
+        """最近一次列舉專案時找到的缺少 README.md 的資料夾（不存取檔案系統）"""
+        return list(self._without_readme)
+    
+    def list_project_paths(self) -> List[Tuple[str, Path]]:
+        """所有專案的 (名稱, 路徑)，不讀取任何專案內容"""
+        return [(entry.name, entry) for entry in self._iter_project_dirs()]
+    
+    def _build_record(self, project_path: Path, git: Optional[GitMetadata] = None,
+                      include_languages: bool = True,
+                      progress: Optional[Progress] = None) -> ProjectRecord:
+        """建立單一專案的不可變記錄（git 為 None 時不含 Git 資訊）"""
+        has_git = self._has_git(project_path)
+        
+        languages = ()
+        if include_languages:
+            languages = tuple(self.analyze_languages(project_path, progress).items())
+        
+        return ProjectRecord(
+            name=project_path.name,
+            path=str(project_path),
+            description=self._get_project_description(project_path),
+            languages=languages,
+            has_git=has_git,
+            git_status=git.status if git else None,
+            git_detail=git.detail if git else None,
+            branch=git.branch if git else None,
+            upstream=git.upstream if git else None,
+            ahead=git.ahead if git else None,
+            behind=git.behind if git else None,
+            last_commit_at=git.last_commit_at if git else None,
+            last_commit_author=git.last_commit_author if git else None
+        )
+    
+    @staticmethod
+    def _with_git(record: ProjectRecord, git: GitMetadata) -> ProjectRecord:
+        """在既有記錄加上 Git 中繼資料"""
+        return dataclasses.replace(
+            record,
+            git_status=git.status,
+            git_detail=git.detail,
+            branch=git.branch,
+            upstream=git.upstream,
+            ahead=git.ahead,
+            behind=git.behind,
+            last_commit_at=git.last_commit_at,
+            last_commit_author=git.last_commit_author
+        )
     
     def get_project_info(self, project_name: str) -> Dict:
         """
@@ -121,25 +334,49 @@ class ProjectManager:
             
         Returns:
             包含語言分析、Git 狀態等資訊的字典
+            
+        Raises:
+            ValueError: 路徑不安全或不存在
+            IOUnavailable: 專案所在的檔案系統逾時或暫停存取中
         """
-        project_path = self.validate_project_path(project_name)
-        
-        return {
+        project_path = self.health.call(
+            project_name, self.scan_path / project_name,
+            lambda: self.validate_project_path(project_name)
+        )
+        # 呼叫端會在結果上加入標籤等欄位，共用結果時交給每個等待者各自的副本
+        return self.flight.do(
+            ('project_info', project_path),
+            lambda: self._collect_project_info(project_name, project_path),
+            clone=copy.deepcopy
+        )
+    
+    def _collect_project_info(self, project_name: str, project_path: Path) -> Dict:
+        progress = Progress()
+        info = self.health.call(project_name, project_path, lambda: {
             'name': project_name,
             'path': str(project_path),
             'description': self._get_project_description(project_path),
-            'languages': self.analyze_languages(project_path),
-            'git_status': self.get_git_status(project_path),
+            'languages': self.analyze_languages(project_path, progress),
+            'readme': self.get_readme_metadata(project_path).to_dict(),
             'has_git': self._has_git(project_path),
             'dependencies': self._get_dependencies(project_path)
-        }
+        }, progress=progress)
+        
+        git = self.get_git_metadata(project_path)
+        if git.detail == TIMEOUT_DETAIL:
+            self.health.record_failure(project_name, project_path, 'git timeout')
+        info['git_status'] = (git.status, git.detail)
+        info['git'] = git.to_dict()
+        return info
     
-    def analyze_languages(self, project_path: Path) -> Dict[str, int]:
+    def analyze_languages(self, project_path: Path,
+                          progress: Optional[Progress] = None) -> Dict[str, int]:
         """
         分析專案中各種程式語言的檔案佔比
         
         Args:
             project_path: 專案路徑
+            progress: 每列出一個目錄回報一次進度（見 IOHealth.call）
             
         Returns:
             語言佔比字典 {'Python': 45, 'JavaScript': 30, ...}
@@ -148,8 +385,12 @@ class ProjectManager:
         
         try:
             for root, dirs, files in os.walk(project_path):
+                if progress is not None:
+                    progress.tick()
                 # 過濾忽略目錄
                 dirs[:] = [d for d in dirs if d not in self.IGNORE_DIRS and not d.startswith('.')]
+                if self.one_filesystem:
+                    dirs[:] = [d for d in dirs if not self.health.is_mount_point(os.path.join(root, d))]
                 
                 for file in files:
                     ext = Path(file).suffix.lower()
@@ -171,12 +412,13 @@ class ProjectManager:
         
         return language_percentages
     
-    def get_git_status(self, project_path: Path) -> Tuple[str, str]:
+    def get_git_status(self, project_path: Path, priority: str = INTERACTIVE) -> Tuple[str, str]:
         """
         獲取專案的 Git 狀態
         
         Args:
             project_path: 專案路徑
+            priority: 子程序閘門的工作類別（批次掃描使用 BACKGROUND）
             
         Returns:
             (狀態, 詳細訊息) 元組
@@ -185,14 +427,20 @@ class ProjectManager:
         if not self._has_git(project_path):
             return ('Not a Git repo', 'This project is not a Git repository')
         
+        if self.git_backend == 'index':
+            status = self._read_git_index(read_git_status, project_path)
+            if status is not None:
+                return status
+        
         try:
             # 檢查工作目錄狀態
-            status_result = subprocess.run(
+            status_result = governor.run(
                 ['git', 'status', '--porcelain'],
+                priority=priority,
                 cwd=project_path,
                 capture_output=True,
                 text=True,
-                timeout=5
+                timeout=self.GIT_TIMEOUT
             )
             
             if status_result.returncode != 0:
@@ -210,6 +458,87 @@ class ProjectManager:
         except Exception as e:
             return ('Error', f'Git error: {str(e)}')
     
+    def _read_git_index(self, reader: Callable[[Path], T], project_path: Path) -> Optional[T]:
+        """
+        以行程內的索引讀取器取得 Git 資訊
+        
+        無法判斷（Undecidable）或讀取失敗（OSError）時回傳 None，由呼叫端退回 git 子程序；
+        其他例外代表讀取器本身的問題（索引損毀、解析錯誤），記錄並計數後同樣退回。
+        """
+        try:
+            result = reader(project_path)
+        except (Undecidable, OSError):
+            self._count_git_backend('fallback')
+            return None
+        except Exception as e:
+            self._count_git_backend('errors')
+            print(f"解析 Git 索引時發生錯誤 ({project_path.name}): {e!r}")
+            return None
+        self._count_git_backend('index')
+        return result
+    
+    def _count_git_backend(self, outcome: str):
+        with self._git_backend_lock:
+            self._git_backend_counts[outcome] += 1
+    
+    def git_backend_stats(self) -> Dict:
+        """Git 狀態後端的使用統計（index 後端：行程內完成、退回子程序、讀取器錯誤的次數）"""
+        with self._git_backend_lock:
+            return {
+                'backend': self.git_backend,
+                'index': self._git_backend_counts['index'],
+                'fallback': self._git_backend_counts['fallback'],
+                'errors': self._git_backend_counts['errors']
+            }
+    
+    def get_git_metadata(self, project_path: Path) -> GitMetadata:
+        """
+        獲取專案的 Git 中繼資料（狀態、分支、領先/落後、最後提交）
+        
+        Args:
+            project_path: 專案路徑
+            
+        Returns:
+            GitMetadata
+        """
+        return self._collect_git_metadata(project_path)
+    
+    def _collect_git_metadata(self, project_path: Path, priority: str = INTERACTIVE) -> GitMetadata:
+        """依 git_backend 收集 Git 中繼資料（index 後端無法判斷時退回 git 子程序）"""
+        if not self._has_git(project_path):
+            return NOT_A_REPO
+        if self.git_backend == 'index':
+            metadata = self._read_git_index(read_git_metadata, project_path)
+            if metadata is not None:
+                return metadata
+        return collect_git_metadata(project_path, self.GIT_TIMEOUT, priority)
+    
+    def batch_git_metadata(self, project_paths: List[Path]) -> Dict[str, GitMetadata]:
+        """
+        平行收集多個專案的 Git 中繼資料
+        
+        與掃描相同：依 git_backend 收集、以背景優先序執行子程序，git 逾時回報給 IOHealth。
+        
+        Args:
+            project_paths: 專案路徑列表
+            
+        Returns:
+            {專案路徑字串: GitMetadata}
+        """
+        paths = list(project_paths)
+        if not paths:
+            return {}
+        
+        def collect(path: Path) -> GitMetadata:
+            metadata = self._collect_git_metadata(path, BACKGROUND)
+            if metadata.detail == TIMEOUT_DETAIL:
+                self.health.record_failure(path.name, path, 'git timeout')
+            return metadata
+        
+        with ThreadPoolExecutor(max_workers=min(self.git_workers, len(paths))) as executor:
+            results = executor.map(collect, paths)
+            return {str(path): metadata for path, metadata in zip(paths, results)}
+    
     def get_directory_tree(self, project_name: str, depth: int = 2) -> Dict:
         """
         獲取專案的目錄樹結構
@@ -222,7 +551,9 @@ class ProjectManager:
             樹狀結構字典
         """
         project_path = self.validate_project_path(project_name)
-        return self._build_tree(project_path, depth)
+        return self.health.call(
+            project_name, project_path, lambda: self._build_tree(project_path, depth)
+        )
     
     def _build_tree(self, path: Path, depth: int) -> Optional[Dict]:
         """遞迴建立目錄樹"""
@@ -265,24 +596,27 @@ class ProjectManager:
         
         return tree
     
-    def _get_project_description(self, project_path: Path) -> str:
-        """從 README.md 提取第一個標題作為描述"""
-        readme_path = project_path / 'README.md'
+    def get_readme_metadata(self, project_path: Path) -> ReadmeMetadata:
+        """
+        獲取 README.md 的中繼資料（標題、第一段落、徽章、章節）
         
-        if not readme_path.exists():
-            return "No description available"
+        檔案未變更時直接使用快取，不會重新讀取。
         
+        Args:
+            project_path: 專案路徑
+            
+        Returns:
+            ReadmeMetadata（README 不存在或無法讀取時為空白結果）
+        """
         try:
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    content = line.strip()
-                    if content.startswith('#'):
-                        # 移除 # 符號並截斷過長內容
-                        return content.lstrip('#').strip()[:100]
+            metadata = self.readme_cache.get(project_path / 'README.md')
         except Exception:
-            pass
-        
-        return "No description available"
+            metadata = None
+        return metadata or ReadmeMetadata()
+    
+    def _get_project_description(self, project_path: Path) -> str:
+        """從 README.md 提取第一個標題作為描述"""
+        return self.get_readme_metadata(project_path).title or "No description available"
     
     def _has_git(self, project_path: Path) -> bool:
         """檢查專案是否為 Git 倉庫"""
@@ -290,58 +624,46 @@ class ProjectManager:
     
     def _get_dependencies(self, project_path: Path) -> Dict[str, List[str]]:
         """
-        獲取專案依賴（從 requirements.txt、package.json 等）
+        獲取專案宣告的依賴（requirements*.txt、pyproject.toml、package.json、
+        Cargo.toml、go.mod 等，不含鎖定檔中的遞移依賴）
         
         Returns:
-            {'python': [...], 'node': [...], ...}
+            {'python': [...], 'node': [...], 'rust': [...], 'go': [...], 'php': [...]}
         """
         dependencies = {}
         
-        # Python dependencies
-        req_file = project_path / 'requirements.txt'
-        if req_file.exists():
-            try:
-                with open(req_file, 'r', encoding='utf-8') as f:
-                    deps = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-                    dependencies['python'] = deps[:10]  # 限制前 10 個
-            except Exception:
-                pass
-        
-        # Node.js dependencies
-        package_json = project_path / 'package.json'
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    deps = list(data.get('dependencies', {}).keys())
-                    dependencies['node'] = deps[:10]
-            except Exception:
-                pass
+        for manifest in sorted(find_manifests(project_path)):
+            if manifest in LOCK_FILES:
+                continue
+            for row in parse_manifest(project_path / manifest):
+                key = self.ECOSYSTEM_KEYS.get(row.ecosystem, row.ecosystem)
+                entry = row.package + (row.spec or '') if row.ecosystem == 'pypi' else row.package
+                deps = dependencies.setdefault(key, [])
+                if entry not in deps:
+                    deps.append(entry)
         
         return dependencies
     
-    def search_by_language(self, language: str) -> List[Dict]:
+    def search_by_language(self, language: str,
+                           snapshot: Optional[WorkspaceSnapshot] = None) -> List[Dict]:
         """
         搜尋使用特定語言的專案
         
         Args:
             language: 語言名稱（如 'Python', 'JavaScript'）
+            snapshot: 既有的工作區快照（省略時重新掃描，不含 Git 狀態）
             
         Returns:
             符合條件的專案列表
         """
-        matching_projects = []
+        if snapshot is None:
+            snapshot = self.build_snapshot(include_git=False)
         
-        for project in self.list_all_projects():
-            project_path = Path(project['path'])
-            languages = self.analyze_languages(project_path)
-            
-            if language in languages:
-                matching_projects.append({
-                    **project,
-                    'language_percentage': languages[language]
-                })
+        matching_projects = []
+        for record in snapshot.by_language(language):
+            project = record.summary()
+            project['language_percentage'] = record.language_percentage(language)
+            matching_projects.append(project)
         
         # 按語言佔比排序
         return sorted(
@@ -350,54 +672,61 @@ class ProjectManager:
             reverse=True
         )
     
-    def get_modified_projects(self) -> List[Dict]:
+    def get_modified_projects(self, snapshot: Optional[WorkspaceSnapshot] = None) -> List[Dict]:
         """
         獲取所有有 Git 變更的專案
         
+        Args:
+            snapshot: 既有的工作區快照（省略時重新掃描）
+            
         Returns:
             有變更的專案列表
         """
-        modified = []
+        if snapshot is None:
+            modified = []
+            for entry, (status, detail) in self._batch_status().items():
+                if status == 'Modified':
+                    modified.append({
+                        'name': entry.name,
+                        'path': str(entry),
+                        'description': self._get_project_description(entry),
+                        'git_detail': detail
+                    })
+            return sorted(modified, key=lambda x: x['name'].lower())
         
-        for project in self.list_all_projects():
-            project_path = Path(project['path'])
-            status, detail = self.get_git_status(project_path)
-            
-            if status == 'Modified':
-                modified.append({
-                    **project,
-                    'git_detail': detail
-                })
+        modified = []
+        for record in snapshot.by_git_status('Modified'):
+            project = record.summary()
+            project['git_detail'] = record.git_detail
+            modified.append(project)
         
         return modified
     
     def find_projects_without_readme(self) -> List[str]:
         """
-        找出缺少 README.md 的資料夾
+        找出缺少 README.md 的資料夾（重新列舉掃描目錄；斷路器開啟中的掛載點不再存取）
+        
+        只需要數量時改用掃描記錄的值（DatabaseManager.get_last_scan）或 last_without_readme。
         
         Returns:
             資料夾名稱列表
         """
-        folders_without_readme = []
-        
-        try:
-            for entry in self.scan_path.iterdir():
-                if entry.is_dir() and not (entry / 'README.md').exists():
-                    # 排除常見的非專案資料夾
-                    if entry.name not in self.IGNORE_DIRS:
-                        folders_without_readme.append(entry.name)
-        except Exception as e:
-            print(f"掃描資料夾時發生錯誤: {e}")
-        
-        return sorted(folders_without_readme)
+        self._iter_project_dirs()
+        return self.last_without_readme
     
-    def batch_git_status(self) -> Dict[str, List[str]]:
+    def batch_git_status(self, snapshot: Optional[WorkspaceSnapshot] = None) -> Dict[str, List[str]]:
         """
         批次取得所有專案的 Git 狀態摘要
         
+        Args:
+            snapshot: 既有的工作區快照（省略時重新掃描）
+            
         Returns:
             按狀態分組的專案字典
         """
+        if snapshot is not None:
+            return snapshot.git_status_groups()
+        
         status_groups = {
             'Clean': [],
             'Modified': [],
@@ -405,13 +734,25 @@ class ProjectManager:
             'Error': []
         }
         
-        for project in self.list_all_projects():
-            project_path = Path(project['path'])
-            status, _ = self.get_git_status(project_path)
-            status_groups[status].append(project['name'])
+        for entry, (status, _) in sorted(self._batch_status().items(),
+                                         key=lambda item: item[0].name.lower()):
+            status_groups[status].append(entry.name)
         
         return status_groups
     
+    def _batch_status(self) -> Dict[Path, Tuple[str, str]]:
+        """平行取得所有專案的 Git 狀態（只需狀態時比完整中繼資料更省子程序）"""
+        return self.flight.do(('batch_status',), self._collect_batch_status)
+    
+    def _collect_batch_status(self) -> Dict[Path, Tuple[str, str]]:
+        entries = list(self._iter_project_dirs())
+        if not entries:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.git_workers, len(entries))) as executor:
+            statuses = executor.map(lambda entry: self.get_git_status(entry, BACKGROUND), entries)
+            return dict(zip(entries, statuses))
+    
     def open_in_editor(self, project_name: str, editor: str = 'code') -> Tuple[bool, str]:
         """
         在編輯器中開啟專案
@@ -426,7 +767,7 @@ class ProjectManager:
         try:
             project_path = self.validate_project_path(project_name)
             
-            result = subprocess.run(
+            result = governor.run(
                 [editor, str(project_path)],
                 shell=(os.name == 'nt'),
                 capture_output=True,
@@ -0,0 +1,183 @@
+"""
+Project Dashboard v2 - README Metadata
+以 (inode, mtime, size) 為鍵快取 README 解析結果，一次有限長度的讀取即取得
+標題、第一段落、徽章與章節標題
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+# 每個 README 最多讀取的位元組數
+READ_LIMIT = 64 * 1024
+
+# 標題與描述的最大長度
+TITLE_MAX_LENGTH = 100
+SUMMARY_MAX_LENGTH = 300
+
+_IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(\s*([^)\s]+)[^)]*\)')
+_EMPTY_LINK_PATTERN = re.compile(r'\[\s*\]\([^)]*\)')
+_BADGE_HINTS = ('shields.io', 'badge', 'badgen.net', 'codecov.io', 'travis-ci', '/workflows/')
+
+
+@dataclass(frozen=True, slots=True)
+class ReadmeMetadata:
+    """README 解析結果"""
+
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    # (替代文字, 圖片網址)
+    badges: Tuple[Tuple[str, str], ...] = ()
+    # (層級, 標題文字)
+    headings: Tuple[Tuple[int, str], ...] = ()
+    # 檔案超過 READ_LIMIT 時為 True
+    truncated: bool = False
+
+    def to_dict(self) -> Dict:
+        """序列化為字典"""
+        return {
+            'title': self.title,
+            'summary': self.summary,
+            'badges': [{'alt': alt, 'url': url} for alt, url in self.badges],
+            'headings': [{'level': level, 'text': text} for level, text in self.headings],
+            'truncated': self.truncated
+        }
+
+
+def parse_readme(text: str, truncated: bool = False) -> ReadmeMetadata:
+    """
+    解析 Markdown README
+
+    Args:
+        text: README 內容（可能已截斷）
+        truncated: 內容是否被截斷
+
+    Returns:
+        ReadmeMetadata
+    """
+    title = None
+    headings = []
+    badges = []
+    paragraph = []
+    summary = None
+    in_fence = False
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+
+        if line.startswith('```') or line.startswith('~~~'):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        if line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            heading = line.lstrip('#').strip()
+            if heading:
+                if title is None:
+                    title = heading[:TITLE_MAX_LENGTH]
+                headings.append((level, heading))
+            if paragraph and summary is None:
+                summary = ' '.join(paragraph)
+            continue
+
+        images = _IMAGE_PATTERN.findall(line)
+        for alt, url in images:
+            if any(hint in url.lower() for hint in _BADGE_HINTS):
+                badges.append((alt, url))
+
+        if summary is not None:
+            continue
+
+        if not line:
+            if paragraph:
+                summary = ' '.join(paragraph)
+            continue
+
+        # 徽章列、HTML、表格與分隔線不算段落內容
+        if images and not _EMPTY_LINK_PATTERN.sub('', _IMAGE_PATTERN.sub('', line)).strip():
+            continue
+        if line.startswith(('<', '---', '***', '===', '|')):
+            continue
+        line = line.lstrip('>').strip()
+        if line:
+            paragraph.append(line)
+
+    if summary is None and paragraph:
+        summary = ' '.join(paragraph)
+    if summary:
+        summary = summary[:SUMMARY_MAX_LENGTH]
+
+    return ReadmeMetadata(
+        title=title,
+        summary=summary,
+        badges=tuple(badges),
+        headings=tuple(headings),
+        truncated=truncated
+    )
+
+
+class ReadmeCache:
+    """
+    README 中繼資料快取
+
+    以檔案路徑索引，並以 (inode, mtime, size) 驗證；檔案未變更時只需一次 stat，
+    不會重新讀取內容。
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int, int], ReadmeMetadata]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, readme_path: Path) -> Optional[ReadmeMetadata]:
+        """
+        取得 README 中繼資料
+
+        Args:
+            readme_path: README.md 路徑
+
+        Returns:
+            ReadmeMetadata；檔案不存在時回傳 None
+        """
+        key = str(readme_path)
+        try:
+            st = os.stat(readme_path)
+        except OSError:
+            self.invalidate(key)
+            return None
+
+        fingerprint = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        with open(readme_path, 'rb') as f:
+            data = f.read(READ_LIMIT)
+        metadata = parse_readme(
+            data.decode('utf-8', errors='ignore'),
+            truncated=st.st_size > READ_LIMIT
+        )
+
+        with self._lock:
+            self._entries[key] = (fingerprint, metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return metadata
+
+    def invalidate(self, key: Optional[str] = None):
+        """移除單一項目或清空快取"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
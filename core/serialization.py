@@ -0,0 +1,141 @@
+"""
+Project Dashboard v2 - JSON Serialization
+可抽換的 JSON 序列化器：安裝 orjson 時使用 orjson，否則退回標準函式庫
+"""
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 依安裝環境而定
+    orjson = None
+
+from .snapshot import ProjectRecord
+
+
+# 目前使用的序列化後端名稱
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    將物件序列化為 UTF-8 JSON 位元組
+
+    Args:
+        obj: 可序列化的物件
+
+    Returns:
+        JSON 位元組（緊湊格式，不跳脫非 ASCII 字元）
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """將 JSON 字串或位元組反序列化"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FragmentCache:
+    """
+    預先編碼的專案卡片片段（不含結尾的 '}'），依快照世代保存
+
+    記錄不可變且以值雜湊：切換到新的世代（例如新的快照）時，上一世代的片段只要記錄內容
+    未變就直接沿用，不會重新編碼；未出現在新世代中的記錄（已移除或已改變的專案）
+    在下一次切換時捨棄。快取大小因此隨工作區而定，不是固定上限，循序走訪整份快照
+    也不會互相擠出。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation: Any = None
+        self._current: Dict[ProjectRecord, bytes] = {}
+        self._previous: Dict[ProjectRecord, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, record: ProjectRecord, generation: Any = None) -> bytes:
+        """
+        取得記錄的編碼片段
+
+        Args:
+            record: 專案記錄
+            generation: 記錄所屬的世代（例如快照的 created_at）
+        """
+        with self._lock:
+            if generation != self._generation:
+                self._previous, self._current = self._current, {}
+                self._generation = generation
+            fragment = self._current.get(record)
+            if fragment is None:
+                fragment = self._previous.pop(record, None)
+                if fragment is not None:
+                    self._current[record] = fragment
+            if fragment is not None:
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = dumps(record.to_dict())[:-1]
+        with self._lock:
+            if generation == self._generation:
+                self._current[record] = fragment
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._generation = None
+            self._current = {}
+            self._previous = {}
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._current) + len(self._previous),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+fragments = FragmentCache()
+
+
+def encode_projects(records: Iterable[ProjectRecord],
+                    favorites: Optional[Set[str]] = None,
+                    tags_map: Optional[Dict[str, List[str]]] = None,
+                    generation: Any = None) -> bytes:
+    """
+    將專案記錄編碼為 JSON 陣列，只有收藏與標籤欄位需逐次編碼
+
+    Args:
+        records: 專案記錄序列
+        favorites: 收藏專案名稱集合
+        tags_map: {專案名稱: [標籤, ...]}
+        generation: 記錄所屬的快照世代（見 FragmentCache）
+
+    Returns:
+        JSON 陣列位元組
+    """
+    favorites = favorites or set()
+    tags_map = tags_map or {}
+
+    parts = []
+    for record in records:
+        parts.append(
+            fragments.get(record, generation)
+            + b',"is_favorite":'
+            + (b'true' if record.name in favorites else b'false')
+            + b',"tags":'
+            + dumps(tags_map.get(record.name, []))
+            + b'}'
+        )
+
+    return b'[' + b','.join(parts) + b']'
@@ -0,0 +1,101 @@
+"""
+Project Dashboard v2 - Single Flight
+合併同時發生的相同計算：同一個鍵同時只執行一次，其餘呼叫者等待並共用結果或例外
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class SingleFlightTimeout(TimeoutError):
+    """等待進行中的計算逾時"""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    以鍵合併同時進行的計算
+
+    第一個呼叫者（leader）在自己的執行緒中執行計算；計算完成前到達的相同鍵呼叫者
+    等待同一個結果，計算拋出的例外也會傳給所有等待者。計算完成後鍵即移除，
+    之後的呼叫會重新計算（結果快取由呼叫端自行負責）。
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: 等待者的預設逾時秒數，None 代表無限等待
+        """
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           timeout: Optional[float] = _MISSING,
+           clone: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        執行或加入進行中的計算
+
+        Args:
+            key: 計算的鍵（相同鍵視為相同計算）
+            fn: 無參數的計算函式
+            timeout: 等待進行中計算的逾時秒數，省略時使用預設值
+            clone: 交給等待者前複製結果（結果為可變物件且呼叫端會修改時使用）
+
+        Raises:
+            SingleFlightTimeout: 等待逾時（進行中的計算不受影響）
+            Exception: 計算拋出的例外
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result
+
+        wait = self.timeout if timeout is _MISSING else timeout
+        if not call.done.wait(wait):
+            raise SingleFlightTimeout(f"等待進行中的計算逾時: {key!r}")
+        if call.error is not None:
+            raise call.error
+        return clone(call.result) if clone is not None else call.result
+
+    def in_flight(self) -> int:
+        """目前進行中的計算數"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'executions': self.executions,
+            'shared': self.shared,
+            'in_flight': self.in_flight()
+        }
@@ -0,0 +1,171 @@
+"""
+Project Dashboard v2 - Workspace Snapshot
+以不可變的精簡記錄保存專案資訊，供 API 與 MCP 直接序列化
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectRecord:
+    """單一專案的不可變記錄"""
+
+    name: str
+    path: str
+    description: str
+    # 以 (語言, 百分比) 元組保存，維持可雜湊且不可變
+    languages: Tuple[Tuple[str, int], ...] = ()
+    has_git: bool = False
+    # None 代表此次快照未收集 Git 狀態
+    git_status: Optional[str] = None
+    git_detail: Optional[str] = None
+    branch: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    last_commit_at: Optional[int] = None
+    last_commit_author: Optional[str] = None
+    # True 代表時間預算內未完成掃描，欄位為先前快取的值（或空白）
+    stale: bool = False
+    # True 代表專案所在的檔案系統逾時或暫停存取中，欄位為先前快取的值
+    degraded: bool = False
+
+    @property
+    def language_map(self) -> Dict[str, int]:
+        """語言佔比字典 {'Python': 45, ...}"""
+        return dict(self.languages)
+
+    def language_percentage(self, language: str) -> int:
+        """取得指定語言的佔比，不存在時回傳 0"""
+        for lang, percentage in self.languages:
+            if lang == language:
+                return percentage
+        return 0
+
+    def summary(self) -> Dict:
+        """基本資訊（名稱、路徑、描述）"""
+        return {
+            'name': self.name,
+            'path': self.path,
+            'description': self.description
+        }
+
+    def to_dict(self) -> Dict:
+        """序列化為 API 使用的專案卡片欄位"""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'languages': self.language_map,
+            'git_status': self.git_status,
+            'git_detail': self.git_detail,
+            'has_git': self.has_git,
+            'branch': self.branch,
+            'upstream': self.upstream,
+            'ahead': self.ahead,
+            'behind': self.behind,
+            'last_commit_at': self.last_commit_at,
+            'last_commit_author': self.last_commit_author,
+            'stale': self.stale,
+            'degraded': self.degraded
+        }
+
+
+class WorkspaceSnapshot:
+    """
+    工作區快照
+
+    保存某一時間點所有專案的記錄，並依名稱、語言與 Git 狀態建立索引，
+    讓端點直接從記錄序列化而不需重複掃描或複製中間字典。
+    """
+
+    __slots__ = ('records', 'created_at', '_by_name', '_by_language', '_by_git_status')
+
+    def __init__(self, records: List[ProjectRecord], created_at: Optional[float] = None):
+        self.records: Tuple[ProjectRecord, ...] = tuple(
+            sorted(records, key=lambda r: r.name.lower())
+        )
+        self.created_at = created_at if created_at is not None else time.time()
+
+        self._by_name: Dict[str, ProjectRecord] = {}
+        self._by_language: Dict[str, List[ProjectRecord]] = {}
+        self._by_git_status: Dict[str, List[ProjectRecord]] = {}
+
+        for record in self.records:
+            self._by_name[record.name] = record
+            for lang, _ in record.languages:
+                self._by_language.setdefault(lang, []).append(record)
+            if record.git_status is not None:
+                self._by_git_status.setdefault(record.git_status, []).append(record)
+
+    def __iter__(self) -> Iterator[ProjectRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> Optional[ProjectRecord]:
+        """依名稱取得專案記錄"""
+        return self._by_name.get(name)
+
+    def names(self) -> List[str]:
+        """所有專案名稱（已排序）"""
+        return [record.name for record in self.records]
+
+    def by_language(self, language: str) -> List[ProjectRecord]:
+        """使用指定語言的專案記錄"""
+        return list(self._by_language.get(language, ()))
+
+    def by_git_status(self, status: str) -> List[ProjectRecord]:
+        """指定 Git 狀態的專案記錄"""
+        return list(self._by_git_status.get(status, ()))
+
+    def stale_names(self) -> List[str]:
+        """時間預算內未完成掃描的專案名稱"""
+        return [record.name for record in self.records if record.stale]
+
+    def degraded_names(self) -> List[str]:
+        """檔案系統暫停存取、以快取值代替的專案名稱"""
+        return [record.name for record in self.records if record.degraded]
+
+    @property
+    def partial(self) -> bool:
+        """是否包含未完成掃描的記錄"""
+        return any(record.stale for record in self.records)
+
+    def recently_active(self, limit: Optional[int] = None) -> List[ProjectRecord]:
+        """
+        依最後提交時間排序（最新在前，無提交資訊者排最後）
+
+        Args:
+            limit: 最多回傳幾筆
+        """
+        ordered = sorted(
+            self.records,
+            key=lambda r: (r.last_commit_at is None, -(r.last_commit_at or 0))
+        )
+        return ordered[:limit] if limit is not None else ordered
+
+    def language_counts(self) -> Dict[str, int]:
+        """各語言出現在多少個專案中"""
+        return {lang: len(records) for lang, records in self._by_language.items()}
+
+    def git_status_groups(self) -> Dict[str, List[str]]:
+        """
+        按 Git 狀態分組的專案名稱
+
+        Returns:
+            {'Clean': [...], 'Modified': [...], 'Not a Git repo': [...], 'Error': [...]}
+        """
+        groups = {
+            'Clean': [],
+            'Modified': [],
+            'Not a Git repo': [],
+            'Error': []
+        }
+        for status, records in self._by_git_status.items():
+            groups.setdefault(status, []).extend(record.name for record in records)
+        return groups
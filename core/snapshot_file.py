@@ -0,0 +1,103 @@
+"""
+Project Dashboard v2 - Snapshot File
+工作區快照的二進位檔：固定長度標頭 + zlib 壓縮的 marshal 資料，一次讀取即可載入，
+讓重新啟動後的第一個請求不必等待完整掃描
+"""
+import marshal
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .snapshot import ProjectRecord, WorkspaceSnapshot
+
+MAGIC = b'PDSN'
+FORMAT_VERSION = 1
+
+# magic、格式版本、marshal 版本、Python 版本（major、minor）、建立時間、資料長度、CRC32
+_HEADER = struct.Struct('<4sBBBBdII')
+
+_RECORD_FIELDS = ProjectRecord.__dataclass_fields__.keys()
+
+
+def _python_version() -> tuple:
+    return sys.version_info[0], sys.version_info[1]
+
+
+def save_snapshot(snapshot: WorkspaceSnapshot, path: str, scan_path: str):
+    """
+    將快照寫入檔案（先寫入暫存檔再取代，讀取端不會讀到寫到一半的檔案）
+
+    Args:
+        snapshot: 工作區快照
+        path: 快照檔路徑
+        scan_path: 快照對應的掃描根目錄（載入時比對）
+    """
+    fields = tuple(_RECORD_FIELDS)
+    payload = zlib.compress(marshal.dumps({
+        'scan_path': str(scan_path),
+        'fields': fields,
+        'records': [tuple(getattr(record, field) for field in fields) for record in snapshot]
+    }), 6)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, marshal.version, *_python_version(),
+        snapshot.created_at, len(payload), zlib.crc32(payload)
+    )
+
+    # 每個行程使用自己的暫存檔（Web 與 MCP 可能寫入同一個快照檔）
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, scan_path: str) -> Optional[WorkspaceSnapshot]:
+    """
+    載入快照檔
+
+    檔案不存在、毀損、由不同 Python／格式版本寫入，或對應不同的掃描根目錄時回傳 None，
+    呼叫端照常掃描即可。
+
+    Args:
+        path: 快照檔路徑
+        scan_path: 目前的掃描根目錄
+    """
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, version, marshal_version, major, minor, created_at, length, crc = \
+        _HEADER.unpack_from(data)
+    if (magic != MAGIC or version != FORMAT_VERSION or marshal_version != marshal.version
+            or (major, minor) != _python_version()):
+        return None
+
+    payload = memoryview(data)[_HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        return None
+
+    try:
+        content = marshal.loads(zlib.decompress(payload))
+    except (ValueError, EOFError, TypeError, zlib.error):
+        return None
+    if content.get('scan_path') != str(scan_path):
+        return None
+
+    fields = content['fields']
+    if tuple(fields) == tuple(_RECORD_FIELDS):
+        records = [ProjectRecord(*values) for values in content['records']]
+    else:
+        # 舊版欄位：依名稱對應，忽略已移除的欄位
+        records = [
+            ProjectRecord(**{
+                field: value for field, value in zip(fields, values) if field in _RECORD_FIELDS
+            })
+            for values in content['records']
+        ]
+    return WorkspaceSnapshot(records, created_at=created_at)
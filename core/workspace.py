@@ -0,0 +1,375 @@
+"""
+Project Dashboard v2 - Workspace
+協調掃描與快取：共用同一資料庫的行程（Web 與 MCP）透過世代計數器重用彼此的掃描結果
+"""
+import dataclasses
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .database import DatabaseManager
+from .deadline import Deadline
+from .dependencies import DependencyIndex
+from .project_manager import ProjectManager
+from .snapshot import ProjectRecord, WorkspaceSnapshot
+from .snapshot_file import load_snapshot, save_snapshot
+
+# 跨行程掃描租約的名稱與等待其他行程掃描時的輪詢間隔（秒）
+SCAN_LEASE = 'scan'
+LEASE_POLL = 0.5
+
+
+class Workspace:
+    """
+    工作區快照的取得與持久化
+
+    取得快照時依序嘗試：
+        1. 行程內快照：project_cache 世代未變且未超過 max_age
+        2. 資料庫快取：最近一次完整掃描（可能由其他行程執行）未超過 max_age
+        *  啟動時載入的快照檔：直接回傳，並在背景掃描
+        3. 完整掃描：寫入快取、歷史與依賴索引，並記錄掃描時間（可設定時間預算，
+           逾時先回傳部分結果）
+
+    完整掃描前先取得資料庫中的掃描租約：多個 worker 或行程共用同一資料庫時只有一個
+    實際掃描，其餘等待並改用寫入快取的結果。
+    """
+
+    def __init__(self, project_manager: ProjectManager, db: DatabaseManager,
+                 dependency_index: Optional[DependencyIndex] = None,
+                 max_age: float = 30, snapshot_path: Optional[str] = None,
+                 lease_ttl: float = 300):
+        """
+        Args:
+            project_manager: 專案管理器
+            db: 資料庫管理器
+            dependency_index: 依賴索引，提供時完整掃描後一併增量更新
+            max_age: 快照可重用的秒數
+            snapshot_path: 快照檔路徑，提供時每次完整掃描後寫入，並可在啟動時以 load() 載入
+            lease_ttl: 掃描租約的有效秒數（掃描期間定期續約），0 代表不使用租約
+        """
+        self.project_manager = project_manager
+        self.db = db
+        self.dependency_index = dependency_index
+        self.max_age = max_age
+        self.snapshot_path = snapshot_path
+        self.lease_ttl = lease_ttl
+        self._holder = f'{os.getpid()}@{socket.gethostname()}'
+
+        self._snapshot: Optional[WorkspaceSnapshot] = None
+        self._generation: Optional[int] = None
+        self._source: Optional[str] = None
+        self._job: Optional[_ScanJob] = None
+        self._lock = threading.Lock()
+        # 啟動時由快照檔載入、尚未以掃描確認的快照
+        self._preloaded: Optional[WorkspaceSnapshot] = None
+        self._saved_at: Optional[float] = None
+
+        self.partial_responses = 0
+        self.peer_scans = 0
+
+    def snapshot(self, refresh: bool = False, budget: Optional[float] = None) -> WorkspaceSnapshot:
+        """
+        取得工作區快照
+
+        需要掃描時掃描在背景執行緒進行，同時到達的請求共用同一次掃描。提供時間預算時
+        最多等待 budget 秒：未完成的專案以先前快取的值代替並標記為 stale，
+        掃描仍在背景完成並寫入快取，之後的請求即取得完整結果。
+
+        Args:
+            refresh: 強制重新掃描
+            budget: 等待掃描的時間預算秒數，None 代表等到掃描完成
+        """
+        deadline = Deadline(budget)
+
+        if not refresh:
+            # 同時到達的請求共用同一次重用檢查，而不是在鎖上排隊後各自再查一次
+            reused = self.project_manager.flight.do(('workspace',), self._reuse)
+            if reused is not None:
+                return reused
+
+            # 剛啟動：先回傳快照檔的內容，掃描在背景重新確認
+            preloaded = self._preloaded
+            if preloaded is not None:
+                self._start_scan()
+                self._source = 'file'
+                return preloaded
+
+        job = self._start_scan()
+        if not deadline.wait(job.done):
+            return self._partial(job)
+        if job.error is not None:
+            raise job.error
+        return job.snapshot
+
+    def load(self) -> bool:
+        """
+        載入快照檔（啟動時呼叫）
+
+        載入的快照在第一次需要掃描時直接回傳，同時在背景掃描；掃描完成後即改用新結果。
+
+        Returns:
+            是否成功載入
+        """
+        if not self.snapshot_path:
+            return False
+        snapshot = load_snapshot(self.snapshot_path, self.project_manager.scan_path)
+        if snapshot is None:
+            return False
+        self._preloaded = snapshot
+        self._saved_at = snapshot.created_at
+        return True
+
+    def save(self) -> bool:
+        """
+        將目前的快照寫入快照檔（已寫入過的同一份快照不再寫入）
+
+        Returns:
+            是否寫入
+        """
+        snapshot = self._snapshot
+        if not self.snapshot_path or snapshot is None or snapshot.created_at == self._saved_at:
+            return False
+        try:
+            save_snapshot(snapshot, self.snapshot_path, self.project_manager.scan_path)
+        except OSError as e:
+            print(f"寫入快照檔時發生錯誤: {e}")
+            return False
+        self._saved_at = snapshot.created_at
+        return True
+
+    def shutdown(self, timeout: float = 5) -> bool:
+        """
+        關閉前呼叫：等待進行中的掃描最多 timeout 秒，寫回累積的存取統計並寫入快照檔
+
+        掃描未能及時完成時釋放掃描租約，讓其他行程立即接手而不必等租約過期。
+
+        Returns:
+            是否寫入快照檔
+        """
+        job = self._job
+        if job is not None and not job.done.wait(timeout) and self.lease_ttl:
+            self.db.release_lease(SCAN_LEASE, self._holder)
+        self.db.flush()
+        return self.save()
+
+    def invalidate(self):
+        """捨棄行程內快照（下次取得時改讀資料庫或重新掃描）"""
+        with self._lock:
+            self._snapshot = None
+            self._generation = None
+
+    def status(self) -> Dict:
+        """快照來源與世代資訊"""
+        snapshot = self._snapshot if self._snapshot is not None else self._preloaded
+        job = self._job
+        return {
+            'source': self._source,
+            'generation': self._generation,
+            'age': round(time.time() - snapshot.created_at, 1) if snapshot else None,
+            'projects': len(snapshot) if snapshot else 0,
+            'max_age': self.max_age,
+            'scanning': job is not None and not job.done.is_set(),
+            'partial_responses': self.partial_responses,
+            'peer_scans': self.peer_scans,
+            'scan_lease': self.db.get_lease(SCAN_LEASE) if self.lease_ttl else None,
+            'degraded': snapshot.degraded_names() if snapshot else [],
+            'snapshot_file': self.snapshot_path
+        }
+
+    def _reuse(self) -> Optional[WorkspaceSnapshot]:
+        """行程內快照或資料庫快取仍新鮮時回傳，否則回傳 None"""
+        with self._lock:
+            generation = self.db.get_generation()
+            last_scan = self.db.get_last_scan()
+            if last_scan is None or time.time() - last_scan['scanned_at'] >= self.max_age:
+                return None
+
+            if self._snapshot is not None and generation == self._generation:
+                self._source = 'memory'
+                return self._snapshot
+
+            snapshot = self._from_cache(last_scan)
+            if snapshot is not None:
+                self._snapshot = snapshot
+                self._generation = generation
+                self._source = 'cache'
+            return snapshot
+
+    def _start_scan(self) -> '_ScanJob':
+        """啟動背景掃描；已有掃描進行中時加入該次掃描"""
+        with self._lock:
+            if self._job is None or self._job.done.is_set():
+                self._job = _ScanJob()
+                threading.Thread(
+                    target=self._run_scan, args=(self._job,),
+                    name='workspace-scan', daemon=True
+                ).start()
+            return self._job
+
+    def _run_scan(self, job: '_ScanJob'):
+        try:
+            snapshot, source = self._scan_exclusive(job)
+            with self._lock:
+                self._snapshot = snapshot
+                self._generation = self.db.get_generation()
+                self._source = source
+                self._preloaded = None
+            job.snapshot = snapshot
+            self.save()
+        except BaseException as e:
+            job.error = e
+        finally:
+            job.done.set()
+
+    def _scan_exclusive(self, job: '_ScanJob'):
+        """
+        取得掃描租約後掃描，回傳 (快照, 來源)
+
+        其他行程持有租約時等待其釋放，並改用該次掃描寫入資料庫的結果；
+        持有者異常結束時租約過期後由這裡接手掃描。
+        """
+        if not self.lease_ttl:
+            return self._scan(job.progress.append), 'scan'
+
+        requested_at = int(time.time())
+        while not self.db.acquire_lease(SCAN_LEASE, self._holder, self.lease_ttl):
+            while self.db.get_lease(SCAN_LEASE) is not None:
+                time.sleep(LEASE_POLL)
+            last_scan = self.db.get_last_scan()
+            if last_scan is not None and last_scan['scanned_at'] >= requested_at:
+                snapshot = self._from_cache(last_scan)
+                if snapshot is not None:
+                    self.peer_scans += 1
+                    return snapshot, 'peer'
+
+        renewed_at = time.monotonic()
+
+        def on_record(record: ProjectRecord):
+            nonlocal renewed_at
+            job.progress.append(record)
+            if time.monotonic() - renewed_at > self.lease_ttl / 3:
+                renewed_at = time.monotonic()
+                self.db.acquire_lease(SCAN_LEASE, self._holder, self.lease_ttl)
+
+        try:
+            return self._scan(on_record), 'scan'
+        finally:
+            self.db.release_lease(SCAN_LEASE, self._holder)
+
+    def _partial(self, job: '_ScanJob') -> WorkspaceSnapshot:
+        """時間預算用盡時：已完成的記錄加上其餘專案的快取值（標記為 stale）"""
+        finished = {record.name: record for record in list(job.progress)}
+        cached = self._previous_records()
+
+        records = []
+        for name, path in self.project_manager.list_project_paths():
+            record = finished.get(name)
+            if record is None:
+                record = self._substitute(
+                    cached.get(name), stale=True, name=name, path=str(path)
+                )
+            elif record.degraded:
+                record = self._substitute(
+                    cached.get(name), degraded=True, name=name, path=record.path
+                )
+            records.append(record)
+
+        self.partial_responses += 1
+        self._source = 'partial'
+        return WorkspaceSnapshot(records)
+
+    def _previous_records(self) -> Dict[str, ProjectRecord]:
+        """上一份快照（或 project_cache）中的記錄，依名稱索引"""
+        previous = self._snapshot if self._snapshot is not None else self._preloaded
+        if previous is None:
+            previous = self._cached_records()
+        return {record.name: record for record in previous if not record.stale}
+
+    @staticmethod
+    def _substitute(cached: Optional[ProjectRecord], name: str, path: str,
+                    **flags) -> ProjectRecord:
+        """以快取的記錄代替未完成的專案，沒有快取時只保留名稱與路徑"""
+        if cached is not None:
+            return dataclasses.replace(cached, **flags)
+        return ProjectRecord(name=name, path=path, description='', **flags)
+
+    def _scan(self, on_record=None) -> WorkspaceSnapshot:
+        """完整掃描並寫入所有衍生資料"""
+        started = time.perf_counter()
+        snapshot = self.project_manager.build_snapshot(on_record=on_record)
+
+        # 檔案系統暫停存取的專案以快取的值代替，且不寫回快取、歷史與依賴索引
+        degraded = [record.name for record in snapshot if record.degraded]
+        if degraded:
+            cached = self._previous_records()
+            snapshot = WorkspaceSnapshot([
+                self._substitute(
+                    cached.get(record.name), degraded=True, name=record.name, path=record.path
+                ) if record.degraded else record
+                for record in snapshot
+            ])
+        healthy = [record for record in snapshot if not record.degraded]
+
+        self.db.cache_records(healthy)
+        self.db.prune_missing_projects(snapshot.names())
+        self.db.record_history(healthy)
+        if self.dependency_index is not None:
+            self.dependency_index.sync(snapshot)
+        self.db.record_scan(
+            len(snapshot), int((time.perf_counter() - started) * 1000),
+            folders_without_readme=len(self.project_manager.last_without_readme)
+        )
+        # 快照中的專案不淘汰：否則下次掃描又重新寫入（觸發事件與彙總表更新），
+        # 且 _from_cache 因列數不足而無法重用其他行程的掃描結果
+        self.db.maybe_run_maintenance(protected=snapshot.names())
+        self.db.warm_memory_cache()
+
+        return snapshot
+
+    def _from_cache(self, last_scan: Dict) -> Optional[WorkspaceSnapshot]:
+        """
+        由 project_cache 重建快照（不讀取檔案系統或執行 git）
+
+        快取列少於上次掃描的專案數（例如已被淘汰）時回傳 None。
+        """
+        records = self._cached_records()
+        if len(records) < (last_scan['projects_found'] or 0):
+            return None
+        return WorkspaceSnapshot(records, created_at=last_scan['scanned_at'])
+
+    def _cached_records(self) -> List[ProjectRecord]:
+        """project_cache 中所有專案的記錄"""
+        scan_path = self.project_manager.scan_path
+        return [
+            ProjectRecord(
+                name=row['name'],
+                path=str(scan_path / row['name']),
+                description=row['description'],
+                languages=tuple(row['languages'].items()),
+                has_git=row['has_git'],
+                git_status=row['git_status'],
+                git_detail=row['git_detail'],
+                branch=row['branch'],
+                upstream=row['upstream'],
+                ahead=row['ahead'],
+                behind=row['behind'],
+                last_commit_at=row['last_commit_at'],
+                last_commit_author=row['last_commit_author']
+            )
+            for row in self.db.get_cached_rows()
+        ]
+
+
+class _ScanJob:
+    """一次背景掃描：已完成的記錄、結果與完成事件"""
+
+    __slots__ = ('progress', 'snapshot', 'error', 'done')
+
+    def __init__(self):
+        # list.append 在多執行緒下是原子操作，掃描途中可直接複製讀取
+        self.progress: List[ProjectRecord] = []
+        self.snapshot: Optional[WorkspaceSnapshot] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
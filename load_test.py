@@ -0,0 +1,196 @@
+"""
+Project Dashboard v2 - Load Test
+以不同 worker 數啟動正式模式的 Web 介面並量測吞吐量，確認多 worker 的擴展效果
+
+    python load_test.py --workers 1 2 4 --duration 10
+    python load_test.py --url http://127.0.0.1:5001 --duration 10   # 測試已在執行的伺服器
+"""
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ['/api/projects', '/api/statistics', '/api/tags', '/api/favorites']
+READY_TIMEOUT = 60
+
+
+def _client(host: str, port: int, paths: List[str], duration: float,
+            connections: int) -> Dict:
+    """單一用戶端行程：connections 條 keep-alive 連線輪流請求 paths，持續 duration 秒"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker(offset: int):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local: List[float] = []
+        failed = 0
+        i = offset
+        while time.monotonic() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'latencies': latencies, 'errors': errors[0]}
+
+
+def run_load(host: str, port: int, paths: List[str], duration: float,
+             clients: int, connections: int) -> Dict:
+    """以 clients 個行程（避免用戶端本身受 GIL 限制）同時施加負載並彙總結果"""
+    with ProcessPoolExecutor(max_workers=clients) as pool:
+        futures = [
+            pool.submit(_client, host, port, paths, duration, connections)
+            for _ in range(clients)
+        ]
+        results = [future.result() for future in futures]
+
+    latencies = sorted(latency for result in results for latency in result['latencies'])
+    errors = sum(result['errors'] for result in results)
+
+    def percentile(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / duration,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99)
+    }
+
+
+def wait_ready(host: str, port: int, timeout: float = READY_TIMEOUT) -> bool:
+    """等待伺服器可回應（包含第一次掃描）"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            conn.request('GET', '/api/projects')
+            ok = conn.getresponse().status == 200
+            conn.close()
+            if ok:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_server(workers: int, host: str, port: int) -> subprocess.Popen:
+    """以正式模式啟動 app.py（在目前目錄執行，與直接執行 app.py 相同讀取 .env）"""
+    return subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / 'app.py'), '--production',
+         '--workers', str(workers), '--host', host, '--port', str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def stop_server(process: subprocess.Popen):
+    """送出 SIGINT 讓 uvicorn 正常關閉（各 worker 寫回快取與快照）"""
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return f'{value:.1f}' if value is not None else '-'
+
+
+def print_table(rows: List[Dict]):
+    print(f"{'workers':>8}{'req/s':>12}{'speedup':>9}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'errors':>8}")
+    baseline = rows[0]['rps'] if rows and rows[0]['rps'] else None
+    for row in rows:
+        speedup = f"{row['rps'] / baseline:.2f}x" if baseline else '-'
+        print(f"{row['workers']:>8}{row['rps']:>12.1f}{speedup:>9}"
+              f"{_format_ms(row['p50_ms']):>10}{_format_ms(row['p95_ms']):>10}"
+              f"{_format_ms(row['p99_ms']):>10}{row['errors']:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Project Dashboard v2 負載測試')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='要比較的 worker 數')
+    parser.add_argument('--url', help='測試已在執行的伺服器（不自行啟動）')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5101, help='自行啟動時使用的埠號')
+    parser.add_argument('--duration', type=float, default=10, help='每輪量測秒數')
+    parser.add_argument('--clients', type=int, default=os.cpu_count() or 1,
+                        help='用戶端行程數')
+    parser.add_argument('--connections', type=int, default=8,
+                        help='每個用戶端行程的連線數')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help=f'請求的路徑（可重複，預設 {" ".join(DEFAULT_PATHS)}）')
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    if args.url:
+        parts = urlsplit(args.url)
+        result = run_load(parts.hostname, parts.port or 80, paths, args.duration,
+                          args.clients, args.connections)
+        print_table([{'workers': '-', **result}])
+        return 0
+
+    rows = []
+    for workers in args.workers:
+        process = start_server(workers, args.host, args.port)
+        try:
+            if not wait_ready(args.host, args.port):
+                print(f"{workers} 個 worker 的伺服器未能在 {READY_TIMEOUT} 秒內啟動")
+                return 1
+            # 暖機：讓每個 worker 載入快照並填滿記憶體快取
+            run_load(args.host, args.port, paths, 2, args.clients, args.connections)
+            result = run_load(args.host, args.port, paths, args.duration,
+                              args.clients, args.connections)
+            rows.append({'workers': workers, **result})
+            print(f"{workers} 個 worker: {result['rps']:.1f} req/s", file=sys.stderr)
+        finally:
+            stop_server(process)
+
+    print_table(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
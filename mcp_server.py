@@ -1,47 +1,92 @@
 """
 Project Dashboard v2 - Enhanced MCP Server
 提供豐富的工具讓 AI 助理管理本地專案
+
+MCP 用戶端每次連線都會啟動新的行程，因此啟動只做最少的事：核心模組延後到第一個
+工具呼叫才匯入，掃描目錄、資料庫與快照檔也在那時才存取（掃描目錄在停滯的網路掛載上
+時，啟動不會卡住）。以 --profile-startup 執行可列出各階段耗時。
 """
-import os
 import sys
+import time
+
+_STARTED = time.perf_counter()
+
+import atexit
+import threading
 from pathlib import Path
+from types import SimpleNamespace
 from typing import List, Dict
 
 # 加入核心模組路徑
 sys.path.insert(0, str(Path(__file__).parent))
 
 from fastmcp import FastMCP
-from core.project_manager import ProjectManager
-from core.database import DatabaseManager
+from core.config import create_services, load_env
+from core.health import IOUnavailable
 
 
 # ===== 環境設定 =====
-def load_env(filepath='.env'):
-    """載入環境變數"""
-    env_data = {
-        'SCAN_DIR': '..',  # 預設掃描上層目錄
-        'DB_PATH': 'project_dashboard.db'
-    }
-    
-    env_file = Path(filepath)
-    if env_file.exists():
-        with open(env_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if '=' in line and not line.startswith('#'):
-                    key, value = line.split('=', 1)
-                    env_data[key] = value.strip('"').strip("'")
-    
-    return env_data
+# 預設值、.env 與路徑解析與 Web 介面、掃描常駐程式共用（見 core/config.py）
+config = load_env()
 
+# 需要掃描的工具最多等待的秒數（0 = 等到掃描完成）；逾時回傳部分結果，掃描在背景完成
+REQUEST_BUDGET = float(config['REQUEST_BUDGET'])
+
+# 各初始化階段的耗時（秒），供 --profile-startup 輸出
+_timings: Dict[str, float] = {}
+
+
+def _create_services() -> SimpleNamespace:
+    """匯入核心模組並建立管理器、資料庫與工作區"""
+    created = create_services(config, timings=_timings)
+
+    started = time.perf_counter()
+    # 載入上次的快照檔：工具呼叫直接回傳，背景重新掃描確認；
+    # 結束時寫回累積的存取統計並寫入最新的快照
+    if created.local_workspace.load():
+        created.workspace.snapshot()
+    atexit.register(created.local_workspace.shutdown)
+    _timings['workspace'] += time.perf_counter() - started
+
+    return created
+
+
+_services = None
+_services_lock = threading.Lock()
+
+
+def services() -> SimpleNamespace:
+    """第一次呼叫時建立所有服務（多個工具同時呼叫時只建立一次）"""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = _create_services()
+    return _services
 
-# 初始化
-config = load_env()
-SCAN_PATH = Path(__file__).parent / config['SCAN_DIR']
-SCAN_PATH = SCAN_PATH.resolve()
 
-project_manager = ProjectManager(str(SCAN_PATH))
-db = DatabaseManager(config['DB_PATH'])
+class _Deferred:
+    """代理 services() 中的物件：第一次存取屬性時才建立服務"""
+
+    __slots__ = ('_name',)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(services(), self._name), attr)
+
+
+project_manager = _Deferred('project_manager')
+db = _Deferred('db')
+dependency_index = _Deferred('dependency_index')
+workspace = _Deferred('workspace')
+
+
+def take_snapshot():
+    """在時間預算內取得工作區快照（逾時時未完成的專案標記為 stale）"""
+    return workspace.snapshot(budget=REQUEST_BUDGET)
+
 
 mcp = FastMCP("Project Dashboard v2")
 
@@ -58,11 +103,12 @@ def list_projects() -> List[Dict]:
     """
     projects = project_manager.list_all_projects()
     favorites = set(db.get_favorites())
+    tags_map = db.get_tags_map()
     
     # 加入收藏狀態
     for project in projects:
         project['is_favorite'] = project['name'] in favorites
-        project['tags'] = db.get_project_tags(project['name'])
+        project['tags'] = tags_map.get(project['name'], [])
     
     return projects
 
@@ -87,8 +133,15 @@ def get_project_info(name: str) -> Dict:
         
         # 快取資訊
         db.cache_project(info)
+        db.record_access(name)
         
         return info
+    except IOUnavailable as e:
+        # 檔案系統逾時或暫停存取中：改用快取的資料
+        cached = db.get_cached_project(name)
+        if cached is None:
+            return {"error": str(e)}
+        return {**cached, "degraded": True, "retry_at": e.retry_at}
     except ValueError as e:
         return {"error": str(e)}
 
@@ -107,7 +160,7 @@ def get_project_files(name: str, depth: int = 2) -> Dict:
     """
     try:
         return project_manager.get_directory_tree(name, depth)
-    except ValueError as e:
+    except (ValueError, IOUnavailable) as e:
         return {"error": str(e)}
 
 
@@ -128,7 +181,7 @@ def search_projects_by_language(language: str) -> List[Dict]:
         - search_projects_by_language("Python")
         - search_projects_by_language("TypeScript")
     """
-    results = project_manager.search_by_language(language)
+    results = project_manager.search_by_language(language, take_snapshot())
     
     # 加入收藏狀態
     favorites = set(db.get_favorites())
@@ -139,17 +192,61 @@ def search_projects_by_language(language: str) -> List[Dict]:
 
 
 @mcp.tool()
-def search_projects_by_tag(tag: str) -> List[str]:
+def search_projects_by_dependency(package: str, version: str = None,
+                                  ecosystem: str = None) -> List[Dict]:
     """
-    搜尋具有特定標籤的專案
+    反向依賴查詢：找出使用特定套件（及版本範圍）的專案
     
     Args:
-        tag: 標籤名稱（例如: web, api, experimental）
+        package: 套件名稱（例如: requests, react, serde）
+        version: 版本條件（例如: "<2.0", ">=1.4,<2"），省略時不過濾
+        ecosystem: 限定生態系（pypi, npm, cargo, go, composer）
+        
+    Returns:
+        符合條件的專案列表，包含版本、版本需求與來源清單
+        
+    Examples:
+        - search_projects_by_dependency("requests", "<2.31")
+        - search_projects_by_dependency("react", ecosystem="npm")
+    """
+    # 快照更新（本行程或其他行程完成掃描）後才重新比對清單指紋
+    dependency_index.sync(take_snapshot())
+    
+    try:
+        return dependency_index.find_dependents(package, ecosystem, version)
+    except ValueError as e:
+        return [{"error": str(e)}]
+
+
+@mcp.tool()
+def search_projects_by_tag(tag: str, any_tags: List[str] = None,
+                           exclude_tags: List[str] = None, language: str = None,
+                           favorites_only: bool = False) -> List[str]:
+    """
+    搜尋具有特定標籤的專案，可組合多標籤布林條件
+    
+    Args:
+        tag: 標籤名稱（例如: web, api, experimental），以逗號分隔多個標籤時須全部符合
+        any_tags: 至少符合其一的標籤
+        exclude_tags: 排除具有這些標籤的專案
+        language: 只保留使用此語言的專案（依快取的語言分析）
+        favorites_only: 只回傳收藏的專案
         
     Returns:
         專案名稱列表
+        
+    Examples:
+        - search_projects_by_tag("web,api")
+        - search_projects_by_tag("web", exclude_tags=["archived"], language="Python")
     """
-    return db.find_by_tag(tag)
+    matches = db.search_by_tags(
+        all_tags=tag.split(',') if tag else None,
+        any_tags=any_tags,
+        exclude_tags=exclude_tags,
+        language=language,
+        favorites_only=favorites_only
+    )
+    return [match['name'] for match in matches]
 
 
 @mcp.tool()
@@ -173,7 +270,7 @@ def get_modified_projects() -> List[Dict]:
     Returns:
         有未提交變更的專案列表
     """
-    return project_manager.get_modified_projects()
+    return project_manager.get_modified_projects(take_snapshot())
 
 
 @mcp.tool()
@@ -188,7 +285,40 @@ def batch_git_status() -> Dict[str, List[str]]:
         - Not a Git repo: 不是 Git 倉庫
         - Error: 檢查失敗
     """
-    return project_manager.batch_git_status()
+    return project_manager.batch_git_status(take_snapshot())
+
+
+@mcp.tool()
+def get_recently_active_projects(limit: int = 10) -> List[Dict]:
+    """
+    列出最近有提交的專案（讀取快取，不重新執行 git）
+    
+    Args:
+        limit: 最多回傳幾筆（預設 10）
+        
+    Returns:
+        專案列表，包含分支、領先/落後數與最後提交時間、作者
+    """
+    projects = db.get_recently_active(limit)
+    if not projects:
+        # 快取尚未建立時先掃描一次
+        take_snapshot()
+        projects = db.get_recently_active(limit)
+    return projects
+
+
+@mcp.tool()
+def find_long_dirty_projects(days: float = 7) -> List[Dict]:
+    """
+    找出有未提交變更且已持續超過指定天數的專案（讀取狀態歷史，不重新掃描）
+    
+    Args:
+        days: 最少持續天數（預設 7）
+        
+    Returns:
+        專案列表，包含開始變更的時間（epoch 秒）、持續天數與目前變更檔案數
+    """
+    return db.find_projects_in_state('Modified', days)
 
 
 # ===== 專案診斷工具 =====
@@ -214,26 +344,19 @@ def analyze_workspace_summary() -> Dict:
     Returns:
         包含專案總數、語言分布、Git 狀態等統計資訊
     """
-    all_projects = project_manager.list_all_projects()
-    
-    # 統計語言分布
-    language_totals = {}
-    git_status_summary = project_manager.batch_git_status()
-    
-    for project in all_projects:
-        info = project_manager.get_project_info(project['name'])
-        for lang, percentage in info['languages'].items():
-            language_totals[lang] = language_totals.get(lang, 0) + 1
+    # 單次掃描同時取得語言分布與 Git 狀態
+    snapshot = take_snapshot()
+    git_status_summary = project_manager.batch_git_status(snapshot)
     
     # 排序語言
     top_languages = sorted(
-        language_totals.items(),
+        snapshot.language_counts().items(),
         key=lambda x: x[1],
         reverse=True
     )[:10]
     
     return {
-        "total_projects": len(all_projects),
+        "total_projects": len(snapshot),
         "favorites_count": len(db.get_favorites()),
         "top_languages": [{"language": lang, "project_count": count} for lang, count in top_languages],
         "git_status": {
@@ -242,8 +365,10 @@ def analyze_workspace_summary() -> Dict:
             "not_git": len(git_status_summary['Not a Git repo']),
             "errors": len(git_status_summary['Error'])
         },
-        "folders_without_readme": len(project_manager.find_projects_without_readme()),
-        "database_stats": db.get_statistics()
+        "folders_without_readme": (db.get_last_scan() or {}).get('folders_without_readme') or 0,
+        "database_stats": db.get_statistics(),
+        # 時間預算內未完成掃描的專案（數據為先前快取的值，稍後重新查詢即為完整結果）
+        "stale_projects": snapshot.stale_names()
     }
 
 
@@ -459,7 +584,7 @@ def suggest_next_actions() -> List[str]:
     suggestions = []
     
     # 檢查 Git 變更
-    modified = project_manager.get_modified_projects()
+    modified = project_manager.get_modified_projects(take_snapshot())
     if modified:
         suggestions.append(f"⚠️ 有 {len(modified)} 個專案有未提交的變更")
         suggestions.extend([f"  - {p['name']}: {p['git_detail']}" for p in modified[:3]])
@@ -475,17 +600,28 @@ def suggest_next_actions() -> List[str]:
         suggestions.append(f"📝 有 {len(no_readme)} 個資料夾缺少 README.md")
         suggestions.extend([f"  - {folder}" for folder in no_readme[:3]])
     
-    # 檢查快取
-    stats = db.get_statistics()
-    if stats['cached_projects'] > 50:
-        suggestions.append("🧹 建議清理過舊的快取以節省空間")
-    
     if not suggestions:
         suggestions.append("✅ 所有專案狀態良好！")
     
     return suggestions
 
 
+def profile_startup():
+    """輸出啟動與第一次初始化各階段的耗時（寫到 stderr，stdout 保留給 MCP 協定）"""
+    ready = time.perf_counter() - _STARTED
+    services()
+    started = time.perf_counter()
+    take_snapshot()
+    _timings['first snapshot'] = time.perf_counter() - started
+
+    print(f"{'module ready':<20}{ready * 1000:>10.1f} ms", file=sys.stderr)
+    for stage, seconds in _timings.items():
+        print(f"{stage:<20}{seconds * 1000:>10.1f} ms", file=sys.stderr)
+
+
 if __name__ == "__main__":
-    # 啟動 MCP Server
-    mcp.run()
+    if '--profile-startup' in sys.argv:
+        profile_startup()
+    else:
+        # 啟動 MCP Server
+        mcp.run()
@@ -0,0 +1,86 @@
+"""
+Project Dashboard v2 - Scan Daemon
+選用的常駐掃描程式：獨佔 ProjectManager 與快取，透過本機 Unix socket 提供快照，
+Web 介面與 MCP Server 偵測到 socket 時改為精簡用戶端
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.config import create_services, load_env
+from core.database import DatabaseManager
+from core.ipc import IPC_SUPPORTED, IPCError, encode_snapshot, serve
+from core.procgov import governor
+from core.workspace import Workspace
+
+
+def build_methods(workspace: Workspace, db: DatabaseManager):
+    """常駐程式提供的方法（ping 與快照帶有掃描路徑，用戶端據此確認與本機設定相同）"""
+    scan_path = str(workspace.project_manager.scan_path)
+    encoded = {'created_at': None, 'payload': None}
+
+    def snapshot(refresh: bool = False, since: float = None, budget: float = None):
+        current = workspace.snapshot(refresh=refresh, budget=budget)
+        if since is not None and since == current.created_at:
+            return {'unchanged': True, 'scan_path': scan_path}
+        # 同一份快照只編碼一次
+        if encoded['created_at'] != current.created_at:
+            encoded['payload'] = encode_snapshot(current, scan_path)
+            encoded['created_at'] = current.created_at
+        return encoded['payload']
+
+    def invalidate():
+        workspace.invalidate()
+        return True
+
+    def status():
+        status = workspace.status()
+        status['processes'] = governor.stats()
+        return status
+
+    def ping():
+        return {'pid': os.getpid(), 'generation': db.get_generation(), 'scan_path': scan_path}
+
+    return {
+        'snapshot': snapshot,
+        'invalidate': invalidate,
+        'status': status,
+        'ping': ping
+    }
+
+
+def main():
+    if not IPC_SUPPORTED:
+        print("此平台不支援 Unix socket，無法啟動掃描常駐程式")
+        return 1
+
+    # 與 Web 介面、MCP Server 相同的設定與路徑解析，掃描路徑才會與用戶端一致
+    config = load_env()
+    socket_path = config['DAEMON_SOCKET']
+    if not socket_path:
+        print("未設定 DAEMON_SOCKET，無法啟動掃描常駐程式")
+        return 1
+
+    created = create_services(config, use_daemon=False)
+    workspace, db = created.workspace, created.db
+    print(f"掃描常駐程式: {socket_path}")
+    print(f"掃描路徑: {created.project_manager.scan_path}")
+
+    # 啟動時先取得一次快照（有快照檔時直接載入並在背景掃描），前端第一次請求即可直接取得
+    workspace.load()
+    workspace.snapshot()
+
+    try:
+        serve(socket_path, build_methods(workspace, db))
+    except IPCError as e:
+        print(e)
+        return 1
+    finally:
+        workspace.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
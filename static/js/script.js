@@ -1,64 +1,303 @@
 let allProjects = [];
-let allLanguages = new Set();
-let allTags = new Set();
+let eventSource = null;
+
+// 用戶端索引：名稱 → 專案、語言／標籤 → 專案名稱集合、搜尋比對用的小寫文字、列表中的位置
+const projectIndex = new Map();
+const languageIndex = new Map();
+const tagIndex = new Map();
+const searchText = new Map();
+const projectOrder = new Map();
+
+// 上一次篩選的條件與結果：搜尋字串只是加長時直接由上次結果縮小範圍
+let lastFilter = null;
+
+// 虛擬化格線：只建立可視範圍（加上前後緩衝）內的卡片，其餘以容器高度撐開捲動範圍
+const OVERSCAN_PX = 600;
+const ROW_GAP_PX = 48;      // 與原本 .row.g-4 的垂直間距加上卡片的 mb-4 相同
+const ESTIMATED_HEIGHT = {card: 230, divider: 97};
+const FILTER_DEBOUNCE_MS = 150;
+
+const virtualGrid = {
+    items: [],              // [{key, kind: 'card' | 'divider', project}]
+    rows: [],               // [{top, height, items: [{item, col}]}]
+    cols: 1,
+    heights: {card: 0, divider: 0},
+    mounted: new Map(),     // key → 目前在 DOM 中的元素（篩選或捲動時重複使用）
+    frame: null,
+    message: false
+};
 
 window.onload = () => {
     fetchProjects();
     loadFilters();
+    connectEvents();
+    window.addEventListener('scroll', scheduleRender, {passive: true});
+    window.addEventListener('resize', () => {
+        // 欄數或卡片寬度可能改變：重新量測高度並重新排列
+        virtualGrid.heights = {card: 0, divider: 0};
+        unmountAll();
+        scheduleRender(true);
+    });
 };
 
 async function fetchProjects() {
-    const grid = document.getElementById('projectGrid');
     try {
         const res = await fetch('/api/projects');
         allProjects = await res.json();
-        
-        renderProjects(allProjects);
+
+        // 重新取得的資料可能與畫面上的卡片不同，不沿用既有元素
+        rebuildIndexes();
+        unmountAll();
+        filterProjects();
         updateFilters();
+
+        // 時間預算內未完成的專案顯示快取資料，掃描在伺服器背景完成後再取一次
+        // （有即時事件連線時等待 scan 事件，否則 3 秒後重試）
+        if (allProjects.some(p => p.stale) && !isLive()) {
+            setTimeout(fetchProjects, 3000);
+        }
     } catch (error) {
-        grid.innerHTML = '<div class="col-12 text-center text-danger">載入失敗: ' + error.message + '</div>';
+        showMessage('<div class="col-12 text-center text-danger">載入失敗: ' + error.message + '</div>');
     }
 }
 
+// ===== 用戶端索引 =====
+
+function addToIndex(index, key, name) {
+    let names = index.get(key);
+    if (!names) index.set(key, names = new Set());
+    names.add(name);
+}
+
+function removeFromIndex(index, key, name) {
+    const names = index.get(key);
+    if (!names) return;
+    names.delete(name);
+    if (names.size === 0) index.delete(key);
+}
+
+function indexProject(p) {
+    projectIndex.set(p.name, p);
+    searchText.set(p.name, (p.name + '\n' + (p.description || '')).toLowerCase());
+    Object.keys(p.languages || {}).forEach(lang => addToIndex(languageIndex, lang, p.name));
+    (p.tags || []).forEach(tag => addToIndex(tagIndex, tag, p.name));
+}
+
+function unindexProject(p) {
+    projectIndex.delete(p.name);
+    searchText.delete(p.name);
+    Object.keys(p.languages || {}).forEach(lang => removeFromIndex(languageIndex, lang, p.name));
+    (p.tags || []).forEach(tag => removeFromIndex(tagIndex, tag, p.name));
+}
+
+function rebuildIndexes() {
+    [projectIndex, languageIndex, tagIndex, searchText].forEach(index => index.clear());
+    allProjects.forEach(indexProject);
+    rebuildOrder();
+}
+
+function rebuildOrder() {
+    projectOrder.clear();
+    allProjects.forEach((p, i) => projectOrder.set(p.name, i));
+    lastFilter = null;
+}
+
+// ===== 虛擬化格線 =====
+
 function renderProjects(projects) {
-    const grid = document.getElementById('projectGrid');
-    
     const favs = projects.filter(p => p.is_favorite);
     const others = projects.filter(p => !p.is_favorite);
 
-    let html = '';
-    
-    if (favs.length > 0) {
-        html += favs.map(p => createCard(p)).join('');
-        if (others.length > 0) {
-            html += '<div class="col-12"><div class="section-divider"><span>其他專案</span></div></div>';
+    const items = favs.map(p => ({key: p.name, kind: 'card', project: p}));
+    if (favs.length > 0 && others.length > 0) {
+        items.push({key: '\u0000divider', kind: 'divider'});
+    }
+    others.forEach(p => items.push({key: p.name, kind: 'card', project: p}));
+
+    if (items.length === 0) {
+        showMessage('<div class="col-12 text-center text-muted py-5">目前沒有專案</div>');
+        return;
+    }
+    if (virtualGrid.message) {
+        document.getElementById('projectGrid').innerHTML = '';
+        virtualGrid.message = false;
+    }
+    virtualGrid.items = items;
+    renderVisible(true);
+}
+
+function showMessage(html) {
+    const grid = document.getElementById('projectGrid');
+    virtualGrid.items = [];
+    virtualGrid.rows = [];
+    virtualGrid.mounted.clear();
+    virtualGrid.message = true;
+    grid.classList.remove('virtual-grid');
+    grid.style.height = '';
+    grid.innerHTML = html;
+}
+
+function itemHeight(kind) {
+    return virtualGrid.heights[kind] || ESTIMATED_HEIGHT[kind];
+}
+
+function layout() {
+    // 與 .col-md-4 相同的斷點：寬螢幕每列 3 張卡片，否則 1 張
+    const cols = window.matchMedia('(min-width: 768px)').matches ? 3 : 1;
+    const rows = [];
+    let top = 0;
+    let row = null;
+
+    virtualGrid.items.forEach(item => {
+        if (item.kind === 'divider') {
+            rows.push({top, height: itemHeight('divider'), items: [{item, col: 0}]});
+            top += itemHeight('divider');
+            row = null;
+            return;
+        }
+        if (!row || row.items.length === cols) {
+            row = {top, height: itemHeight('card') + ROW_GAP_PX, items: []};
+            rows.push(row);
+            top += row.height;
         }
+        row.items.push({item, col: row.items.length});
+    });
+
+    virtualGrid.cols = cols;
+    virtualGrid.rows = rows;
+    const grid = document.getElementById('projectGrid');
+    grid.classList.add('virtual-grid');
+    grid.style.height = top + 'px';
+}
+
+function scheduleRender(relayout = false) {
+    if (relayout === true) virtualGrid.relayout = true;
+    if (virtualGrid.frame !== null) return;
+    virtualGrid.frame = requestAnimationFrame(() => {
+        virtualGrid.frame = null;
+        const relayoutNeeded = virtualGrid.relayout;
+        virtualGrid.relayout = false;
+        if (!virtualGrid.message) renderVisible(relayoutNeeded);
+    });
+}
+
+function visibleRows() {
+    // 以二分搜尋找出與可視範圍相交的列
+    const grid = document.getElementById('projectGrid');
+    const gridTop = grid.getBoundingClientRect().top + window.scrollY;
+    const start = window.scrollY - gridTop - OVERSCAN_PX;
+    const end = window.scrollY - gridTop + window.innerHeight + OVERSCAN_PX;
+    const rows = virtualGrid.rows;
+
+    let lo = 0;
+    let hi = rows.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (rows[mid].top + rows[mid].height < start) lo = mid + 1; else hi = mid;
+    }
+    const visible = [];
+    for (let i = lo; i < rows.length && rows[i].top <= end; i++) {
+        visible.push(rows[i]);
+    }
+    return visible;
+}
+
+function renderVisible(relayout = false) {
+    if (relayout) layout();
+    const grid = document.getElementById('projectGrid');
+    const mounted = new Map();
+    const created = [];
+
+    visibleRows().forEach(row => {
+        row.items.forEach(({item, col}) => {
+            // 依鍵重複使用既有元素：篩選或捲動後仍可見的卡片只移動位置
+            let el = virtualGrid.mounted.get(item.key);
+            if (!el) {
+                el = createItemElement(item);
+                created.push(el);
+            }
+            el.style.top = row.top + 'px';
+            el.style.left = item.kind === 'divider' ? '0' : (col * 100 / virtualGrid.cols) + '%';
+            mounted.set(item.key, el);
+        });
+    });
+
+    virtualGrid.mounted.forEach((el, key) => {
+        if (!mounted.has(key)) el.remove();
+    });
+    virtualGrid.mounted = mounted;
+    if (created.length) {
+        const fragment = document.createDocumentFragment();
+        created.forEach(el => fragment.appendChild(el));
+        grid.appendChild(fragment);
+    }
+
+    if (measureHeights(created)) {
+        // 量測到更高的卡片：以新高度重新排列（高度只增不減，最多重排一次即穩定）
+        renderVisible(true);
+        return;
+    }
+    mounted.forEach(el => {
+        const kind = el.dataset.kind;
+        el.style.height = virtualGrid.heights[kind] ? virtualGrid.heights[kind] + 'px' : '';
+    });
+}
+
+function measureHeights(elements) {
+    // 新建立的元素以自然高度量測；同列卡片統一為最高者的高度
+    let changed = false;
+    elements.forEach(el => {
+        const kind = el.dataset.kind;
+        const height = el.offsetHeight;
+        if (height > virtualGrid.heights[kind]) {
+            virtualGrid.heights[kind] = height;
+            changed = true;
+        }
+    });
+    return changed;
+}
+
+function createItemElement(item) {
+    const template = document.createElement('template');
+    template.innerHTML = item.kind === 'divider'
+        ? '<div class="col-12 virtual-item" data-kind="divider"><div class="section-divider"><span>其他專案</span></div></div>'
+        : createCard(item.project).trim();
+    return template.content.firstElementChild;
+}
+
+function unmountAll() {
+    virtualGrid.mounted.forEach(el => el.remove());
+    virtualGrid.mounted.clear();
+}
+
+function invalidateCard(name) {
+    // 專案內容改變：移除舊元素，下次繪製時以新內容建立
+    const el = virtualGrid.mounted.get(name);
+    if (el) {
+        el.remove();
+        virtualGrid.mounted.delete(name);
     }
-    
-    html += others.map(p => createCard(p)).join('');
-    
-    grid.innerHTML = html || '<div class="col-12 text-center text-muted py-5">目前沒有專案</div>';
 }
 
 function createCard(p) {
     const langHtml = Object.entries(p.languages || {})
         .map(([l, pct]) => `<span class="badge lang-badge lang-${l}">${l} ${pct}%</span>`)
         .join(' ');
-    
+
     const tagsHtml = (p.tags || [])
         .map(tag => `<span class="badge tag-badge">${tag}</span>`)
         .join(' ');
 
-    const gitBadgeClass = p.git_status === 'Modified' ? 'bg-warning text-dark' : 
+    const gitBadgeClass = p.git_status === 'Modified' ? 'bg-warning text-dark' :
                          p.git_status === 'Clean' ? 'bg-success' : 'bg-secondary';
 
     return `
-        <div class="col-md-4 mb-4">
+        <div class="col-md-4 virtual-item" data-kind="card" data-name="${p.name}">
             <div class="card h-100 project-card shadow-sm" onclick="showStructure('${p.name}')">
                 <div class="card-body">
                     <div class="d-flex justify-content-between align-items-start mb-2">
                         <h5 class="project-title">${p.name}</h5>
-                        <button class="btn-fav ${p.is_favorite ? 'active' : ''}" 
+                        <button class="btn-fav ${p.is_favorite ? 'active' : ''}"
                                 onclick="event.stopPropagation(); toggleFav('${p.name}')">
                             <i class="bi ${p.is_favorite ? 'bi-star-fill' : 'bi-star'}"></i>
                         </button>
@@ -70,7 +309,9 @@ function createCard(p) {
                         <span class="badge ${gitBadgeClass}">
                             <i class="bi bi-git"></i> ${p.git_status || 'Unknown'}
                         </span>
-                        <button class="btn btn-sm btn-outline-primary" 
+                        ${p.stale ? '<i class="bi bi-hourglass-split text-muted" title="更新中，顯示先前的資料"></i>' : ''}
+                        ${p.degraded ? '<i class="bi bi-cloud-slash text-warning" title="檔案系統無回應，顯示快取資料"></i>' : ''}
+                        <button class="btn btn-sm btn-outline-primary"
                                 onclick="event.stopPropagation(); openVSCode('${p.name}')">
                             <i class="bi bi-code-square"></i> VS Code
                         </button>
@@ -82,12 +323,97 @@ function createCard(p) {
 }
 
 async function toggleFav(name) {
-    await fetch('/api/favorite', {
+    const res = await fetch('/api/favorite', {
         method: 'POST',
         headers: {'Content-Type': 'application/json'},
         body: JSON.stringify({name})
     });
-    fetchProjects();
+    const data = await res.json();
+    // 直接套用回應；稍後到達的 favorite 事件內容相同，不會重複繪製
+    applyEvent('favorite', {name, is_favorite: data.is_favorite});
+}
+
+// ===== 即時更新 =====
+
+function isLive() {
+    return eventSource !== null && eventSource.readyState === EventSource.OPEN;
+}
+
+function connectEvents() {
+    if (!window.EventSource) return;
+    // 斷線時瀏覽器自動重新連線並送出 Last-Event-ID，伺服器補送漏接的事件
+    eventSource = new EventSource('/api/events');
+    ['project', 'removed', 'favorite', 'tag_added', 'tag_removed', 'scan', 'reset'].forEach(type => {
+        eventSource.addEventListener(type, e => applyEvent(type, JSON.parse(e.data)));
+    });
+}
+
+function findProject(name) {
+    return projectIndex.get(name);
+}
+
+function applyEvent(type, data) {
+    if (type === 'reset') {
+        fetchProjects();
+        return;
+    }
+    if (type === 'scan') {
+        // 先前回傳部分結果的專案在掃描完成後重新取得
+        if (allProjects.some(p => p.stale)) fetchProjects();
+        return;
+    }
+
+    const project = findProject(data.name);
+    if (type === 'project') {
+        if (project) {
+            unindexProject(project);
+            Object.assign(project, data, {stale: false, degraded: false});
+            indexProject(project);
+            patchCard(project);
+        } else {
+            const added = {...data, is_favorite: false, tags: []};
+            allProjects.push(added);
+            allProjects.sort((a, b) => a.name.localeCompare(b.name));
+            indexProject(added);
+            rebuildOrder();
+            filterProjects();
+        }
+        updateFilters();
+    } else if (type === 'removed') {
+        if (!project) return;
+        unindexProject(project);
+        allProjects = allProjects.filter(p => p !== project);
+        rebuildOrder();
+        invalidateCard(project.name);
+        filterProjects();
+        updateFilters();
+    } else if (type === 'favorite') {
+        if (!project || project.is_favorite === data.is_favorite) return;
+        project.is_favorite = data.is_favorite;
+        // 收藏專案排在最前面，位置改變時重新排列（不重新取得資料）
+        invalidateCard(project.name);
+        filterProjects(true);
+    } else if (type === 'tag_added' || type === 'tag_removed') {
+        if (!project) return;
+        unindexProject(project);
+        const tags = new Set(project.tags || []);
+        if (type === 'tag_added') tags.add(data.tag); else tags.delete(data.tag);
+        project.tags = [...tags];
+        indexProject(project);
+        patchCard(project);
+        updateFilters();
+    }
+}
+
+function patchCard(project) {
+    invalidateCard(project.name);
+    // 有篩選條件時專案可能因此改變是否符合，重新套用篩選；否則只重建這張卡片
+    const filter = currentFilter();
+    if (filter.term || filter.lang || filter.tag) {
+        filterProjects(true);
+    } else {
+        scheduleRender();
+    }
 }
 
 async function showStructure(name) {
@@ -112,43 +438,73 @@ async function openVSCode(name) {
     await fetch(`/api/open/${name}`);
 }
 
+
 function updateFilters() {
-    allProjects.forEach(p => {
-        Object.keys(p.languages || {}).forEach(lang => allLanguages.add(lang));
-        (p.tags || []).forEach(tag => allTags.add(tag));
-    });
-    
+    // 選項來自用戶端索引；即時事件也會呼叫，重建選項時保留目前的選擇
     const langFilter = document.getElementById('languageFilter');
-    langFilter.innerHTML = '<option value="">所有語言</option>' + 
-        [...allLanguages].sort().map(lang => `<option value="${lang}">${lang}</option>`).join('');
-    
+    const selectedLang = langFilter.value;
+    langFilter.innerHTML = '<option value="">所有語言</option>' +
+        [...languageIndex.keys()].sort().map(lang => `<option value="${lang}">${lang}</option>`).join('');
+    langFilter.value = selectedLang;
+
     const tagFilter = document.getElementById('tagFilter');
-    tagFilter.innerHTML = '<option value="">所有標籤</option>' + 
-        [...allTags].sort().map(tag => `<option value="${tag}">${tag}</option>`).join('');
+    const selectedTag = tagFilter.value;
+    tagFilter.innerHTML = '<option value="">所有標籤</option>' +
+        [...tagIndex.keys()].sort().map(tag => `<option value="${tag}">${tag}</option>`).join('');
+    tagFilter.value = selectedTag;
+}
+
+function debounce(fn, wait) {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), wait);
+    };
 }
 
 function loadFilters() {
-    document.getElementById('searchInput').addEventListener('input', filterProjects);
-    document.getElementById('languageFilter').addEventListener('change', filterProjects);
-    document.getElementById('tagFilter').addEventListener('change', filterProjects);
+    // 輸入停頓後才篩選，連續輸入時不會每個按鍵都重新排列
+    document.getElementById('searchInput').addEventListener('input', debounce(() => filterProjects(), FILTER_DEBOUNCE_MS));
+    document.getElementById('languageFilter').addEventListener('change', () => filterProjects());
+    document.getElementById('tagFilter').addEventListener('change', () => filterProjects());
 }
 
-function filterProjects() {
-    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-    const selectedLang = document.getElementById('languageFilter').value;
-    const selectedTag = document.getElementById('tagFilter').value;
-    
-    const filtered = allProjects.filter(p => {
-        const matchesSearch = !searchTerm || 
-            p.name.toLowerCase().includes(searchTerm) || 
-            p.description.toLowerCase().includes(searchTerm);
-        
-        const matchesLang = !selectedLang || (p.languages && p.languages[selectedLang]);
-        const matchesTag = !selectedTag || (p.tags && p.tags.includes(selectedTag));
-        
-        return matchesSearch && matchesLang && matchesTag;
-    });
-    
+function currentFilter() {
+    return {
+        term: document.getElementById('searchInput').value.toLowerCase(),
+        lang: document.getElementById('languageFilter').value,
+        tag: document.getElementById('tagFilter').value
+    };
+}
+
+function filterProjects(force = false) {
+    const filter = currentFilter();
+    const matchesSearch = p => !filter.term || searchText.get(p.name).includes(filter.term);
+
+    let filtered;
+    if (!force && lastFilter && lastFilter.lang === filter.lang && lastFilter.tag === filter.tag &&
+            filter.term.startsWith(lastFilter.term)) {
+        // 搜尋字串只是加長：符合的專案必定在上次的結果中
+        filtered = lastFilter.results.filter(matchesSearch);
+    } else {
+        // 語言與標籤由索引取得候選集合，從最小的集合開始比對，再依原本的列表順序排列
+        const sets = [];
+        if (filter.lang) sets.push(languageIndex.get(filter.lang) || new Set());
+        if (filter.tag) sets.push(tagIndex.get(filter.tag) || new Set());
+
+        if (sets.length) {
+            sets.sort((a, b) => a.size - b.size);
+            filtered = [...sets[0]]
+                .filter(name => sets.every(set => set.has(name)))
+                .map(name => projectIndex.get(name))
+                .filter(matchesSearch)
+                .sort((a, b) => projectOrder.get(a.name) - projectOrder.get(b.name));
+        } else {
+            filtered = allProjects.filter(matchesSearch);
+        }
+    }
+
+    lastFilter = {...filter, results: filtered};
     renderProjects(filtered);
 }
 
@@ -0,0 +1,73 @@
+"""
+測試共用工具：暫存工作區、Git 倉庫與隔離的 Git 使用者設定
+"""
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, Optional
+from unittest import mock
+
+GIT_IDENTITY = ['-c', 'user.name=Test User', '-c', 'user.email=test@example.com']
+
+
+def git(cwd: Path, *args: str) -> str:
+    """在 cwd 執行 git 指令並回傳標準輸出"""
+    result = subprocess.run(
+        ['git', *GIT_IDENTITY, *args],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def write(path: Path, content: str = ''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+def make_project(root: Path, name: str, files: Optional[Dict[str, str]] = None,
+                 repo: bool = False) -> Path:
+    """
+    建立含 README.md 的專案資料夾
+
+    Args:
+        root: 工作區根目錄
+        name: 專案名稱
+        files: {相對路徑: 內容}（README.md 未指定時自動產生）
+        repo: 是否初始化 Git 倉庫並提交所有檔案
+    """
+    project = root / name
+    files = {'README.md': f'# {name}\n', **(files or {})}
+    for rel_path, content in files.items():
+        write(project / rel_path, content)
+    if repo:
+        git(project, 'init', '-q', '-b', 'main')
+        git(project, 'add', '-A')
+        git(project, 'commit', '-q', '-m', 'initial')
+    return project
+
+
+class WorkspaceTestCase(unittest.TestCase):
+    """
+    提供暫存工作區（self.root）的測試基底
+
+    Git 的使用者與系統設定指向空的暫存目錄，測試結果不受執行環境的設定影響。
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.root = self.tmp / 'workspace'
+        self.root.mkdir()
+
+        home = self.tmp / 'home'
+        home.mkdir()
+        patcher = mock.patch.dict(os.environ, {
+            'HOME': str(home),
+            'XDG_CONFIG_HOME': str(home / '.config'),
+            'GIT_CONFIG_NOSYSTEM': '1'
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
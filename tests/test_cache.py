@@ -0,0 +1,94 @@
+"""
+core/cache.py：LRU 記憶體快取，以及 DatabaseManager 記憶體快取層的一致性
+"""
+import unittest
+
+from core.cache import LRUCache
+from core.database import DatabaseManager
+from core.snapshot import ProjectRecord
+
+from .support import WorkspaceTestCase
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_entries=2, ttl=10, clock=self.clock)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertNotIn('b', self.cache)
+        self.assertEqual((self.cache.get('a'), self.cache.get('c')), (1, 3))
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_ttl(self):
+        self.cache.set('a', 1)
+        self.cache.set('forever', 2, ttl=None)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('forever'), 2)
+        self.assertEqual(self.cache.expirations, 1)
+
+    def test_stats(self):
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('missing')
+        # 成員檢查不計入統計
+        self.assertIn('a', self.cache)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+
+    def test_invalidate_and_disabled(self):
+        self.cache.set_many([('a', 1), ('b', 2)])
+        self.cache.invalidate_many(['a'])
+        self.assertEqual(len(self.cache), 1)
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+        disabled = LRUCache(max_entries=0)
+        disabled.set('a', 1)
+        self.assertEqual(len(disabled), 0)
+
+
+class MemoryTierTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = str(self.tmp / 'dashboard.db')
+        self.db = DatabaseManager(self.path)
+        self.db.cache_records([self.record('Clean')])
+
+    @staticmethod
+    def record(status: str) -> ProjectRecord:
+        return ProjectRecord(name='alpha', path='/ws/alpha', description='Alpha',
+                             has_git=True, git_status=status)
+
+    def test_second_read_hits_memory(self):
+        self.db.get_cached_project('alpha')
+        hits = self.db.memory_cache.hits
+        self.assertEqual(self.db.get_cached_project('alpha')['git_status'][0], 'Clean')
+        self.assertEqual(self.db.memory_cache.hits, hits + 1)
+
+    def test_write_from_other_process_invalidates(self):
+        self.db.get_cached_project('alpha')
+        DatabaseManager(self.path).cache_records([self.record('Modified')])
+        # 下一次一致性檢查時發現世代改變
+        self.db._generation_checked_at = 0.0
+        self.assertEqual(self.db.get_cached_project('alpha')['git_status'][0], 'Modified')
+
+
+if __name__ == '__main__':
+    unittest.main()
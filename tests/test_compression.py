@@ -0,0 +1,78 @@
+"""
+web/compression.py 與 web/static.py：回應壓縮與 Vary: Accept-Encoding
+"""
+import unittest
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from web.compression import CompressionMiddleware
+from web.static import CachedStaticFiles
+
+from .support import WorkspaceTestCase, write
+
+
+def small(request):
+    return JSONResponse({'ok': True})
+
+
+def large(request):
+    return JSONResponse({'items': ['project'] * 500})
+
+
+def image(request):
+    return Response(b'\x89PNG' * 500, media_type='image/png')
+
+
+class CompressionMiddlewareTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        write(self.tmp / 'static' / 'app.js', 'console.log("dashboard");\n')
+        app = Starlette(routes=[
+            Route('/small', small),
+            Route('/large', large),
+            Route('/image', image),
+            Mount('/static', CachedStaticFiles(directory=str(self.tmp / 'static')))
+        ])
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+        self.client = TestClient(app)
+
+    def get(self, url, encoding='gzip', **headers):
+        return self.client.get(url, headers={'Accept-Encoding': encoding, **headers})
+
+    def test_compresses_large_response(self):
+        response = self.get('/large')
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+        self.assertEqual(response.json(), {'items': ['project'] * 500})
+
+    def test_small_response_varies(self):
+        response = self.get('/small')
+        self.assertNotIn('content-encoding', response.headers)
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+
+    def test_uncompressed_for_client_without_gzip(self):
+        response = self.get('/large', encoding='identity')
+        self.assertNotIn('content-encoding', response.headers)
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+
+    def test_binary_response_does_not_vary(self):
+        response = self.get('/image')
+        self.assertNotIn('content-encoding', response.headers)
+        self.assertNotIn('vary', response.headers)
+
+    def test_static_response_varies(self):
+        response = self.get('/static/app.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+
+        revalidated = self.get('/static/app.js', **{'If-None-Match': response.headers['etag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers['vary'], 'Accept-Encoding')
+
+
+if __name__ == '__main__':
+    unittest.main()
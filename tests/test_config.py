@@ -0,0 +1,68 @@
+"""
+core/config.py：三個程式共用的設定預設值、路徑解析與服務建立
+"""
+import os
+import unittest
+from unittest import mock
+
+from core import config
+from core.config import create_services, load_env
+from core.ipc import RemoteWorkspace
+
+from .support import WorkspaceTestCase, make_project, write
+
+
+class LoadEnvTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.base = self.tmp / 'app'
+        self.base.mkdir()
+        patcher = mock.patch.object(config, 'BASE_DIR', self.base)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+
+    def test_defaults_resolve_against_app_directory(self):
+        os.chdir(self.root)
+        loaded = load_env()
+        # 預設掃描程式所在目錄的上層，與啟動時的目前目錄無關
+        self.assertEqual(loaded['SCAN_DIR'], str(self.tmp.resolve()))
+        self.assertEqual(loaded['DB_PATH'], str((self.base / 'project_dashboard.db').resolve()))
+        self.assertEqual(loaded['DAEMON_SOCKET'],
+                         str((self.base / 'project_dashboard.sock').resolve()))
+
+    def test_same_result_from_any_directory(self):
+        write(self.base / '.env', 'SCAN_DIR="../workspace"\nDAEMON_SOCKET=\nIO_TIMEOUT=3\n')
+        os.chdir(self.base)
+        from_app_dir = load_env()
+        os.chdir(self.root)
+        # 目前目錄沒有 .env 時使用程式所在目錄的 .env
+        self.assertEqual(load_env(), from_app_dir)
+        self.assertEqual(from_app_dir['SCAN_DIR'], str(self.root.resolve()))
+        self.assertEqual(from_app_dir['DAEMON_SOCKET'], '')
+        self.assertEqual(from_app_dir['IO_TIMEOUT'], '3')
+
+
+class CreateServicesTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project(self.root, 'alpha')
+        env = self.tmp / '.env'
+        write(env, f'SCAN_DIR={self.root}\nDB_PATH={self.tmp / "dashboard.db"}\n'
+                   f'DAEMON_SOCKET={self.tmp / "daemon.sock"}\nSNAPSHOT_FILE=\n')
+        self.config = load_env(str(env))
+
+    def test_daemon_and_clients_agree_on_scan_path(self):
+        daemon = create_services(self.config, use_daemon=False)
+        client = create_services(self.config)
+        self.assertIs(daemon.workspace, daemon.local_workspace)
+        self.assertIsInstance(client.workspace, RemoteWorkspace)
+        self.assertEqual(client.workspace.scan_path, str(daemon.project_manager.scan_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+core/deadline.py：時間預算，以及 Workspace 預算用盡時回傳的部分結果
+"""
+import threading
+import unittest
+from unittest import mock
+
+from core.database import DatabaseManager
+from core.deadline import Deadline
+from core.project_manager import ProjectManager
+from core.snapshot import ProjectRecord, WorkspaceSnapshot
+from core.workspace import Workspace
+
+from .support import WorkspaceTestCase, make_project
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_remaining_and_expired(self):
+        clock = FakeClock()
+        deadline = Deadline(2, clock=clock)
+        self.assertFalse(deadline.unlimited)
+        self.assertEqual(deadline.remaining(), 2)
+        clock.now += 1.5
+        self.assertEqual(deadline.remaining(), 0.5)
+        self.assertFalse(deadline.expired)
+        clock.now += 1
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired)
+
+    def test_unlimited(self):
+        for budget in (None, 0, -1):
+            deadline = Deadline(budget)
+            self.assertTrue(deadline.unlimited)
+            self.assertIsNone(deadline.remaining())
+            self.assertFalse(deadline.expired)
+            self.assertEqual(deadline.clamp(3), 3)
+
+    def test_clamp(self):
+        deadline = Deadline(2, clock=FakeClock())
+        self.assertEqual(deadline.clamp(5), 2)
+        self.assertEqual(deadline.clamp(1), 1)
+        self.assertEqual(deadline.clamp(None), 2)
+
+    def test_wait(self):
+        event = threading.Event()
+        self.assertFalse(Deadline(0.01).wait(event))
+        event.set()
+        self.assertTrue(Deadline(0.01).wait(event))
+
+
+class PartialSnapshotTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ('alpha', 'beta', 'gamma'):
+            make_project(self.root, name)
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        self.workspace = Workspace(ProjectManager(str(self.root)), self.db, lease_ttl=0)
+        self.release = threading.Event()
+
+    def slow_build(self, on_record=None):
+        """只完成第一個專案，其餘等到 release 才完成"""
+        records = [
+            ProjectRecord(name=name, path=str(self.root / name), description=name.title(),
+                          git_status='Not a Git repo')
+            for name in ('alpha', 'beta', 'gamma')
+        ]
+        on_record(records[0])
+        self.release.wait(5)
+        for record in records[1:]:
+            on_record(record)
+        return WorkspaceSnapshot(records)
+
+    def test_budget_returns_partial_then_full(self):
+        with mock.patch.object(ProjectManager, 'build_snapshot', side_effect=self.slow_build):
+            partial = self.workspace.snapshot(budget=0.05)
+            self.assertEqual(partial.names(), ['alpha', 'beta', 'gamma'])
+            self.assertEqual(partial.stale_names(), ['beta', 'gamma'])
+            self.assertEqual(partial.get('alpha').description, 'Alpha')
+            self.assertEqual(self.workspace.status()['partial_responses'], 1)
+
+            # 掃描在背景完成後取得完整結果
+            self.release.set()
+            full = self.workspace.snapshot()
+        self.assertFalse(full.partial)
+        self.assertEqual(full.get('gamma').description, 'Gamma')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+core/dependencies.py：版本需求比對與依快照世代更新依賴索引
+"""
+import unittest
+
+from core.database import DatabaseManager
+from core.dependencies import DependencyIndex, parse_constraint, spec_satisfies
+from core.project_manager import ProjectManager
+from core.workspace import Workspace
+
+from .support import WorkspaceTestCase, make_project, write
+
+
+class SpecSatisfiesTest(unittest.TestCase):
+
+    def satisfies(self, ecosystem, spec, query):
+        return spec_satisfies(ecosystem, spec, parse_constraint(query))
+
+    def test_open_range_does_not_match_upper_bound(self):
+        self.assertFalse(self.satisfies('pypi', '>=2.0', '<2.30'))
+        self.assertFalse(self.satisfies('pypi', '~=2.28', '<2.30'))
+        self.assertTrue(self.satisfies('pypi', '>=2.0,<2.30', '<2.30'))
+        self.assertTrue(self.satisfies('pypi', '==2.28.*', '<2.30'))
+        self.assertTrue(self.satisfies('pypi', '>=2.31', '>=2.30'))
+
+    def test_bounds_are_compared_numerically(self):
+        self.assertTrue(self.satisfies('pypi', '<2.4', '<2.30'))
+        self.assertFalse(self.satisfies('pypi', '<2.40', '<2.30'))
+        self.assertTrue(self.satisfies('pypi', '<2.30', '<=2.30'))
+        self.assertFalse(self.satisfies('pypi', '<=2.30', '<2.30'))
+
+    def test_caret_and_tilde(self):
+        self.assertTrue(self.satisfies('npm', '^1.2.3', '<2'))
+        self.assertTrue(self.satisfies('npm', '^0.2.3', '<0.3'))
+        self.assertFalse(self.satisfies('npm', '^0.2.3', '<0.2.5'))
+        self.assertTrue(self.satisfies('npm', '~1.2.3', '<1.3'))
+        # Composer 的 ~1.2 代表 >=1.2,<2.0
+        self.assertFalse(self.satisfies('composer', '~1.2', '<1.3'))
+        self.assertTrue(self.satisfies('composer', '~1.2', '<2'))
+        # Cargo 無運算子即 ^
+        self.assertTrue(self.satisfies('cargo', '1.0', '>=1,<2'))
+        self.assertFalse(self.satisfies('cargo', '1.0', '<1.5'))
+
+    def test_alternatives_and_ranges(self):
+        self.assertTrue(self.satisfies('npm', '^1.0 || ^2.0', '<3'))
+        self.assertFalse(self.satisfies('npm', '^1.0 || ^2.0', '<2'))
+        self.assertTrue(self.satisfies('npm', '1.2 - 1.4', '<1.5'))
+        self.assertTrue(self.satisfies('npm', '>= 1.2 < 1.4', '>=1.2,<1.4'))
+        self.assertTrue(self.satisfies('npm', '1.2.x', '<1.3'))
+
+    def test_excluded_version(self):
+        self.assertFalse(self.satisfies('pypi', '>=1.0,<2', '<2,!=1.5'))
+        self.assertTrue(self.satisfies('pypi', '>=1.0,<1.5', '<2,!=1.5'))
+
+    def test_unparsable_spec(self):
+        self.assertFalse(self.satisfies('npm', 'latest', '<2'))
+        self.assertFalse(self.satisfies('pypi', None, '<2'))
+
+
+class DependencyIndexTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project(self.root, 'pinned', {'requirements.txt': 'requests==2.28.1\n'})
+        make_project(self.root, 'ranged', {'requirements.txt': 'requests>=2.0\n'})
+        make_project(self.root, 'capped', {'requirements.txt': 'requests>=2.0,<2.30\n'})
+
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        self.index = DependencyIndex(self.db)
+        self.workspace = Workspace(
+            ProjectManager(str(self.root)), self.db, dependency_index=self.index, lease_ttl=0
+        )
+
+    def dependents(self, version=None):
+        matches = self.index.find_dependents('requests', version=version)
+        return sorted(entry['project'] for entry in matches)
+
+    def test_version_filter(self):
+        self.workspace.snapshot()
+        self.assertEqual(self.dependents(), ['capped', 'pinned', 'ranged'])
+        self.assertEqual(self.dependents('<2.30'), ['capped', 'pinned'])
+        self.assertEqual(self.dependents('>=2.30'), [])
+
+    def test_projects_added_after_first_index(self):
+        self.index.sync(self.workspace.project_manager.build_snapshot())
+        self.assertEqual(len(self.dependents()), 3)
+
+        make_project(self.root, 'late', {'pyproject.toml': (
+            '[project]\nname = "late"\ndependencies = ["requests==2.31.0"]\n'
+        )})
+        # 例如其他行程或常駐程式完成掃描後取得的新快照
+        self.assertEqual(self.index.sync(self.workspace.project_manager.build_snapshot()), 1)
+        self.assertIn('late', self.dependents('>=2.31'))
+
+    def test_sync_once_per_snapshot(self):
+        snapshot = self.workspace.snapshot()
+        write(self.root / 'pinned' / 'requirements.txt', 'requests==2.31.0\n')
+        # 同一份快照不再比對指紋
+        self.assertEqual(self.index.sync(snapshot), 0)
+        self.assertEqual(self.dependents('<2.30'), ['capped', 'pinned'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+core/events.py：資料庫觸發器產生的即時事件、分送與斷線重連時的補送
+"""
+import asyncio
+import json
+import unittest
+
+from core.database import DatabaseManager
+from core.events import EventBus
+from core.snapshot import ProjectRecord
+
+from .support import WorkspaceTestCase
+
+
+class EventTriggerTest(WorkspaceTestCase):
+
+    def test_writes_produce_events(self):
+        db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        db.add_favorite('alpha')
+        db.add_tag('alpha', 'Web')
+        db.remove_favorite('alpha')
+        db.record_scan(3, 40)
+
+        events = db.get_events_since(0)
+        self.assertEqual([event['type'] for event in events],
+                         ['favorite', 'tag_added', 'favorite', 'scan'])
+        self.assertEqual(json.loads(events[1]['data']), {'name': 'alpha', 'tag': 'web'})
+        self.assertFalse(json.loads(events[2]['data'])['is_favorite'])
+        self.assertEqual(db.get_event_bounds(), (1, 4))
+
+    def test_recached_project_is_not_pushed_again(self):
+        db = DatabaseManager(str(self.tmp / 'dashboard.db'), cache_max_rows=0)
+
+        def project_events(description='Alpha'):
+            after = db.get_event_bounds()[1] or 0
+            db.cache_records([ProjectRecord(name='alpha', path='/ws/alpha',
+                                            description=description)])
+            return [event['type'] for event in db.get_events_since(after)]
+
+        self.assertEqual(project_events(), ['project'])
+        # 淘汰後以相同內容重新寫入：不推送；內容改變時推送
+        self.assertEqual(db.enforce_cache_limits(), 1)
+        self.assertEqual(project_events(), [])
+        db.enforce_cache_limits()
+        self.assertEqual(project_events('Alpha v2'), ['project'])
+        # 專案移除後再出現時視為新專案
+        db.prune_missing_projects([])
+        self.assertEqual(project_events('Alpha v2'), ['project'])
+
+
+class EventBusTest(WorkspaceTestCase, unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        self.bus = EventBus(self.db, poll_interval=0.01, backlog=3)
+        self.addCleanup(self.bus.close)
+
+    async def next_batch(self, subscription):
+        batch = await subscription.get(timeout=2)
+        self.assertTrue(batch, '未在時限內收到事件')
+        return batch
+
+    async def test_delivers_new_events(self):
+        self.db.add_tag('alpha', 'old')
+        subscription = self.bus.subscribe()
+        self.db.add_tag('alpha', 'web')
+
+        batch = await self.next_batch(subscription)
+        # 訂閱前的事件不重送
+        self.assertEqual([(e['type'], e['project']) for e in batch], [('tag_added', 'alpha')])
+        self.assertTrue(self.bus.stats()['polling'])
+        subscription.close()
+        self.assertEqual(self.bus.stats()['subscribers'], 0)
+
+    async def test_replays_missed_events(self):
+        self.db.add_tag('alpha', 'a')
+        self.db.add_tag('alpha', 'b')
+        self.db.add_tag('alpha', 'c')
+
+        subscription = self.bus.subscribe(last_id=1)
+        batch = await self.next_batch(subscription)
+        self.assertEqual([event['id'] for event in batch], [2, 3])
+        subscription.close()
+
+    async def test_reset_when_too_far_behind(self):
+        for tag in ('a', 'b', 'c', 'd', 'e'):
+            self.db.add_tag('alpha', tag)
+
+        subscription = self.bus.subscribe(last_id=0)
+        batch = await self.next_batch(subscription)
+        self.assertEqual([(event['type'], event['id']) for event in batch], [('reset', 5)])
+        subscription.close()
+
+    async def test_polling_stops_without_subscribers(self):
+        self.bus.subscribe().close()
+        for _ in range(200):
+            if not self.bus.stats()['polling']:
+                break
+            await asyncio.sleep(0.01)
+        self.assertFalse(self.bus.stats()['polling'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+GIT_BACKEND=index 時快照與 Git 中繼資料由行程內讀取器收集，無法判斷時才退回 git 子程序
+"""
+import unittest
+from unittest import mock
+
+from core.git_index import Undecidable, read_git_metadata
+from core.git_metadata import collect_git_metadata
+from core.procgov import governor
+from core.project_manager import ProjectManager
+
+from .support import WorkspaceTestCase, git, make_project, write
+
+
+class GitBackendTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.clean = make_project(self.root, 'clean', {'main.py': 'print(1)\n'}, repo=True)
+        self.dirty = make_project(self.root, 'dirty', {'main.py': 'print(1)\n'}, repo=True)
+        write(self.dirty / 'main.py', 'print(2)\n')
+        make_project(self.root, 'plain')
+
+    def git_commands(self, fn):
+        """執行 fn 並回傳經由子程序閘門啟動的 git 子指令"""
+        commands = []
+        original = governor.run
+
+        def run(args, *posargs, **kwargs):
+            commands.append(args[1])
+            return original(args, *posargs, **kwargs)
+
+        with mock.patch.object(governor, 'run', side_effect=run):
+            result = fn()
+        return result, commands
+
+    def test_snapshot_does_not_spawn_git_status(self):
+        manager = ProjectManager(str(self.root), git_backend='index')
+        snapshot, commands = self.git_commands(manager.build_snapshot)
+
+        self.assertEqual(commands, [])
+        self.assertEqual(snapshot.get('clean').git_status, 'Clean')
+        self.assertEqual(snapshot.get('dirty').git_status, 'Modified')
+        self.assertEqual(snapshot.get('plain').git_status, 'Not a Git repo')
+        self.assertEqual(manager.git_backend_stats()['index'], 2)
+
+    def test_subprocess_backend_spawns_git(self):
+        manager = ProjectManager(str(self.root), git_backend='subprocess')
+        _, commands = self.git_commands(manager.build_snapshot)
+        self.assertEqual(commands.count('status'), 2)
+
+    def test_undecidable_falls_back_to_porcelain(self):
+        write(self.clean / 'staged.py', 'STAGED = 1\n')
+        git(self.clean, 'add', 'staged.py')
+        manager = ProjectManager(str(self.root), git_backend='index')
+
+        metadata, commands = self.git_commands(lambda: manager.get_git_metadata(self.clean))
+        self.assertIn('status', commands)
+        self.assertEqual(metadata, collect_git_metadata(self.clean))
+        self.assertEqual(manager.git_backend_stats()['fallback'], 1)
+
+    def test_metadata_matches_subprocess(self):
+        self.assertEqual(read_git_metadata(self.clean), collect_git_metadata(self.clean))
+        self.assertEqual(read_git_metadata(self.dirty), collect_git_metadata(self.dirty))
+
+    def test_metadata_with_upstream(self):
+        remote = self.tmp / 'remote.git'
+        git(self.tmp, 'init', '-q', '--bare', str(remote))
+        git(self.clean, 'remote', 'add', 'origin', str(remote))
+        git(self.clean, 'push', '-q', '-u', 'origin', 'main')
+
+        metadata = read_git_metadata(self.clean)
+        self.assertEqual((metadata.upstream, metadata.ahead, metadata.behind), ('origin/main', 0, 0))
+        self.assertEqual(metadata, collect_git_metadata(self.clean))
+
+        # 上游分支已刪除：只有上游名稱
+        git(self.clean, 'update-ref', '-d', 'refs/remotes/origin/main')
+        self.assertEqual(read_git_metadata(self.clean), collect_git_metadata(self.clean))
+
+    def test_diverged_upstream_is_undecidable(self):
+        remote = self.tmp / 'remote.git'
+        git(self.tmp, 'init', '-q', '--bare', str(remote))
+        git(self.clean, 'remote', 'add', 'origin', str(remote))
+        git(self.clean, 'push', '-q', '-u', 'origin', 'main')
+        git(self.clean, 'commit', '-q', '--allow-empty', '-m', 'ahead')
+
+        with self.assertRaises(Undecidable):
+            read_git_metadata(self.clean)
+
+    def test_detached_head(self):
+        git(self.clean, 'checkout', '-q', '--detach')
+        metadata = read_git_metadata(self.clean)
+        self.assertIsNone(metadata.branch)
+        self.assertEqual(metadata, collect_git_metadata(self.clean))
+
+
+if __name__ == '__main__':
+    unittest.main()
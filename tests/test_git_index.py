@@ -0,0 +1,133 @@
+"""
+core/git_index.py 與 parse_porcelain_v2 的結果需與 git status 一致
+"""
+import os
+import time
+import unittest
+
+from core.git_index import Undecidable, read_git_status
+from core.git_metadata import collect_git_metadata, parse_porcelain_v2
+from core.project_manager import ProjectManager
+
+from .support import WorkspaceTestCase, git, make_project, write
+
+
+def porcelain_status(project):
+    """以 git status --porcelain 計算的 (狀態, 詳細訊息)"""
+    lines = [line for line in git(project, 'status', '--porcelain').splitlines() if line]
+    if lines:
+        return ('Modified', f'{len(lines)} file(s) changed')
+    return ('Clean', 'No changes')
+
+
+class GitIndexStatusTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project(self.root, 'repo', {
+            'src/app.py': 'print("hello")\n',
+            'src/util.py': 'VALUE = 1\n',
+            '.gitignore': '*.log\nbuild/\n'
+        }, repo=True)
+
+    def assert_matches_git(self, expected_status):
+        # 先讀取索引：git status 可能會更新索引中的 stat 資料
+        ours = read_git_status(self.project)
+        self.assertEqual(ours, porcelain_status(self.project))
+        self.assertEqual(ours[0], expected_status)
+
+    def test_clean(self):
+        self.assert_matches_git('Clean')
+
+    def test_clean_with_refreshed_stat(self):
+        # 檔案早於索引寫入時間：以 stat 比對判斷，不需計算雜湊
+        past = time.time() - 60
+        for path in ('README.md', '.gitignore', 'src/app.py', 'src/util.py'):
+            os.utime(self.project / path, (past, past))
+        git(self.project, 'update-index', '--really-refresh')
+        self.assert_matches_git('Clean')
+
+    def test_modified(self):
+        write(self.project / 'src/app.py', 'print("changed")\n')
+        self.assert_matches_git('Modified')
+
+    def test_modified_same_size(self):
+        write(self.project / 'src/util.py', 'VALUE = 2\n')
+        self.assert_matches_git('Modified')
+
+    def test_untracked(self):
+        write(self.project / 'notes.txt', 'todo\n')
+        write(self.project / 'docs/guide.md', '# guide\n')
+        self.assert_matches_git('Modified')
+        self.assertEqual(read_git_status(self.project)[1], '2 file(s) changed')
+
+    def test_ignored(self):
+        write(self.project / 'debug.log', 'trace\n')
+        write(self.project / 'build/output.bin', 'binary\n')
+        self.assert_matches_git('Clean')
+
+    def test_deleted(self):
+        (self.project / 'src/util.py').unlink()
+        self.assert_matches_git('Modified')
+
+    def test_staged_is_undecidable(self):
+        # 暫存區與 HEAD 不同時行程內無法判斷，由子程序處理
+        write(self.project / 'src/new.py', 'NEW = True\n')
+        git(self.project, 'add', 'src/new.py')
+        with self.assertRaises(Undecidable):
+            read_git_status(self.project)
+
+        manager = ProjectManager(str(self.root), git_backend='index')
+        self.assertEqual(manager.get_git_status(self.project), porcelain_status(self.project))
+        self.assertEqual(manager.git_backend_stats()['fallback'], 1)
+
+    def test_reader_errors_are_counted(self):
+        manager = ProjectManager(str(self.root), git_backend='index')
+
+        def broken(project_path):
+            raise ValueError('corrupt index')
+
+        self.assertIsNone(manager._read_git_index(broken, self.project))
+        stats = manager.git_backend_stats()
+        self.assertEqual((stats['errors'], stats['fallback'], stats['index']), (1, 0, 0))
+
+
+class ParsePorcelainV2Test(WorkspaceTestCase):
+
+    def test_parse_output(self):
+        parsed = parse_porcelain_v2(
+            '# branch.oid 0123456789abcdef0123456789abcdef01234567\n'
+            '# branch.head main\n'
+            '# branch.upstream origin/main\n'
+            '# branch.ab +2 -1\n'
+            '1 .M N... 100644 100644 100644 abc abc src/app.py\n'
+            '? notes.txt\n'
+        )
+        self.assertEqual(parsed, {
+            'branch': 'main', 'upstream': 'origin/main', 'ahead': 2, 'behind': 1, 'changed': 2
+        })
+
+    def test_detached_head(self):
+        parsed = parse_porcelain_v2('# branch.oid abc\n# branch.head (detached)\n')
+        self.assertIsNone(parsed['branch'])
+        self.assertEqual(parsed['changed'], 0)
+
+    def test_matches_git_status(self):
+        project = make_project(self.root, 'repo', {'a.py': 'A = 1\n', 'b.py': 'B = 1\n'}, repo=True)
+        write(project / 'a.py', 'A = 2\n')
+        (project / 'b.py').unlink()
+        write(project / 'c.py', 'C = 1\n')
+        write(project / 'd.py', 'D = 1\n')
+        git(project, 'add', 'd.py')
+
+        parsed = parse_porcelain_v2(git(project, 'status', '--porcelain=v2', '--branch'))
+        self.assertEqual(parsed['branch'], 'main')
+        self.assertEqual(parsed['changed'], len(git(project, 'status', '--porcelain').splitlines()))
+
+        metadata = collect_git_metadata(project)
+        self.assertEqual((metadata.status, metadata.detail), porcelain_status(project))
+        self.assertEqual(metadata.last_commit_author, 'Test User')
+
+
+if __name__ == '__main__':
+    unittest.main()
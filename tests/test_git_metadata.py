@@ -0,0 +1,95 @@
+"""
+core/git_metadata.py：分支、上游、ahead/behind 與最後提交的收集
+"""
+import subprocess
+import unittest
+from unittest import mock
+
+from core.git_metadata import NOT_A_REPO, TIMEOUT_DETAIL, collect_git_metadata
+from core.procgov import BACKGROUND, governor
+from core.project_manager import ProjectManager
+
+from .support import WorkspaceTestCase, git, make_project, write
+
+
+class CollectGitMetadataTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project(self.root, 'repo', {'main.py': 'print(1)\n'}, repo=True)
+
+    def test_clean_repo(self):
+        metadata = collect_git_metadata(self.project)
+        self.assertEqual((metadata.status, metadata.detail), ('Clean', 'No changes'))
+        self.assertEqual(metadata.branch, 'main')
+        self.assertIsNone(metadata.upstream)
+        self.assertEqual(metadata.last_commit_author, 'Test User')
+        self.assertIsInstance(metadata.last_commit_at, int)
+
+    def test_ahead_and_behind(self):
+        remote = self.tmp / 'remote.git'
+        git(self.tmp, 'init', '-q', '--bare', '-b', 'main', str(remote))
+        git(self.project, 'remote', 'add', 'origin', str(remote))
+        git(self.project, 'push', '-q', '-u', 'origin', 'main')
+
+        other = self.tmp / 'other'
+        git(self.tmp, 'clone', '-q', str(remote), str(other))
+        write(other / 'remote.py', 'REMOTE = 1\n')
+        git(other, 'add', 'remote.py')
+        git(other, 'commit', '-q', '-m', 'remote change')
+        git(other, 'push', '-q')
+        git(self.project, 'fetch', '-q')
+        git(self.project, 'commit', '-q', '--allow-empty', '-m', 'local change')
+
+        metadata = collect_git_metadata(self.project)
+        self.assertEqual((metadata.upstream, metadata.ahead, metadata.behind),
+                         ('origin/main', 1, 1))
+
+    def test_repo_without_commits(self):
+        empty = self.root / 'empty'
+        empty.mkdir()
+        git(empty, 'init', '-q', '-b', 'main')
+        write(empty / 'draft.py', 'DRAFT = 1\n')
+
+        metadata = collect_git_metadata(empty)
+        self.assertEqual(metadata.status, 'Modified')
+        self.assertIsNone(metadata.last_commit_at)
+        self.assertIsNone(metadata.last_commit_author)
+
+    def test_not_a_repo(self):
+        self.assertIs(collect_git_metadata(make_project(self.root, 'plain')), NOT_A_REPO)
+
+    def test_timeout(self):
+        timeout = subprocess.TimeoutExpired(['git', 'status'], 5)
+        with mock.patch.object(governor, 'run', side_effect=timeout):
+            metadata = collect_git_metadata(self.project)
+        self.assertEqual((metadata.status, metadata.detail), ('Error', TIMEOUT_DETAIL))
+
+
+
+class BatchGitMetadataTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project(self.root, 'repo', {'main.py': 'print(1)\n'}, repo=True)
+        self.plain = make_project(self.root, 'plain')
+        self.manager = ProjectManager(str(self.root), git_workers=2)
+
+    def test_batch(self):
+        results = self.manager.batch_git_metadata([self.project, self.plain])
+        self.assertEqual(results[str(self.project)], collect_git_metadata(self.project))
+        self.assertIs(results[str(self.plain)], NOT_A_REPO)
+        self.assertEqual(self.manager.batch_git_metadata([]), {})
+
+    def test_batch_uses_background_priority_and_reports_timeouts(self):
+        timeout = subprocess.TimeoutExpired(['git', 'status'], 5)
+        with mock.patch.object(governor, 'run', side_effect=timeout) as run:
+            results = self.manager.batch_git_metadata([self.project])
+        self.assertEqual(results[str(self.project)].detail, TIMEOUT_DETAIL)
+        self.assertEqual(run.call_args.kwargs['priority'], BACKGROUND)
+        breaker = {b['key']: b for b in self.manager.health.stats()['breakers']}
+        self.assertEqual(breaker['project:repo']['last_error'], 'git timeout')
+
+
+if __name__ == '__main__':
+    unittest.main()
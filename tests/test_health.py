@@ -0,0 +1,155 @@
+"""
+core/health.py：斷路器狀態轉換與依專案／掛載點隔離的檔案系統操作
+"""
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import health
+from core.health import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, IOHealth, IOUnavailable, Progress
+)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('mount:/nfs', threshold=2, base_backoff=10, max_backoff=25)
+
+    def trip(self, now):
+        for _ in range(self.breaker.threshold):
+            self.breaker.record_failure(0.5, 'timeout', now)
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure(0.5, 'timeout', now=0)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow(0))
+        self.breaker.record_failure(0.5, 'timeout', now=0)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow(9))
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure(0.5, 'timeout', now=0)
+        self.breaker.record_success(0.01)
+        self.breaker.record_failure(0.5, 'timeout', now=0)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_allows_single_trial(self):
+        self.trip(now=0)
+        self.assertTrue(self.breaker.allow(10))
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # 試探進行中：其他呼叫仍被拒絕
+        self.assertFalse(self.breaker.allow(10))
+        self.breaker.record_success(0.01)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow(10))
+
+    def test_failed_trial_doubles_backoff(self):
+        self.trip(now=0)
+        self.breaker.allow(10)
+        self.breaker.record_failure(0.5, 'timeout', now=10)
+        self.assertEqual((self.breaker.state, self.breaker.retry_at), (OPEN, 30))
+        self.breaker.allow(30)
+        self.breaker.record_failure(0.5, 'timeout', now=30)
+        # 退避上限 max_backoff
+        self.assertEqual(self.breaker.retry_at, 55)
+        self.assertEqual(self.breaker.to_dict(now=50)['retry_in'], 5)
+
+
+class IOHealthTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        with mock.patch.object(health, 'read_mount_points', return_value=['/mnt/nfs', '/']):
+            self.health = IOHealth(timeout=0.02, threshold=1, base_backoff=30, clock=self.clock)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def stall(self, name):
+        with self.assertRaises(IOUnavailable):
+            self.health.call(name, Path(f'/mnt/nfs/{name}'), lambda: self.release.wait(5))
+
+    def test_mount_of(self):
+        self.assertEqual(self.health.mount_of(Path('/mnt/nfs/alpha')), '/mnt/nfs')
+        self.assertEqual(self.health.mount_of(Path('/mnt/nfsother')), '/')
+        self.assertEqual(self.health.mount_of(Path('/home/me/alpha')), '/')
+
+    def test_timeout_isolates_mount(self):
+        self.stall('alpha')
+        # 同一掛載點的其他專案也暫停存取，其他掛載點不受影響
+        self.assertFalse(self.health.available('beta', Path('/mnt/nfs/beta')))
+        with self.assertRaises(IOUnavailable) as raised:
+            self.health.call('beta', Path('/mnt/nfs/beta'), lambda: 'ok')
+        self.assertEqual(raised.exception.key, 'mount:/mnt/nfs')
+        self.assertEqual(self.health.call('local', Path('/home/me/local'), lambda: 'ok'), 'ok')
+        self.assertEqual(self.health.stats()['open'], 2)
+
+    def test_recovers_after_backoff(self):
+        self.stall('alpha')
+        self.clock.now += 30
+        self.assertEqual(self.health.call('alpha', Path('/mnt/nfs/alpha'), lambda: 'ok'), 'ok')
+        self.assertEqual(self.health.stats()['open'], 0)
+
+    def test_errors_within_timeout_are_not_failures(self):
+        def missing():
+            raise FileNotFoundError('README.md')
+
+        with self.assertRaises(FileNotFoundError):
+            self.health.call('alpha', Path('/mnt/nfs/alpha'), missing)
+        self.assertTrue(self.health.available('alpha', Path('/mnt/nfs/alpha')))
+
+    def test_progress_extends_timeout(self):
+        progress = Progress()
+
+        def walk():
+            # 每一步都在時限內完成，總時間超過時限
+            for _ in range(10):
+                time.sleep(0.005)
+                progress.tick()
+            return 'walked'
+
+        self.assertEqual(
+            self.health.call('big', Path('/home/me/big'), walk, timeout=0.015, progress=progress),
+            'walked'
+        )
+        self.assertEqual(self.health.stats()['timeouts'], 0)
+
+    def test_timeout_error_from_operation_is_not_io_timeout(self):
+        def fails():
+            raise TimeoutError('waiting for shared scan')
+
+        with self.assertRaises(TimeoutError):
+            self.health.call('alpha', Path('/mnt/nfs/alpha'), fails)
+        self.assertEqual(self.health.stats()['timeouts'], 0)
+        self.assertTrue(self.health.available('alpha', Path('/mnt/nfs/alpha')))
+
+    def test_threads_are_bounded_and_reused(self):
+        for _ in range(20):
+            self.health.call('local', Path('/home/me/local'), lambda: 'ok')
+        self.assertEqual(self.health.stats()['threads'], 1)
+
+    def test_queued_call_is_not_charged(self):
+        with mock.patch.object(health, 'read_mount_points', return_value=['/mnt/nfs', '/']):
+            single = IOHealth(timeout=0.02, threshold=1, clock=self.clock, max_workers=1)
+        with self.assertRaises(IOUnavailable):
+            single.call('alpha', Path('/mnt/nfs/alpha'), lambda: self.release.wait(5))
+        # 唯一的執行緒仍卡在停滯的掛載點上：其他掛載點的操作無法開始，但不計為失敗
+        with self.assertRaises(IOUnavailable):
+            single.call('local', Path('/home/me/local'), lambda: 'ok')
+        self.assertTrue(single.available('local', Path('/home/me/local')))
+        self.assertEqual((single.stats()['timeouts'], single.stats()['saturated']), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
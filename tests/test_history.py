@@ -0,0 +1,83 @@
+"""
+core/history.py 與 DatabaseManager 的專案狀態時間序列：去重、心跳、持續時間與降採樣
+"""
+import unittest
+
+from core.database import DatabaseManager
+from core.history import HEARTBEAT_SECONDS, decode_git_state, encode_git_state, modified_count
+from core.snapshot import ProjectRecord
+
+from .support import WorkspaceTestCase
+
+DAY = 86400
+# 對齊 UTC 午夜的起始時間，讓降採樣的日界線固定
+START = 1_700_006_400
+
+
+def record(status, detail: str = 'No changes') -> ProjectRecord:
+    return ProjectRecord(name='alpha', path='/ws/alpha', description='',
+                         languages=(('Python', 100),), has_git=True,
+                         git_status=status, git_detail=detail)
+
+
+class HistoryEncodingTest(unittest.TestCase):
+
+    def test_git_state_codes(self):
+        self.assertEqual(decode_git_state(encode_git_state('Modified')), 'Modified')
+        self.assertEqual(encode_git_state(None), 0)
+        self.assertEqual(decode_git_state(99), 'Unknown')
+
+    def test_modified_count(self):
+        self.assertEqual(modified_count('12 file(s) changed'), 12)
+        self.assertEqual(modified_count('No changes'), 0)
+        self.assertEqual(modified_count(None), 0)
+
+
+class ProjectHistoryTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+
+    def test_unchanged_state_is_not_repeated(self):
+        self.assertEqual(self.db.record_history([record('Clean')], now=START), 1)
+        self.assertEqual(self.db.record_history([record('Clean')], now=START + 60), 0)
+        # 心跳：同一狀態超過間隔仍寫入一筆
+        later = START + HEARTBEAT_SECONDS
+        self.assertEqual(self.db.record_history([record('Clean')], now=later), 1)
+        # 未收集 Git 狀態的記錄不寫入
+        self.assertEqual(self.db.record_history([record(None)], now=later + 60), 0)
+
+    def test_state_changes_and_duration(self):
+        self.db.record_history([record('Clean')], now=START)
+        self.db.record_history([record('Modified', '2 file(s) changed')], now=START + DAY)
+        self.db.record_history([record('Modified', '3 file(s) changed')], now=START + 2 * DAY)
+
+        history = self.db.get_project_history('alpha')
+        self.assertEqual([row['git_status'] for row in history], ['Clean', 'Modified', 'Modified'])
+        self.assertEqual([row['modified_count'] for row in history], [0, 2, 3])
+        self.assertEqual(history[-1]['state_since'], START + DAY)
+        self.assertEqual(history[0]['languages'], {'Python': 100})
+
+        now = START + 3 * DAY
+        stuck = self.db.find_projects_in_state('Modified', min_days=1, now=now)
+        self.assertEqual([(row['name'], row['days']) for row in stuck], [('alpha', 2.0)])
+        self.assertEqual(self.db.find_projects_in_state('Modified', min_days=5, now=now), [])
+
+    def test_prune_downsamples_old_days(self):
+        for hour in range(3):
+            detail = f'{hour + 1} file(s) changed'
+            self.db.record_history([record('Modified', detail)], now=START + hour * 3600)
+
+        deleted = self.db.prune_history(now=START + 40 * DAY)
+        self.assertEqual(deleted, 2)
+        history = self.db.get_project_history('alpha')
+        self.assertEqual([row['modified_count'] for row in history], [3])
+        self.assertEqual(history[0]['state_since'], START)
+
+        self.assertEqual(self.db.prune_history(retention_days=30, now=START + 40 * DAY), 1)
+        self.assertEqual(self.db.get_project_history('alpha'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+core/ipc.py：快照編碼與 RemoteWorkspace 對常駐程式掃描路徑的確認
+"""
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from core import ipc
+from core.ipc import RemoteWorkspace, decode_snapshot, encode_snapshot
+from core.serialization import dumps, loads
+from core.snapshot import ProjectRecord, WorkspaceSnapshot
+from scan_daemon import build_methods
+
+from .support import WorkspaceTestCase
+
+
+def sample_snapshot(prefix: str = 'p') -> WorkspaceSnapshot:
+    return WorkspaceSnapshot([
+        ProjectRecord(
+            name=f'{prefix}-alpha', path=f'/ws/{prefix}-alpha', description='Alpha',
+            languages=(('Python', 80), ('Shell', 20)), has_git=True,
+            git_status='Modified', git_detail='2 file(s) changed', branch='main',
+            upstream='origin/main', ahead=1, behind=0, last_commit_at=1700000000,
+            last_commit_author='Test User'
+        ),
+        ProjectRecord(name=f'{prefix}-beta', path=f'/ws/{prefix}-beta', description='Beta',
+                      stale=True)
+    ], created_at=1700000123.5)
+
+
+class FakeWorkspace:
+    """只提供常駐程式方法所需介面的 Workspace"""
+
+    def __init__(self, scan_path: Path, snapshot: WorkspaceSnapshot):
+        self.project_manager = SimpleNamespace(scan_path=scan_path)
+        self._snapshot = snapshot
+        self.snapshot_calls = 0
+
+    def snapshot(self, refresh=False, budget=None):
+        self.snapshot_calls += 1
+        return self._snapshot
+
+    def invalidate(self):
+        pass
+
+    def status(self):
+        return {'local': True}
+
+
+class EncodeSnapshotTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        snapshot = sample_snapshot()
+        # 經過與 socket 相同的 JSON 序列化
+        decoded = decode_snapshot(loads(dumps(encode_snapshot(snapshot, '/ws'))))
+        self.assertEqual(list(decoded), list(snapshot))
+        self.assertEqual(decoded.created_at, snapshot.created_at)
+        self.assertEqual(decoded.get('p-alpha').language_map, {'Python': 80, 'Shell': 20})
+
+
+class RemoteWorkspaceTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.socket_path = self.tmp / 'daemon.sock'
+        self.socket_path.touch()
+        self.local = FakeWorkspace(self.root.resolve(), sample_snapshot('local'))
+
+    def connect(self, daemon_root: Path) -> RemoteWorkspace:
+        """以 daemon_root 為掃描路徑的常駐程式（直接呼叫方法，不經過 socket）"""
+        methods = build_methods(
+            FakeWorkspace(daemon_root, sample_snapshot('daemon')),
+            SimpleNamespace(get_generation=lambda: 1)
+        )
+
+        def call(socket_path, method, params=None, timeout=30):
+            return loads(dumps(methods[method](**(params or {}))))
+
+        patcher = mock.patch.object(ipc, 'call', side_effect=call)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return RemoteWorkspace(str(self.socket_path), self.local)
+
+    def test_uses_daemon_with_same_scan_path(self):
+        remote = self.connect(self.root.resolve())
+        self.assertEqual(remote.snapshot().names(), ['daemon-alpha', 'daemon-beta'])
+        # 第二次呼叫：快照未變，沿用既有物件
+        first = remote.snapshot()
+        self.assertIs(remote.snapshot(), first)
+        self.assertEqual(self.local.snapshot_calls, 0)
+
+    def test_refuses_daemon_with_other_scan_path(self):
+        remote = self.connect(self.tmp / 'elsewhere')
+        with mock.patch('builtins.print'):
+            snapshot = remote.snapshot()
+        self.assertEqual(snapshot.names(), ['local-alpha', 'local-beta'])
+        self.assertEqual(self.local.snapshot_calls, 1)
+        self.assertFalse(remote.connected)
+        self.assertIsNone(remote.status()['daemon'])
+
+    def test_refuses_snapshot_without_scan_path(self):
+        remote = self.connect(self.root.resolve())
+        remote.snapshot()
+        # 常駐程式以舊版重新啟動：快照不帶掃描路徑
+        payload = encode_snapshot(sample_snapshot('old'))
+        with mock.patch.object(ipc, 'call', return_value=payload), mock.patch('builtins.print'):
+            remote._verified = True
+            self.assertEqual(remote.snapshot().names(), ['local-alpha', 'local-beta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+core/migrations.py：依 PRAGMA user_version 套用遷移，舊版資料庫升級後保留使用者資料
+"""
+import sqlite3
+import unittest
+
+from core.database import MIGRATIONS, SCHEMA_VERSION, DatabaseManager
+from core.migrations import Migration, current_version, migrate, validate
+
+from .support import WorkspaceTestCase
+
+# 加入遷移機制前（user_version = 0）的資料庫結構
+BASELINE_SCHEMA = '''
+CREATE TABLE favorites (
+    name TEXT PRIMARY KEY,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    order_index INTEGER DEFAULT 0,
+    notes TEXT
+);
+CREATE TABLE project_cache (
+    name TEXT PRIMARY KEY,
+    description TEXT,
+    languages JSON,
+    git_status TEXT,
+    git_detail TEXT,
+    has_git BOOLEAN,
+    last_scan TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE project_tags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_name TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(project_name, tag)
+);
+CREATE TABLE scan_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    projects_found INTEGER,
+    scan_duration_ms INTEGER
+);
+CREATE INDEX idx_favorites_order ON favorites(order_index);
+CREATE INDEX idx_cache_last_scan ON project_cache(last_scan);
+CREATE INDEX idx_tags_project ON project_tags(project_name);
+'''
+
+
+def columns(conn: sqlite3.Connection, table: str):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+class BaselineUpgradeTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = str(self.tmp / 'dashboard.db')
+        with sqlite3.connect(self.path) as conn:
+            conn.executescript(BASELINE_SCHEMA)
+            conn.execute(
+                "INSERT INTO favorites (name, order_index, notes) VALUES ('alpha', 1, '主要專案')"
+            )
+            conn.execute("INSERT INTO favorites (name, order_index) VALUES ('beta', 0)")
+            conn.executemany(
+                "INSERT INTO project_tags (project_name, tag) VALUES (?, ?)",
+                [('alpha', 'web'), ('alpha', 'python'), ('gamma', 'archived')]
+            )
+            conn.execute(
+                "INSERT INTO project_cache (name, description, languages, git_status, git_detail,"
+                " has_git) VALUES ('alpha', 'Alpha', '{\"Python\": 100}', 'Clean', 'No changes', 1)"
+            )
+            conn.execute("INSERT INTO scan_history (projects_found, scan_duration_ms) VALUES (3, 40)")
+        conn.close()
+
+    def test_upgrade_keeps_tags_and_favorites(self):
+        db = DatabaseManager(self.path)
+
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(current_version(conn), SCHEMA_VERSION)
+            self.assertIn('folders_without_readme', columns(conn, 'scan_history'))
+            self.assertIn('branch', columns(conn, 'project_cache'))
+            # 既有快取列視為已推送，升級後首次掃描不會為每個專案產生事件
+            known = conn.execute("SELECT name FROM known_projects").fetchall()
+            self.assertEqual(known, [('alpha',)])
+        conn.close()
+
+        self.assertEqual(db.get_favorites(), ['beta', 'alpha'])
+        self.assertEqual(db.get_project_tags('alpha'), ['python', 'web'])
+        self.assertEqual(db.get_project_tags('gamma'), ['archived'])
+        self.assertEqual(
+            [row['name'] for row in db.search_by_tags(all_tags=['web', 'python'])], ['alpha']
+        )
+        self.assertEqual(db.get_last_scan()['projects_found'], 3)
+
+    def test_upgrade_is_idempotent(self):
+        DatabaseManager(self.path)
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(migrate(conn, MIGRATIONS), [])
+        conn.close()
+        DatabaseManager(self.path).add_tag('alpha', 'cli')
+        self.assertEqual(DatabaseManager(self.path).get_project_tags('alpha'),
+                         ['cli', 'python', 'web'])
+
+
+class MigrateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:', isolation_level=None)
+        self.addCleanup(self.conn.close)
+
+    def create(self, table):
+        return lambda cursor: cursor.execute(f"CREATE TABLE {table} (id INTEGER)")
+
+    def test_applies_pending_in_order(self):
+        migrations = [Migration(1, 'a', self.create('a')), Migration(2, 'b', self.create('b'))]
+        self.assertEqual(migrate(self.conn, migrations[:1]), [1])
+        self.assertEqual(migrate(self.conn, migrations), [2])
+        self.assertEqual(current_version(self.conn), 2)
+
+    def test_failed_migration_rolls_back(self):
+        def broken(cursor):
+            cursor.execute("CREATE TABLE half (id INTEGER)")
+            raise RuntimeError('boom')
+
+        migrations = [Migration(1, 'a', self.create('a')), Migration(2, 'broken', broken)]
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn, migrations)
+        self.assertEqual(current_version(self.conn), 1)
+        tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master")]
+        self.assertNotIn('half', tables)
+
+    def test_newer_database_is_left_alone(self):
+        self.conn.execute("PRAGMA user_version = 9")
+        self.assertEqual(migrate(self.conn, [Migration(1, 'a', self.create('a'))]), [])
+        self.assertEqual(current_version(self.conn), 9)
+
+    def test_versions_must_be_contiguous(self):
+        with self.assertRaises(ValueError):
+            validate([Migration(1, 'a', self.create('a')), Migration(3, 'c', self.create('c'))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+core/procgov.py：子程序名額上限、互動工作保留名額與公平排隊
+"""
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from core.procgov import BACKGROUND, INTERACTIVE, ProcessGovernor
+
+
+class ProcessGovernorTest(unittest.TestCase):
+
+    def wait_queued(self, governor, priority, count):
+        while governor.stats()['queued'][priority] < count:
+            time.sleep(0.001)
+
+    def test_interactive_slot_is_reserved(self):
+        governor = ProcessGovernor(max_concurrency=3)
+        governor._acquire(BACKGROUND, None)
+        governor._acquire(BACKGROUND, None)
+        # 背景工作最多使用 max_concurrency - 1 個名額
+        with self.assertRaises(TimeoutError):
+            governor._acquire(BACKGROUND, 0.02)
+        governor._acquire(INTERACTIVE, 0.02)
+        self.assertEqual(governor.stats()['running'], {INTERACTIVE: 1, BACKGROUND: 2})
+
+    def test_single_slot_is_shared(self):
+        governor = ProcessGovernor(max_concurrency=1)
+        governor._acquire(BACKGROUND, None)
+        with self.assertRaises(TimeoutError):
+            governor._acquire(INTERACTIVE, 0.02)
+        governor._release(BACKGROUND)
+        governor._acquire(INTERACTIVE, 0.02)
+
+    def test_fairness(self):
+        governor = ProcessGovernor(max_concurrency=1, fairness=2)
+        governor._acquire(INTERACTIVE, None)
+        order = []
+
+        def worker(name, priority):
+            governor._acquire(priority, 5)
+            order.append(name)
+            governor._release(priority)
+
+        threads = []
+        arrivals = [('b1', BACKGROUND)] + [(f'i{n}', INTERACTIVE) for n in range(1, 5)]
+        for index, (name, priority) in enumerate(arrivals):
+            thread = threading.Thread(target=worker, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            self.wait_queued(governor, priority, 1 if priority == BACKGROUND else index)
+
+        governor._release(INTERACTIVE)
+        for thread in threads:
+            thread.join(5)
+
+        # 互動工作優先，但連續放行 fairness 個後讓背景工作前進
+        self.assertEqual(order, ['i1', 'i2', 'b1', 'i3', 'i4'])
+        self.assertEqual(governor.stats()['max_queue_depth'], {INTERACTIVE: 4, BACKGROUND: 1})
+
+    def test_run(self):
+        governor = ProcessGovernor(max_concurrency=2)
+        result = governor.run([sys.executable, '-c', 'print("ok")'], capture_output=True,
+                              text=True)
+        self.assertEqual((result.returncode, result.stdout), (0, 'ok\n'))
+        background = governor.run([sys.executable, '-c', 'pass'], priority=BACKGROUND)
+        self.assertEqual(background.returncode, 0)
+        stats = governor.stats()
+        self.assertEqual(stats['spawned'], {INTERACTIVE: 1, BACKGROUND: 1})
+        self.assertEqual(stats['running'], {INTERACTIVE: 0, BACKGROUND: 0})
+
+    def test_queue_timeout(self):
+        governor = ProcessGovernor(max_concurrency=1)
+        governor._acquire(INTERACTIVE, None)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            governor.run([sys.executable, '-c', 'pass'], queue_timeout=0.02)
+        self.assertEqual(governor.stats()['timeouts'], 1)
+        self.assertEqual(governor.stats()['queued'][INTERACTIVE], 0)
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            ProcessGovernor().run(['true'], priority='urgent')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+core/readme.py：README 解析與以 (inode, mtime, size) 驗證的快取
+"""
+import os
+import unittest
+from unittest import mock
+
+from core import readme
+from core.readme import READ_LIMIT, ReadmeCache, parse_readme
+
+from .support import WorkspaceTestCase, write
+
+SAMPLE = '''[![CI](https://github.com/me/app/actions/workflows/ci.yml/badge.svg)](https://ci)
+![logo](docs/logo.png)
+
+# Project Dashboard
+
+> 管理本機專案的儀表板，
+> 支援 Web 與 MCP。
+
+```bash
+# 不是標題
+```
+
+## 安裝
+
+內容
+'''
+
+
+class ParseReadmeTest(unittest.TestCase):
+
+    def test_title_summary_badges_headings(self):
+        metadata = parse_readme(SAMPLE)
+        self.assertEqual(metadata.title, 'Project Dashboard')
+        self.assertEqual(metadata.summary, '管理本機專案的儀表板， 支援 Web 與 MCP。')
+        self.assertEqual(metadata.badges, (
+            ('CI', 'https://github.com/me/app/actions/workflows/ci.yml/badge.svg'),
+        ))
+        self.assertEqual(metadata.headings, ((1, 'Project Dashboard'), (2, '安裝')))
+        self.assertFalse(metadata.truncated)
+
+    def test_summary_before_title(self):
+        metadata = parse_readme('Intro paragraph\n\n# Title\n')
+        self.assertEqual((metadata.title, metadata.summary), ('Title', 'Intro paragraph'))
+
+    def test_empty(self):
+        metadata = parse_readme('')
+        self.assertIsNone(metadata.title)
+        self.assertIsNone(metadata.summary)
+        self.assertEqual(metadata.to_dict()['headings'], [])
+
+
+class ReadmeCacheTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.tmp / 'README.md'
+        write(self.path, SAMPLE)
+        self.cache = ReadmeCache(max_entries=2)
+
+    def test_unchanged_file_is_not_reparsed(self):
+        first = self.cache.get(self.path)
+        with mock.patch.object(readme, 'parse_readme') as parse:
+            self.assertIs(self.cache.get(self.path), first)
+        parse.assert_not_called()
+
+    def test_changed_file_is_reparsed(self):
+        self.cache.get(self.path)
+        write(self.path, '# Renamed\n')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.cache.get(self.path).title, 'Renamed')
+
+    def test_missing_file(self):
+        self.cache.get(self.path)
+        self.path.unlink()
+        self.assertIsNone(self.cache.get(self.path))
+
+    def test_large_file_is_truncated(self):
+        write(self.path, '# Big\n' + 'x' * READ_LIMIT)
+        self.assertTrue(self.cache.get(self.path).truncated)
+
+    def test_evicts_least_recently_used(self):
+        paths = [self.tmp / name / 'README.md' for name in ('a', 'b', 'c')]
+        for path in paths:
+            write(path, f'# {path.parent.name}\n')
+            self.cache.get(path)
+        self.assertEqual(list(self.cache._entries), [str(paths[1]), str(paths[2])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+core/serialization.py：JSON 序列化與預先編碼的專案卡片
+"""
+import json
+import unittest
+
+from core.serialization import FragmentCache, dumps, encode_projects, loads
+from core.snapshot import ProjectRecord
+
+
+def record(name: str, **fields) -> ProjectRecord:
+    return ProjectRecord(name=name, path=f'/ws/{name}', description=f'{name} 專案', **fields)
+
+
+class SerializationTest(unittest.TestCase):
+
+    def test_dumps_is_compact_utf8(self):
+        data = dumps({'name': '儀表板', 'count': 2})
+        self.assertIsInstance(data, bytes)
+        self.assertNotIn(b' ', data)
+        self.assertIn('儀表板'.encode('utf-8'), data)
+        self.assertEqual(loads(data), {'name': '儀表板', 'count': 2})
+
+    def test_encode_projects_matches_json(self):
+        records = [
+            record('alpha', languages=(('Python', 100),), has_git=True, git_status='Clean'),
+            record('beta')
+        ]
+        encoded = encode_projects(records, favorites={'beta'}, tags_map={'alpha': ['web', '工具']})
+
+        expected = [
+            {**records[0].to_dict(), 'is_favorite': False, 'tags': ['web', '工具']},
+            {**records[1].to_dict(), 'is_favorite': True, 'tags': []}
+        ]
+        self.assertEqual(json.loads(encoded), expected)
+        self.assertEqual(json.loads(encode_projects([])), [])
+
+
+class FragmentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = FragmentCache()
+
+    def test_unchanged_records_survive_new_generation(self):
+        self.cache.get(record('alpha'), generation=1)
+        # 內容相同的新記錄（例如來自新的快照）命中快取
+        self.cache.get(record('alpha'), generation=2)
+        self.assertEqual(self.cache.stats(), {'entries': 1, 'hits': 1, 'misses': 1})
+
+    def test_larger_workspace_is_not_re_encoded(self):
+        records = [record(f'project{index}') for index in range(10000)]
+        for generation in (1, 1, 2):
+            for item in records:
+                self.cache.get(item, generation)
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['hits']), (10000, 20000))
+
+    def test_removed_records_are_dropped(self):
+        self.cache.get(record('alpha'), generation=1)
+        self.cache.get(record('beta'), generation=2)
+        self.cache.get(record('beta'), generation=3)
+        self.assertEqual(self.cache.stats()['entries'], 1)
+        # alpha 已不在最近的世代中，需要重新編碼
+        self.cache.get(record('alpha'), generation=3)
+        self.assertEqual(self.cache.stats()['misses'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
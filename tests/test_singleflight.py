@@ -0,0 +1,81 @@
+"""
+core/singleflight.py：同時進行的相同計算只執行一次
+"""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from core.singleflight import SingleFlight, SingleFlightTimeout
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow(self, result='done'):
+        """等到 release 才完成的計算"""
+        def compute():
+            self.calls += 1
+            self.release.wait(5)
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        return compute
+
+    def run_concurrently(self, count, fn, key='scan', **kwargs):
+        """同時發出 count 個呼叫，等全部加入後才讓計算完成"""
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            futures = [pool.submit(self.flight.do, key, fn, **kwargs) for _ in range(count)]
+            while self.flight.stats()['shared'] < count - 1:
+                time.sleep(0.001)
+            self.release.set()
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_calls_share_one_execution(self):
+        results = self.run_concurrently(5, self.slow())
+        self.assertEqual(results, ['done'] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flight.stats(), {'executions': 1, 'shared': 4, 'in_flight': 0})
+
+    def test_error_is_shared(self):
+        error = RuntimeError('scan failed')
+        results = self.run_concurrently(3, self.slow(error))
+        self.assertEqual(results, [error] * 3)
+        self.assertEqual(self.calls, 1)
+
+    def test_clone_for_waiters(self):
+        results = self.run_concurrently(3, self.slow(['a']), clone=list)
+        self.assertEqual(results, [['a']] * 3)
+        # 等待者拿到的是複本，leader 拿到原始物件
+        self.assertEqual(len({id(result) for result in results}), 3)
+
+    def test_sequential_calls_recompute(self):
+        self.release.set()
+        self.flight.do('scan', self.slow())
+        self.flight.do('scan', self.slow())
+        self.assertEqual(self.calls, 2)
+
+    def test_different_keys_run_separately(self):
+        self.release.set()
+        self.assertEqual(self.flight.do('a', lambda: 1), 1)
+        self.assertEqual(self.flight.do('b', lambda: 2), 2)
+        self.assertEqual(self.flight.executions, 2)
+
+    def test_waiter_timeout(self):
+        leader = threading.Thread(target=self.flight.do, args=('scan', self.slow()))
+        leader.start()
+        while not self.flight.in_flight():
+            time.sleep(0.001)
+        with self.assertRaises(SingleFlightTimeout):
+            self.flight.do('scan', self.slow(), timeout=0.01)
+        self.release.set()
+        leader.join()
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+core/snapshot.py：不可變專案記錄與工作區快照的索引
+"""
+import dataclasses
+import unittest
+
+from core.snapshot import ProjectRecord, WorkspaceSnapshot
+
+
+def record(name: str, **fields) -> ProjectRecord:
+    return ProjectRecord(name=name, path=f'/ws/{name}', description=name.title(), **fields)
+
+
+class ProjectRecordTest(unittest.TestCase):
+
+    def test_immutable_and_hashable(self):
+        first = record('alpha', languages=(('Python', 70), ('Shell', 30)))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            first.name = 'beta'
+        same = record('alpha', languages=(('Python', 70), ('Shell', 30)))
+        self.assertEqual(first, same)
+        self.assertEqual(hash(first), hash(same))
+
+    def test_languages(self):
+        alpha = record('alpha', languages=(('Python', 70), ('Shell', 30)))
+        self.assertEqual(alpha.language_map, {'Python': 70, 'Shell': 30})
+        self.assertEqual(alpha.language_percentage('Shell'), 30)
+        self.assertEqual(alpha.language_percentage('Go'), 0)
+        self.assertEqual(alpha.to_dict()['languages'], {'Python': 70, 'Shell': 30})
+
+
+class WorkspaceSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = WorkspaceSnapshot([
+            record('gamma', languages=(('Go', 100),), has_git=True, git_status='Clean',
+                   last_commit_at=100),
+            record('Alpha', languages=(('Python', 60), ('Go', 40)), has_git=True,
+                   git_status='Modified', last_commit_at=300),
+            record('beta', git_status='Not a Git repo', stale=True),
+            record('delta', degraded=True)
+        ], created_at=42.0)
+
+    def test_sorted_by_name(self):
+        self.assertEqual(self.snapshot.names(), ['Alpha', 'beta', 'delta', 'gamma'])
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(self.snapshot.created_at, 42.0)
+
+    def test_indexes(self):
+        self.assertIn('gamma', self.snapshot)
+        self.assertIsNone(self.snapshot.get('missing'))
+        self.assertEqual([r.name for r in self.snapshot.by_language('Go')], ['Alpha', 'gamma'])
+        self.assertEqual(self.snapshot.by_language('Rust'), [])
+        self.assertEqual([r.name for r in self.snapshot.by_git_status('Modified')], ['Alpha'])
+        self.assertEqual(self.snapshot.language_counts(), {'Go': 2, 'Python': 1})
+
+    def test_git_status_groups(self):
+        groups = self.snapshot.git_status_groups()
+        self.assertEqual(groups['Clean'], ['gamma'])
+        self.assertEqual(groups['Modified'], ['Alpha'])
+        self.assertEqual(groups['Not a Git repo'], ['beta'])
+        self.assertEqual(groups['Error'], [])
+
+    def test_recently_active(self):
+        self.assertEqual(
+            [r.name for r in self.snapshot.recently_active()], ['Alpha', 'gamma', 'beta', 'delta']
+        )
+        self.assertEqual([r.name for r in self.snapshot.recently_active(limit=1)], ['Alpha'])
+
+    def test_stale_and_degraded(self):
+        self.assertTrue(self.snapshot.partial)
+        self.assertEqual(self.snapshot.stale_names(), ['beta'])
+        self.assertEqual(self.snapshot.degraded_names(), ['delta'])
+        self.assertFalse(WorkspaceSnapshot([record('alpha')]).partial)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+core/snapshot_file.py：快照檔的寫入、載入與拒絕載入的情況
+"""
+import marshal
+import unittest
+import zlib
+from unittest import mock
+
+from core import snapshot_file
+from core.database import DatabaseManager
+from core.project_manager import ProjectManager
+from core.snapshot import ProjectRecord, WorkspaceSnapshot
+from core.snapshot_file import load_snapshot, save_snapshot
+from core.workspace import Workspace
+
+from .support import WorkspaceTestCase, make_project
+
+
+def sample_snapshot() -> WorkspaceSnapshot:
+    return WorkspaceSnapshot([
+        ProjectRecord(
+            name='alpha', path='/ws/alpha', description='Alpha 專案',
+            languages=(('Python', 80), ('Shell', 20)), has_git=True,
+            git_status='Modified', git_detail='2 file(s) changed', branch='main',
+            upstream='origin/main', ahead=1, behind=0, last_commit_at=1700000000,
+            last_commit_author='Test User'
+        ),
+        ProjectRecord(name='beta', path='/ws/beta', description='Beta', degraded=True)
+    ], created_at=1700000123.5)
+
+
+class SnapshotFileTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.file = self.tmp / 'dashboard.snapshot'
+        self.path = str(self.file)
+
+    def test_round_trip(self):
+        snapshot = sample_snapshot()
+        save_snapshot(snapshot, self.path, '/ws')
+        loaded = load_snapshot(self.path, '/ws')
+        self.assertEqual(list(loaded), list(snapshot))
+        self.assertEqual(loaded.created_at, snapshot.created_at)
+        self.assertEqual(loaded.get('alpha').language_map, {'Python': 80, 'Shell': 20})
+        self.assertEqual(loaded.degraded_names(), ['beta'])
+
+    def test_rejects_other_scan_path(self):
+        save_snapshot(sample_snapshot(), self.path, '/ws')
+        self.assertIsNone(load_snapshot(self.path, '/elsewhere'))
+
+    def test_rejects_missing_or_corrupt_file(self):
+        self.assertIsNone(load_snapshot(self.path, '/ws'))
+        save_snapshot(sample_snapshot(), self.path, '/ws')
+        data = bytearray(self.file.read_bytes())
+        data[-1] ^= 0xFF
+        self.file.write_bytes(bytes(data))
+        self.assertIsNone(load_snapshot(self.path, '/ws'))
+        self.file.write_bytes(b'PDSN')
+        self.assertIsNone(load_snapshot(self.path, '/ws'))
+
+    def test_rejects_other_python_version(self):
+        with mock.patch.object(snapshot_file, '_python_version', return_value=(3, 0)):
+            save_snapshot(sample_snapshot(), self.path, '/ws')
+        self.assertIsNone(load_snapshot(self.path, '/ws'))
+
+    def test_loads_older_fields_by_name(self):
+        # 舊版快照沒有 degraded 欄位，且帶有已移除的欄位
+        fields = ('name', 'path', 'description', 'removed', 'stale')
+        payload = zlib.compress(marshal.dumps({
+            'scan_path': '/ws',
+            'fields': fields,
+            'records': [('alpha', '/ws/alpha', 'Alpha', 'ignored', True)]
+        }))
+        header = snapshot_file._HEADER.pack(
+            snapshot_file.MAGIC, snapshot_file.FORMAT_VERSION, marshal.version,
+            *snapshot_file._python_version(), 1.0, len(payload), zlib.crc32(payload)
+        )
+        self.file.write_bytes(header + payload)
+
+        loaded = load_snapshot(self.path, '/ws')
+        self.assertEqual(loaded.get('alpha'), ProjectRecord(
+            name='alpha', path='/ws/alpha', description='Alpha', stale=True
+        ))
+
+    def test_workspace_serves_loaded_snapshot(self):
+        make_project(self.root, 'alpha')
+        manager = ProjectManager(str(self.root))
+        save_snapshot(sample_snapshot(), self.path, manager.scan_path)
+
+        workspace = Workspace(manager, DatabaseManager(str(self.tmp / 'dashboard.db')),
+                              snapshot_path=self.path, lease_ttl=0)
+        self.assertTrue(workspace.load())
+        with mock.patch.object(workspace, '_start_scan') as start_scan:
+            self.assertEqual(workspace.snapshot().names(), ['alpha', 'beta'])
+        # 載入的快照先回傳，掃描在背景重新確認
+        start_scan.assert_called_once()
+        self.assertEqual(workspace.status()['source'], 'file')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+MCP Server 啟動基準：匯入 mcp_server 不可存取資料庫或掃描目錄，且需在時限內完成
+
+每個 MCP 用戶端連線都會啟動新的行程，因此在子行程中量測實際的冷啟動。
+"""
+import importlib.util
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from .support import WorkspaceTestCase, make_project
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 匯入 mcp_server 本身（不含 FastMCP）的時限秒數；實際約數毫秒，保留充分餘裕避免 CI 抖動
+IMPORT_BUDGET = 0.5
+
+# 延後到第一個工具呼叫才匯入的模組
+DEFERRED_MODULES = (
+    'core.database', 'core.project_manager', 'core.workspace', 'core.dependencies',
+    'core.ipc', 'core.git_index', 'core.git_metadata', 'sqlite3'
+)
+
+_PROBE = '''
+import json, sys, time
+import fastmcp  # FastMCP 本身的匯入成本不計入
+started = time.perf_counter()
+import mcp_server
+import_seconds = time.perf_counter() - started
+state = {
+    'import_seconds': import_seconds,
+    'loaded': sorted(name for name in %(deferred)r if name in sys.modules),
+    'services': mcp_server._services is not None,
+}
+if %(first_call)r:
+    mcp_server.services()
+    state['after_call_loaded'] = sorted(name for name in %(deferred)r if name in sys.modules)
+print(json.dumps(state))
+'''
+
+
+@unittest.skipUnless(importlib.util.find_spec('fastmcp'), 'fastmcp 未安裝')
+class McpStartupTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project(self.root, 'alpha')
+        self.db_path = self.tmp / 'dashboard.db'
+        self.snapshot_path = self.tmp / 'dashboard.snapshot'
+        (self.tmp / '.env').write_text(
+            f'SCAN_DIR={self.root}\n'
+            f'DB_PATH={self.db_path}\n'
+            f'SNAPSHOT_FILE={self.snapshot_path}\n'
+            'DAEMON_SOCKET=\n',
+            encoding='utf-8'
+        )
+
+    def probe(self, first_call: bool = False) -> dict:
+        code = _PROBE % {'deferred': DEFERRED_MODULES, 'first_call': first_call}
+        result = subprocess.run(
+            [sys.executable, '-c', f'import sys; sys.path.insert(0, {str(REPO_ROOT)!r})\n' + code],
+            cwd=self.tmp, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_does_no_database_or_scan_work(self):
+        state = self.probe()
+        self.assertEqual(state['loaded'], [])
+        self.assertFalse(state['services'])
+        self.assertFalse(self.db_path.exists())
+        self.assertFalse(self.snapshot_path.exists())
+
+    def test_import_time(self):
+        state = self.probe()
+        self.assertLess(state['import_seconds'], IMPORT_BUDGET,
+                        f"import mcp_server 花費 {state['import_seconds'] * 1000:.1f} ms")
+
+    def test_first_call_initializes_services(self):
+        state = self.probe(first_call=True)
+        self.assertEqual(state['loaded'], [])
+        self.assertIn('core.database', state['after_call_loaded'])
+        self.assertTrue(self.db_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
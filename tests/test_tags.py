@@ -0,0 +1,62 @@
+"""
+core/database.py：多標籤布林查詢（ALL / ANY / NOT）
+"""
+import unittest
+
+from core.database import DatabaseManager
+from core.snapshot import ProjectRecord
+
+from .support import WorkspaceTestCase
+
+
+class SearchByTagsTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        tags = {
+            'api': ['web', 'python', 'work'],
+            'blog': ['web', 'personal'],
+            'cli': ['python', 'personal'],
+            'legacy': ['web', 'python', 'archived']
+        }
+        for name, project_tags in tags.items():
+            for tag in project_tags:
+                self.db.add_tag(name, tag)
+        self.db.add_favorite('cli')
+        self.db.cache_records([
+            ProjectRecord(name='api', path='/ws/api', description='',
+                          languages=(('Python', 90),)),
+            ProjectRecord(name='blog', path='/ws/blog', description='',
+                          languages=(('JavaScript', 100),))
+        ])
+
+    def names(self, **kwargs):
+        return [row['name'] for row in self.db.search_by_tags(**kwargs)]
+
+    def test_all(self):
+        self.assertEqual(self.names(all_tags=['web', 'python']), ['api', 'legacy'])
+        self.assertEqual(self.names(all_tags=['web', 'missing']), [])
+
+    def test_any(self):
+        self.assertEqual(self.names(any_tags=['work', 'personal']), ['api', 'blog', 'cli'])
+
+    def test_all_and_any(self):
+        self.assertEqual(self.names(all_tags=['web'], any_tags=['personal', 'archived']),
+                         ['blog', 'legacy'])
+
+    def test_exclude(self):
+        self.assertEqual(self.names(all_tags=['python'], exclude_tags=['archived']), ['api', 'cli'])
+        self.assertEqual(self.names(exclude_tags=['web']), ['cli'])
+
+    def test_tags_are_normalized(self):
+        self.assertEqual(self.names(all_tags=[' WEB ', 'Python', 'web']), ['api', 'legacy'])
+
+    def test_favorites_and_language(self):
+        rows = self.db.search_by_tags(any_tags=['python'], favorites_only=True)
+        self.assertEqual(rows, [{'name': 'cli', 'is_favorite': True}])
+        self.assertEqual(self.names(any_tags=['web'], language='python'), ['api'])
+
+
+if __name__ == '__main__':
+    unittest.main()
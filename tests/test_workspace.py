@@ -0,0 +1,93 @@
+"""
+core/workspace.py：掃描寫入的衍生資料與快照重用
+"""
+import unittest
+from unittest import mock
+
+from core.database import DatabaseManager
+from core.project_manager import ProjectManager
+from core.snapshot import ProjectRecord
+from core.workspace import Workspace
+
+from .support import WorkspaceTestCase, make_project, write
+
+
+class WorkspaceScanTest(WorkspaceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project(self.root, 'alpha', {'main.py': 'print(1)\n'})
+        make_project(self.root, 'beta', {'index.js': 'console.log(1)\n'})
+        (self.root / 'drafts').mkdir()
+        (self.root / 'node_modules').mkdir()
+        write(self.root / 'notes.txt', 'not a folder\n')
+
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'))
+        self.manager = ProjectManager(str(self.root))
+        self.workspace = Workspace(self.manager, self.db, lease_ttl=0)
+
+    def test_scan_records_folders_without_readme(self):
+        snapshot = self.workspace.snapshot()
+        self.assertEqual(snapshot.names(), ['alpha', 'beta'])
+        # 忽略的目錄（node_modules）與檔案不計入
+        self.assertEqual(self.manager.last_without_readme, ['drafts'])
+
+        last_scan = self.db.get_last_scan()
+        self.assertEqual(last_scan['projects_found'], 2)
+        self.assertEqual(last_scan['folders_without_readme'], 1)
+
+    def test_maintenance_runs_only_from_scan(self):
+        with mock.patch.object(self.db, 'maybe_run_maintenance',
+                               return_value={'evicted': 0}) as maintenance:
+            self.workspace.snapshot()
+            self.workspace.snapshot()
+        maintenance.assert_called_once()
+
+    def test_fresh_snapshot_does_not_touch_filesystem(self):
+        first = self.workspace.snapshot()
+        with mock.patch.object(ProjectManager, '_iter_project_dirs') as iter_dirs:
+            self.assertIs(self.workspace.snapshot(), first)
+        iter_dirs.assert_not_called()
+
+
+class CacheLimitTest(WorkspaceTestCase):
+    """工作區專案數超過 cache_max_rows 時，快照中的專案不被淘汰"""
+
+    def setUp(self):
+        super().setUp()
+        for index in range(6):
+            make_project(self.root, f'project{index}', {'main.py': 'print(1)\n'})
+        self.db = DatabaseManager(str(self.tmp / 'dashboard.db'), cache_max_rows=2)
+        self.workspace = Workspace(ProjectManager(str(self.root)), self.db, lease_ttl=0)
+
+    def test_snapshot_rows_are_kept(self):
+        self.workspace.snapshot()
+        self.assertEqual(len(self.db.get_cached_rows()), 6)
+        self.assertEqual({row['count'] for row in self.db.get_language_counts()}, {6})
+
+        # 重新掃描相同內容：沒有重新寫入的列，也就沒有專案事件
+        events = self.db.get_event_bounds()[1]
+        self.workspace.snapshot(refresh=True)
+        new_events = [event['type'] for event in self.db.get_events_since(events)]
+        self.assertNotIn('project', new_events)
+
+        # 其他行程可直接由快取重建快照
+        other = Workspace(ProjectManager(str(self.root)), self.db, lease_ttl=0)
+        with mock.patch.object(ProjectManager, '_iter_project_dirs') as iter_dirs:
+            self.assertEqual(len(other.snapshot()), 6)
+        iter_dirs.assert_not_called()
+        self.assertEqual(other.status()['source'], 'cache')
+
+    def test_rows_outside_snapshot_are_evicted(self):
+        self.db.cache_records([
+            ProjectRecord(name=f'gone{index}', path=f'/elsewhere/gone{index}', description='')
+            for index in range(4)
+        ])
+        # 受保護的列超過上限時仍全部保留，只淘汰其餘的列
+        protected = ['gone0', 'gone1', 'gone2']
+        self.assertEqual(self.db.enforce_cache_limits(protected), 1)
+        self.assertEqual(sorted(row['name'] for row in self.db.get_cached_rows()), protected)
+
+
+if __name__ == '__main__':
+    unittest.main()
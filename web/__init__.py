@@ -0,0 +1,7 @@
+"""
+Project Dashboard v2 - Web Module
+FastAPI 專用的回應類別與中介軟體
+"""
+from .responses import FastJSONResponse
+
+__all__ = ['FastJSONResponse']
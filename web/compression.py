@@ -0,0 +1,141 @@
+"""
+Project Dashboard v2 - Response Compression
+依 Accept-Encoding 以 brotli（已安裝時）或 gzip 壓縮超過門檻的回應
+"""
+
+import gzip
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 依安裝環境而定
+    brotli = None
+
+
+# 值得壓縮的內容類型
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def accepted_encodings(headers: Headers) -> List[str]:
+    """解析 Accept-Encoding，回傳允許的編碼（忽略 q=0）"""
+    encodings = []
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        encodings.append(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(headers: Headers) -> Optional[str]:
+    """選擇回應使用的壓縮編碼（優先 brotli）"""
+    accepted = accepted_encodings(headers)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    """內容類型是否值得壓縮"""
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def add_vary_accept_encoding(headers: MutableHeaders):
+    """加入 Vary: Accept-Encoding（已存在時不重複加入）"""
+    vary = [item.strip().lower() for item in headers.get("vary", "").split(",")]
+    if "accept-encoding" not in vary and "*" not in vary:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """以指定編碼壓縮資料"""
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    回應壓縮中介軟體
+
+    僅壓縮單一訊息的完整回應（一般 API JSON 與小型靜態檔）；
+    串流回應與已帶 Content-Encoding 的回應（預先壓縮的靜態檔）原樣通過。
+    可壓縮類型的回應一律帶 Vary: Accept-Encoding（包括因低於門檻或用戶端不接受壓縮
+    而未壓縮的回應），避免共用快取把未壓縮的版本送給其他用戶端，或反之。
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope))
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = MutableHeaders(raw=message["headers"])
+                if is_compressible(headers.get("content-type", "")):
+                    add_vary_accept_encoding(headers)
+                if encoding is None:
+                    # 用戶端不接受壓縮：只需加上 Vary
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                # 串流或不需壓縮：送出原始標頭後直接轉送
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, self.level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        """判斷回應是否值得壓縮"""
+        if len(body) < self.minimum_size:
+            return False
+        if "content-encoding" in headers:
+            return False
+        return is_compressible(headers.get("content-type", ""))
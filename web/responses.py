@@ -0,0 +1,23 @@
+"""
+Project Dashboard v2 - Web Responses
+使用 core.serialization 的 JSON 回應類別
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from core.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    以可抽換序列化器輸出的 JSON 回應
+
+    content 若已是位元組（例如預先編碼的片段組合），則直接輸出不再編碼。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,171 @@
+"""
+Project Dashboard v2 - Static Assets
+帶指紋的靜態檔網址、長效快取標頭與預先壓縮檔案
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import (
+    accepted_encodings,
+    add_vary_accept_encoding,
+    brotli,
+    is_compressible,
+)
+
+
+# 指紋相符時的長效快取（一年）
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# 無指紋時每次都向伺服器驗證 ETag
+REVALIDATE_CACHE = "no-cache"
+
+# 預先壓縮的副檔名
+PRECOMPRESS_EXTENSIONS = {".css", ".js", ".html", ".svg", ".json", ".txt", ".map"}
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    支援快取標頭與預先壓縮檔案的 StaticFiles
+
+    - 網址帶有 `?v=<指紋>` 且與目前檔案內容相符時，回應 immutable 長效快取
+    - precompressed=True 時，若存在較新的 `.br` / `.gz` 檔案則直接送出
+    """
+
+    def __init__(self, *args, precompressed: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.precompressed = precompressed
+        self._fingerprints: Dict[str, Tuple[int, int, str]] = {}
+
+    def fingerprint(self, full_path: str) -> str:
+        """計算檔案內容指紋（依 mtime 與大小快取）"""
+        stat_result = os.stat(full_path)
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        cached = self._fingerprints.get(full_path)
+        if cached and cached[:2] == key:
+            return cached[2]
+
+        with open(full_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+
+        self._fingerprints[full_path] = (*key, digest)
+        return digest
+
+    def url_for(self, path: str, prefix: str = "/static") -> str:
+        """
+        產生帶指紋的靜態檔網址
+
+        Args:
+            path: 相對於靜態目錄的路徑（如 'js/script.js'）
+            prefix: 掛載路徑
+
+        Returns:
+            例如 '/static/js/script.js?v=1a2b3c4d5e6f'
+        """
+        full_path, stat_result = self.lookup_path(os.path.normpath(path))
+        if stat_result is None:
+            return f"{prefix}/{path}"
+        return f"{prefix}/{path}?v={self.fingerprint(full_path)}"
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        serve_path, serve_stat, encoding = full_path, stat_result, None
+        if self.precompressed:
+            serve_path, serve_stat, encoding = self._find_precompressed(
+                str(full_path), stat_result, accepted_encodings(request_headers)
+            )
+
+        response = FileResponse(
+            serve_path,
+            status_code=status_code,
+            stat_result=serve_stat,
+            media_type=media_type,
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        # 可能送出壓縮版本的檔案一律帶 Vary，304 回應也沿用
+        if self.precompressed or is_compressible(media_type):
+            add_vary_accept_encoding(response.headers)
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        version = query.get("v", [None])[0]
+        if version and version == self.fingerprint(str(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _find_precompressed(self, full_path: str, stat_result: os.stat_result,
+                            accepted: List[str]):
+        """尋找不舊於原始檔的預先壓縮版本"""
+        candidates = [("br", ".br"), ("gzip", ".gz")]
+        for encoding, suffix in candidates:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if compressed_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+                return full_path + suffix, compressed_stat, encoding
+        return full_path, stat_result, None
+
+
+def precompress_directory(directory: str, level: int = 9) -> int:
+    """
+    為靜態目錄中的文字資源產生 .gz（以及已安裝 brotli 時的 .br）
+
+    已存在且不舊於原始檔的壓縮檔會略過。
+
+    Args:
+        directory: 靜態檔目錄
+        level: 壓縮等級
+
+    Returns:
+        新產生的壓縮檔數量
+    """
+    created = 0
+    variants = [(".gz", lambda data: gzip.compress(data, compresslevel=level, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+    for path in Path(directory).rglob("*"):
+        if not path.is_file() or path.suffix.lower() not in PRECOMPRESS_EXTENSIONS:
+            continue
+
+        source_mtime = path.stat().st_mtime_ns
+        data = None
+        for suffix, compressor in variants:
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime_ns >= source_mtime:
+                continue
+            if data is None:
+                data = path.read_bytes()
+            # 多個 worker 可能同時啟動：寫入暫存檔後取代，其他 worker 不會讀到寫到一半的檔案
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(compressor(data))
+            os.replace(tmp_path, target)
+            created += 1
+
+    return created